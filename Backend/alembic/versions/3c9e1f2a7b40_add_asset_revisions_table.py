@@ -0,0 +1,43 @@
+"""add asset_revisions table
+
+Revision ID: 3c9e1f2a7b40
+Revises: eaab564ba700
+Create Date: 2026-10-19 10:12:41.218334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f2a7b40'
+down_revision = 'eaab564ba700'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('asset_revisions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('asset_id', sa.UUID(), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('content_length', sa.Integer(), nullable=False),
+    sa.Column('lines_added', sa.Integer(), nullable=False),
+    sa.Column('lines_removed', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=32), nullable=True),
+    sa.Column('author_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['asset_id'], ['project_assets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('asset_id', 'revision', name='uq_asset_revisions_asset_revision')
+    )
+    op.create_index('idx_asset_revisions_asset_kind', 'asset_revisions', ['asset_id', 'kind', 'revision'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_asset_revisions_asset_kind', table_name='asset_revisions')
+    op.drop_table('asset_revisions')
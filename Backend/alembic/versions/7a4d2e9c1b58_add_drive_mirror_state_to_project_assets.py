@@ -0,0 +1,46 @@
+"""add drive mirror state to project_assets
+
+Revision ID: 7a4d2e9c1b58
+Revises: 3c9e1f2a7b40
+Create Date: 2026-10-19 11:02:17.540912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4d2e9c1b58'
+down_revision = '3c9e1f2a7b40'
+branch_labels = None
+depends_on = None
+
+mirror_status = sa.Enum('PENDING', 'IN_PROGRESS', 'SYNCED', 'FAILED', name='mirrorstatus')
+
+
+def upgrade() -> None:
+    mirror_status.create(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table('project_assets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mirror_status', mirror_status, nullable=True))
+        batch_op.add_column(sa.Column('mirror_attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('mirror_error', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('mirror_next_attempt_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('mirrored_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('idx_project_assets_mirror_status', ['mirror_status'], unique=False)
+
+    # Docs created before this migration were mirrored inline at generation time
+    op.execute(
+        "UPDATE project_assets SET mirror_status = 'SYNCED' "
+        "WHERE r2_path IN (SELECT r2_path FROM documents)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_assets', schema=None) as batch_op:
+        batch_op.drop_index('idx_project_assets_mirror_status')
+        batch_op.drop_column('mirrored_at')
+        batch_op.drop_column('mirror_next_attempt_at')
+        batch_op.drop_column('mirror_error')
+        batch_op.drop_column('mirror_attempts')
+        batch_op.drop_column('mirror_status')
+    mirror_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,26 @@
+"""add mirror_patch to project_assets
+
+Revision ID: b5e81c3d9f27
+Revises: 7a4d2e9c1b58
+Create Date: 2026-10-19 14:36:51.208334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e81c3d9f27'
+down_revision = '7a4d2e9c1b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('project_assets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mirror_patch', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_assets', schema=None) as batch_op:
+        batch_op.drop_column('mirror_patch')
@@ -0,0 +1,26 @@
+"""add source_hash to project_assets
+
+Revision ID: c3f7a9d2e4b1
+Revises: b5e81c3d9f27
+Create Date: 2026-10-19 16:02:13.540917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9d2e4b1'
+down_revision = 'b5e81c3d9f27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('project_assets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('source_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('project_assets', schema=None) as batch_op:
+        batch_op.drop_column('source_hash')
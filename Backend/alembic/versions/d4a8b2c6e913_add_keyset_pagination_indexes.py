@@ -0,0 +1,39 @@
+"""add keyset pagination indexes
+
+Revision ID: d4a8b2c6e913
+Revises: c3f7a9d2e4b1
+Create Date: 2026-10-19 18:41:07.215630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8b2c6e913'
+down_revision = 'c3f7a9d2e4b1'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('idx_issues_created_at_id', 'issues', ['created_at', 'id']),
+    ('idx_issues_team_created_at_id', 'issues', ['team_id', 'created_at', 'id']),
+    ('idx_issues_assignee_created_at_id', 'issues', ['assignee_id', 'created_at', 'id']),
+    ('idx_issues_triage_created_at_id', 'issues', ['triage_status', 'created_at', 'id']),
+    ('idx_comments_issue_created_at_id', 'comments', ['issue_id', 'created_at', 'id']),
+    ('idx_activities_issue_created_at_id', 'activities', ['issue_id', 'created_at', 'id']),
+    ('idx_projects_created_at_id', 'projects', ['created_at', 'id']),
+    ('idx_features_created_at_id', 'features', ['created_at', 'id']),
+    ('idx_features_project_created_at_id', 'features', ['project_id', 'created_at', 'id']),
+    ('idx_notifications_recipient_created_at_id', 'notifications', ['recipient_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,96 @@
+"""add search_documents with full-text indexes
+
+Revision ID: e7c1d5a3b8f2
+Revises: d4a8b2c6e913
+Create Date: 2026-10-19 20:12:48.903114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c1d5a3b8f2'
+down_revision = 'd4a8b2c6e913'
+branch_labels = None
+depends_on = None
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE search_documents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(identifier, '')), 'A') || "
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', body), 'B')) STORED",
+    "CREATE INDEX idx_search_documents_vector ON search_documents USING gin (search_vector)",
+    "CREATE INDEX idx_search_documents_title_trgm ON search_documents USING gin (title gin_trgm_ops)",
+    "CREATE INDEX idx_search_documents_identifier_trgm ON search_documents USING gin (identifier gin_trgm_ops)",
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "identifier, title, body, content='search_documents', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, identifier, title, body) "
+    "VALUES (new.id, new.identifier, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, identifier, title, body) "
+    "VALUES ('delete', old.id, old.identifier, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, identifier, title, body) "
+    "VALUES ('delete', old.id, old.identifier, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, identifier, title, body) "
+    "VALUES (new.id, new.identifier, new.title, new.body); END",
+]
+
+# Backfill; {agg} joins an issue's comments (string_agg / group_concat)
+BACKFILL = [
+    "INSERT INTO search_documents (entity_type, entity_id, organization_id, identifier, title, body) "
+    "SELECT 'issue', i.id, t.organization_id, i.identifier, i.title, "
+    "coalesce(i.description, '') || ' ' || coalesce(("
+    "SELECT {agg}(c.content, ' ') FROM comments c WHERE c.issue_id = i.id AND c.deleted_at IS NULL"
+    "), '') "
+    "FROM issues i JOIN teams t ON t.id = i.team_id",
+    "INSERT INTO search_documents (entity_type, entity_id, organization_id, identifier, title, body) "
+    "SELECT 'feature', f.id, t.organization_id, f.identifier, f.name, coalesce(f.problem_statement, '') "
+    "FROM features f JOIN projects p ON p.id = f.project_id JOIN teams t ON t.id = p.team_id",
+    "INSERT INTO search_documents (entity_type, entity_id, organization_id, identifier, title, body) "
+    "SELECT 'project', p.id, t.organization_id, NULL, p.name, coalesce(p.description, '') "
+    "FROM projects p JOIN teams t ON t.id = p.team_id",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_documents',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('entity_type', sa.String(length=16), nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('organization_id', sa.UUID(), nullable=True),
+        sa.Column('identifier', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_search_documents_entity', 'search_documents', ['entity_type', 'entity_id'], unique=True)
+    op.create_index('idx_search_documents_org_type', 'search_documents', ['organization_id', 'entity_type'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        ddl, agg = POSTGRES_DDL, 'string_agg'
+    elif dialect == 'sqlite':
+        ddl, agg = SQLITE_DDL, 'group_concat'
+    else:
+        raise NotImplementedError(f"search_documents has no full-text index for {dialect}")
+    for statement in ddl:
+        op.execute(statement)
+    for statement in BACKFILL:
+        op.execute(statement.format(agg=agg))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS search_documents_fts")
+    op.drop_index('idx_search_documents_org_type', table_name='search_documents')
+    op.drop_index('idx_search_documents_entity', table_name='search_documents')
+    op.drop_table('search_documents')
@@ -0,0 +1,31 @@
+"""add identifier_counters
+
+Revision ID: f2b9e4c7a1d6
+Revises: e7c1d5a3b8f2
+Create Date: 2026-10-19 21:05:33.417290
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b9e4c7a1d6'
+down_revision = 'e7c1d5a3b8f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are created on first use, starting after the highest existing identifier
+    op.create_table(
+        'identifier_counters',
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('kind', 'scope'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('identifier_counters')
@@ -1,13 +1,26 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+    get_async_db,
+    get_db,
+    has_read_replica,
+    recent_writes,
+)
 from app.core.security import decode_access_token
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
+# Set on responses to writes; while present the client reads from the primary
+RECENT_WRITE_COOKIE = "recent_write"
+
 
 def get_token_from_request(request: Request) -> Optional[str]:
     """Extract JWT from Authorization header or HTTP-only cookie."""
@@ -24,6 +37,30 @@ def get_token_from_request(request: Request) -> Optional[str]:
     return None
 
 
+def reads_from_primary(request: Request) -> bool:
+    """Whether this request's reads must see the primary's latest writes."""
+    if not has_read_replica():
+        return True
+    if request.cookies.get(RECENT_WRITE_COOKIE):
+        return True
+    return recent_writes.is_recent(get_token_from_request(request))
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session for read-only endpoints, on the replica when one is configured."""
+    db = SessionLocal() if reads_from_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    factory = AsyncSessionLocal if reads_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
+
 def get_current_user(
     request: Request,
     db: Session = Depends(get_db),
@@ -2,7 +2,7 @@ from fastapi import APIRouter
 from app.api.v1 import (
     auth, issues, projects, organizations, 
     teams, features, ai_projects, notifications,
-    google_auth, documents
+    google_auth, documents, search
 )
 
 api_router = APIRouter()
@@ -18,4 +18,4 @@ api_router.include_router(teams.router, prefix="/teams", tags=["teams"])
 api_router.include_router(features.router, prefix="/features", tags=["features"])
 api_router.include_router(ai_projects.router, prefix="/ai", tags=["ai"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
-
+api_router.include_router(search.router, prefix="/search", tags=["search"])
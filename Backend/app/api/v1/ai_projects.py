@@ -6,13 +6,13 @@ from fastapi import (
     UploadFile,
     File,
     Body,
+    Query,
 )
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import Any, List, Dict, Optional
-import mammoth
-import markdown
-from html2docx import html2docx
 import io
 import logging
 import json
@@ -20,13 +20,23 @@ import ast
 import traceback
 from sqlalchemy.orm.attributes import flag_modified
 from app.api import deps
+from app.core import markdown_sections
 from app.schemas import ai as schemas
 from app.crud import crud_project_idea, feature as crud_feature, issue as crud_issue
+from app.crud.base import as_uuid
 from app.services.ai_service import ai_service, DOC_ORDER
 from app.services.storage_service import storage_service
 from app.services.notification_service import notification_service
 from app.services.project_md_service import project_md_service
 from app.services.doc_analyzer_service import doc_analyzer_service
+from app.services.revision_service import revision_service
+from app.services.conversion_service import (
+    ConversionError,
+    ConversionTooLarge,
+    conversion_service,
+)
+from app.services.export_service import DOCX_MEDIA_TYPE, export_service
+from app.tasks.mirror_assets_to_drive import mark_for_mirror, mirror_pending_assets, patch_for_edit
 from app.models.project_idea import (
     IdeaStatus,
     AssetType,
@@ -37,7 +47,7 @@ from app.models.project_idea import (
 from app.models.notification import NotificationType
 from app.models.user import User
 from app.models.team_model import Team
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal
 from app.models.feature import (
     Feature,
     FeatureStatus,
@@ -56,26 +66,24 @@ router = APIRouter()
 async def generate_issues_for_node(
     idea_id: str,
     node_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     AI generates detailed Features, Milestones, and Issues for a specific blueprint node.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea or not idea.project_id:
         raise HTTPException(status_code=404, detail="Idea or linked project not found")
 
     from app.models.project import Project
 
-    project = db.query(Project).filter(Project.id == idea.project_id).first()
-    team = (
-        db.query(Team).filter(Team.id == project.team_id).first() if project else None
-    )
+    project = await db.get(Project, idea.project_id)
+    team = await db.get(Team, project.team_id) if project and project.team_id else None
     team_prefix = team.identifier if team else "AST"
 
     # Get blueprint asset to find node details
-    blueprint_asset = crud_project_idea.project_idea.get_asset(
+    blueprint_asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=AssetType.DIAGRAM_USER_FLOW
     )
     if not blueprint_asset:
@@ -105,8 +113,8 @@ async def generate_issues_for_node(
 
     # Context for AI
     existing_features = (
-        db.query(Feature).filter(Feature.project_id == idea.project_id).all()
-    )
+        await db.execute(select(Feature).where(Feature.project_id == idea.project_id))
+    ).scalars().all()
     features_list = [
         {"id": str(f.id), "name": f.name, "description": f.problem_statement}
         for f in existing_features
@@ -127,9 +135,6 @@ async def generate_issues_for_node(
     feature_map = {f.name: f for f in existing_features}
     new_features_data = plan.get("new_features", [])
 
-    # Get current max identifier number to increment locally
-    current_feature_num = crud_feature.get_max_identifier_num(db, team_prefix)
-
     # Simple two-pass approach for sub-features
     for pass_num in range(2):
         for f_data in new_features_data:
@@ -170,9 +175,7 @@ async def generate_issues_for_node(
             except ValueError:
                 f_priority = IssuePriority.MEDIUM
 
-            # Generate unique identifier locally
-            current_feature_num += 1
-            f_identifier = f"{team_prefix}-F{current_feature_num}"
+            f_identifier = await db.run_sync(crud_feature.get_next_identifier, team_prefix)
 
             new_f = Feature(
                 project_id=idea.project_id,
@@ -188,7 +191,7 @@ async def generate_issues_for_node(
                 identifier=f_identifier,
             )
             db.add(new_f)
-            db.flush()
+            await db.flush()
             feature_map[f_data["name"]] = new_f
 
     # 2. Create Milestones
@@ -203,20 +206,22 @@ async def generate_issues_for_node(
                 completed=False,
             )
             db.add(new_m)
-            db.flush()
+            await db.flush()
             milestone_map[m_data["name"]] = new_m
 
     # 3. Create Issues & Sub-issues
     created_count = 0
     from app.models.project import Project
 
-    project = db.query(Project).filter(Project.id == idea.project_id).first()
+    project = await db.get(Project, idea.project_id)
     team_id = project.team_id if project else None
 
-    # Get current max identifier number to increment locally
-    current_issue_num = crud_issue.get_max_identifier_num(db, team_prefix)
+    issues_data = plan.get("issues", [])
+    issue_identifiers = await db.run_sync(
+        crud_issue.reserve_identifiers, team_prefix, len(issues_data)
+    )
 
-    for i_data in plan.get("issues", []):
+    for i_data, p_identifier in zip(issues_data, issue_identifiers):
         target_f = feature_map.get(i_data["feature_name"])
         target_m = milestone_map.get(i_data["milestone_name"])
 
@@ -232,10 +237,6 @@ async def generate_issues_for_node(
         except ValueError:
             i_priority = IssuePriority.MEDIUM
 
-        # Generate unique identifier locally
-        current_issue_num += 1
-        p_identifier = f"{team_prefix}-{current_issue_num}"
-
         # Create Parent Issue
         parent_issue = Issue(
             title=i_data["title"],
@@ -250,7 +251,7 @@ async def generate_issues_for_node(
             blueprint_node_id=node_id,
         )
         db.add(parent_issue)
-        db.flush()  # Flush to get parent_issue.id for sub-issues
+        await db.flush()  # Flush to get parent_issue.id for sub-issues
 
         created_count += 1
 
@@ -280,11 +281,11 @@ async def generate_issues_for_node(
             )
             db.add(sub_issue)
 
-    db.commit()
+    await db.commit()
 
     # Notify user
-    notification_service.notify_user(
-        db,
+    await db.run_sync(
+        notification_service.notify_user,
         recipient_id=current_user.id,
         type=NotificationType.AI_ISSUES_CREATED,
         title="Issues Generated",
@@ -302,9 +303,14 @@ async def create_features_background(idea_id: str, user_id: str):
     """
     Background task to expand and create features/sub-features after Phase 2 approval.
     """
-    db = SessionLocal()
+    async with AsyncSessionLocal() as db:
+        await _create_features(db, idea_id, user_id)
+
+
+async def _create_features(db: AsyncSession, idea_id: str, user_id: str):
+    user_id = as_uuid(user_id)
     try:
-        idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+        idea = await crud_project_idea.project_idea.get_async(db, idea_id)
         if not idea or not idea.validation_report:
             logging.error(
                 f"Background feature creation aborted: Idea {idea_id} not found or invalid."
@@ -320,12 +326,8 @@ async def create_features_background(idea_id: str, user_id: str):
         # Get team prefix for identifiers
         from app.models.project import Project
 
-        project = db.query(Project).filter(Project.id == idea.project_id).first()
-        team = (
-            db.query(Team).filter(Team.id == project.team_id).first()
-            if project
-            else None
-        )
+        project = await db.get(Project, idea.project_id)
+        team = await db.get(Team, project.team_id) if project and project.team_id else None
         team_prefix = team.identifier if team else "AST"
 
         # Prepare context for AI
@@ -338,8 +340,12 @@ async def create_features_background(idea_id: str, user_id: str):
         # Call AI to expand features
         expanded_features = await ai_service.expand_features_for_creation(context)
 
-        # Get current max identifier number to increment locally
-        current_feature_num = crud_feature.get_max_identifier_num(db, team_prefix)
+        # One identifier block for every feature and sub-feature
+        feature_identifiers = iter(await db.run_sync(
+            crud_feature.reserve_identifiers,
+            team_prefix,
+            sum(1 + len(f.get("sub_features", [])) for f in expanded_features),
+        ))
 
         # Create features in DB
         for f_data in expanded_features:
@@ -359,9 +365,7 @@ async def create_features_background(idea_id: str, user_id: str):
             except ValueError:
                 f_type = FeatureType.NEW_CAPABILITY
 
-            # Generate parent identifier
-            current_feature_num += 1
-            p_identifier = f"{team_prefix}-F{current_feature_num}"
+            p_identifier = next(feature_identifiers)
 
             # Create Parent Feature
             parent_feature = Feature(
@@ -379,7 +383,7 @@ async def create_features_background(idea_id: str, user_id: str):
                 identifier=p_identifier,
             )
             db.add(parent_feature)
-            db.flush()  # Flush to get ID for sub-features
+            await db.flush()  # Flush to get ID for sub-features
 
             # Create Sub-features
             sub_features = f_data.get("sub_features", [])
@@ -405,9 +409,7 @@ async def create_features_background(idea_id: str, user_id: str):
                 except ValueError:
                     sub_type = FeatureType.NEW_CAPABILITY
 
-                # Generate sub-feature identifier
-                current_feature_num += 1
-                s_identifier = f"{team_prefix}-F{current_feature_num}"
+                s_identifier = next(feature_identifiers)
 
                 sub_feature = Feature(
                     project_id=idea.project_id,
@@ -426,28 +428,26 @@ async def create_features_background(idea_id: str, user_id: str):
                 )
                 db.add(sub_feature)
 
-        db.commit()
+        await db.commit()
         logging.info(f"Successfully created features for idea {idea_id}")
 
     except Exception as e:
         logging.error(f"Background feature creation failed: {str(e)}")
-        db.rollback()
-    finally:
-        db.close()
+        await db.rollback()
 
 
 @router.post("/idea/{idea_id}/validate/approve")
 async def approve_validation_report(
     idea_id: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 2 Approval: Accepts the validation report and triggers automatic feature creation.
     This runs in the background and creates features/sub-features in the database.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -466,16 +466,18 @@ async def approve_validation_report(
 @router.get("/ideas/{project_id}")
 async def get_project_ideas(
     project_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get all ideas for a project, ordered by most recent."""
     ideas = (
-        db.query(ProjectIdea)
-        .filter(ProjectIdea.project_id == project_id)
-        .order_by(ProjectIdea.created_at.desc())
-        .all()
-    )
+        await db.execute(
+            select(ProjectIdea)
+            .options(selectinload(ProjectIdea.validation_report))
+            .where(ProjectIdea.project_id == as_uuid(project_id))
+            .order_by(ProjectIdea.created_at.desc())
+        )
+    ).scalars().all()
 
     return {
         "ideas": [
@@ -496,16 +498,17 @@ async def get_project_ideas(
 @router.get("/project/{project_id}/ideas")
 async def get_project_ideas(
     project_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get all ideas for a specific project, ordered by created_at descending."""
     ideas = (
-        db.query(ProjectIdea)
-        .filter(ProjectIdea.project_id == project_id)
-        .order_by(ProjectIdea.created_at.desc())
-        .all()
-    )
+        await db.execute(
+            select(ProjectIdea)
+            .where(ProjectIdea.project_id == as_uuid(project_id))
+            .order_by(ProjectIdea.created_at.desc())
+        )
+    ).scalars().all()
 
     return {
         "ideas": [
@@ -525,43 +528,40 @@ async def get_project_ideas(
 @router.get("/idea/{idea_id}/progress")
 async def get_idea_progress(
     idea_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get progress dashboard for an idea."""
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
     # Count completed docs
-    completed_docs = (
-        db.query(ProjectAsset)
-        .filter(
-            ProjectAsset.project_idea_id == idea_id,
+    completed_docs = await db.scalar(
+        select(func.count())
+        .select_from(ProjectAsset)
+        .where(
+            ProjectAsset.project_idea_id == idea.id,
             ProjectAsset.status == AssetStatus.COMPLETED,
             ProjectAsset.asset_type.in_(DOC_ORDER),
         )
-        .count()
     )
 
+    blueprint = await crud_project_idea.project_idea.get_asset_async(
+        db, idea_id=idea.id, asset_type=AssetType.DIAGRAM_USER_FLOW
+    )
     context = {
         "validation_report": idea.validation_report is not None,
-        "blueprint": db.query(ProjectAsset)
-        .filter(
-            ProjectAsset.project_idea_id == idea_id,
-            ProjectAsset.asset_type == AssetType.DIAGRAM_USER_FLOW,
-        )
-        .first()
-        is not None,
+        "blueprint": blueprint is not None,
         "needs_clarification": idea.status == IdeaStatus.CLARIFICATION_NEEDED,
         "docs_completed": completed_docs,
-        "next_steps": _get_next_steps(idea, completed_docs, db),
+        "next_steps": _get_next_steps(idea, completed_docs),
     }
 
     return await ai_service.get_progress_dashboard(idea_id, context)
 
 
-def _get_next_steps(idea: ProjectIdea, completed_docs: int, db: Session) -> List[str]:
+def _get_next_steps(idea: ProjectIdea, completed_docs: int) -> List[str]:
     """Get next steps for the user based on current progress."""
     steps = []
 
@@ -588,49 +588,60 @@ async def upload_document(
     idea_id: str,
     doc_type: AssetType,
     file: UploadFile = File(...),
-    db: Session = Depends(deps.get_db),
+    deep_review: bool = False,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """
     Manual Upload - Uploads a .md or .docx file and saves it as an asset.
     Also analyzes document quality and notifies user if improvements are needed.
+    Structure is checked locally; the AI review runs only for documents that pass
+    those checks or when ``deep_review`` is set. Re-uploading the file the current
+    content came from is a no-op.
     """
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
-    content = ""
     filename = file.filename.lower() if file.filename else ""
-
-    # Validate file size before reading
-    file_size = 0
-    chunk_size = 8192
-    chunks = []
-    while True:
-        chunk = await file.read(chunk_size)
-        if not chunk:
-            break
-        file_size += len(chunk)
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400, detail="File too large. Maximum size is 10 MB."
-            )
-        chunks.append(chunk)
-
-    if filename.endswith(".md"):
-        content = b"".join(chunks).decode("utf-8")
-    elif filename.endswith(".docx"):
-        import io
-        file.file = io.BytesIO(b"".join(chunks))
-        result = mammoth.convert_to_markdown(file.file)
-        content = result.value
-    else:
+    if not filename.endswith((".md", ".docx")):
         raise HTTPException(
             status_code=400, detail="Only .md and .docx files supported"
         )
 
+    existing = await crud_project_idea.project_idea.get_asset_async(
+        db=db, idea_id=idea.id, asset_type=doc_type
+    )
+
+    # Stream to a spooled buffer, hashing as it goes and rejecting oversized
+    # files before reading them whole
+    try:
+        with await conversion_service.spool(file, max_bytes=MAX_FILE_SIZE) as upload:
+            source_hash = upload.sha256
+            previous_analysis = existing.analysis_result if existing else None
+            if (
+                existing
+                and existing.source_hash == source_hash
+                and not (deep_review and (previous_analysis or {}).get("analysis_source") == "structural")
+            ):
+                # Identical re-upload: skip conversion, storage and analysis
+                return {
+                    **schemas.DocResponse.from_orm(existing).dict(),
+                    "analysis": previous_analysis,
+                }
+            if filename.endswith(".md"):
+                content = upload.read_bytes().decode("utf-8")
+            else:
+                content = await conversion_service.docx_to_markdown(upload.source())
+    except ConversionTooLarge:
+        raise HTTPException(
+            status_code=400, detail="File too large. Maximum size is 10 MB."
+        )
+    except (ConversionError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read file: {e}")
+
     if not content.strip():
         raise HTTPException(
             status_code=400, detail="Uploaded file is empty."
@@ -652,12 +663,12 @@ async def upload_document(
             ]
 
         analysis_result = await doc_analyzer_service.analyze_document(
-            doc_type.value, content, project_context
+            doc_type.value, content, project_context, deep_review=deep_review
         )
 
         if analysis_result.get("severity") in ["critical", "warning"]:
-            notification_service.notify_user(
-                db,
+            await db.run_sync(
+                notification_service.notify_user,
                 recipient_id=current_user.id,
                 type=NotificationType.AI_DOC_GENERATED,
                 title=f"Document Review: {doc_type.value}",
@@ -668,18 +679,22 @@ async def upload_document(
     except Exception as e:
         logger.warning(f"Document analysis failed for {doc_type.value}: {e}")
 
-    asset = crud_project_idea.project_idea.create_or_update_asset(
-        db=db,
+    asset = await revision_service.save_asset_async(
+        db,
         idea_id=idea_id,
         asset_type=doc_type,
         content=content,
         status=AssetStatus.COMPLETED,
         r2_path=r2_key,
+        source="upload",
+        author_id=current_user.id,
     )
 
+    mark_for_mirror(asset)
+    asset.source_hash = source_hash
     if analysis_result:
         asset.analysis_result = analysis_result
-        db.commit()
+    await db.commit()
 
     return {
         **schemas.DocResponse.from_orm(asset).dict(),
@@ -690,25 +705,25 @@ async def upload_document(
 @router.post("/idea/{idea_id}/blueprint/sync")
 async def sync_blueprint_from_docs(
     idea_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Syncs validation and blueprint from existing manual docs.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
     # Fetch all completed assets (docs) for this idea
     assets = (
-        db.query(ProjectAsset)
-        .filter(
-            ProjectAsset.project_idea_id == idea_id,
-            ProjectAsset.status == AssetStatus.COMPLETED,
+        await db.execute(
+            select(ProjectAsset).where(
+                ProjectAsset.project_idea_id == idea.id,
+                ProjectAsset.status == AssetStatus.COMPLETED,
+            )
         )
-        .all()
-    )
+    ).scalars().all()
 
     if not assets:
         raise HTTPException(
@@ -739,7 +754,7 @@ async def sync_blueprint_from_docs(
     else:
         # Filter report_data to only include required fields
         filtered_report = {k: v for k, v in report_data.items() if k in required_fields}
-        report = crud_project_idea.project_idea.create_validation_report(
+        report = await crud_project_idea.project_idea.create_validation_report_async(
             db=db, idea_id=idea_id, report_data=filtered_report
         )
 
@@ -752,14 +767,14 @@ async def sync_blueprint_from_docs(
     blueprint_data = await ai_service.generate_blueprint(blueprint_context)
 
     # 3. Save blueprint assets
-    crud_project_idea.project_idea.create_or_update_asset(
+    await crud_project_idea.project_idea.create_or_update_asset_async(
         db=db,
         idea_id=idea_id,
         asset_type=AssetType.DIAGRAM_USER_FLOW,
         content=blueprint_data.get("user_flow_mermaid", ""),
         status=AssetStatus.COMPLETED,
     )
-    crud_project_idea.project_idea.create_or_update_asset(
+    await crud_project_idea.project_idea.create_or_update_asset_async(
         db=db,
         idea_id=idea_id,
         asset_type=AssetType.DIAGRAM_KANBAN,
@@ -768,7 +783,7 @@ async def sync_blueprint_from_docs(
     )
 
     idea.status = IdeaStatus.BLUEPRINT_GENERATED
-    db.commit()
+    await db.commit()
 
     return {"validation_report": report, "blueprint": blueprint_data}
 
@@ -777,7 +792,7 @@ async def sync_blueprint_from_docs(
 async def submit_idea(
     idea_in: schemas.IdeaSubmit,
     project_id: Optional[str] = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -805,19 +820,23 @@ async def submit_idea(
 
             # Try to find any team user leads or belongs to
             default_team = (
-                db.query(Team)
-                .join(Team.members)
-                .filter(User.id == current_user.id)
-                .first()
-            )
+                await db.execute(
+                    select(Team)
+                    .join(Team.members)
+                    .where(User.id == current_user.id)
+                    .limit(1)
+                )
+            ).scalars().first()
 
             # Fallback: Any team in user's organization
             if not default_team and current_user.organization_id:
                 default_team = (
-                    db.query(Team)
-                    .filter(Team.organization_id == current_user.organization_id)
-                    .first()
-                )
+                    await db.execute(
+                        select(Team)
+                        .where(Team.organization_id == current_user.organization_id)
+                        .limit(1)
+                    )
+                ).scalars().first()
 
             if not default_team:
                 raise HTTPException(
@@ -839,13 +858,13 @@ async def submit_idea(
                 lead_id=current_user.id,
             )
             db.add(new_proj)
-            db.flush()
+            await db.flush()
             project_id = str(new_proj.id)
 
-        db_idea = crud_project_idea.project_idea.create_with_user(
+        db_idea = await crud_project_idea.project_idea.create_with_user_async(
             db=db, obj_in=idea_in, user_id=str(current_user.id)
         )
-        db_idea.project_id = project_id
+        db_idea.project_id = as_uuid(project_id)
 
         if questions:
             db_idea.clarification_questions = [
@@ -855,8 +874,8 @@ async def submit_idea(
         else:
             db_idea.status = IdeaStatus.READY_FOR_VALIDATION
 
-        db.commit()
-        db.refresh(db_idea)
+        await db.commit()
+        await db.refresh(db_idea)
 
         # Add project_id to response
         res_data = schemas.IdeaResponse.model_validate(db_idea)
@@ -875,13 +894,13 @@ async def submit_idea(
 async def suggest_answer(
     idea_id: str,
     question_index: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 1: Skip & Suggest - AI suggests an answer for a specific clarification question.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea or not idea.clarification_questions:
         raise HTTPException(status_code=404, detail="Idea or questions not found")
 
@@ -903,7 +922,7 @@ async def suggest_answer(
     from sqlalchemy.orm.attributes import flag_modified
 
     flag_modified(idea, "clarification_questions")
-    db.commit()
+    await db.commit()
 
     return {"suggestion": suggestion}
 
@@ -912,13 +931,13 @@ async def suggest_answer(
 async def answer_questions(
     idea_id: str,
     answers: List[schemas.ClarificationAnswer],
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 1: Answer Clarifications - Updates the idea with answers.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     if idea.user_id != str(current_user.id):
@@ -940,8 +959,8 @@ async def answer_questions(
         (idea.refined_description or "") + "\n\nClarifications:\n" + formatted_qa
     )
     idea.status = IdeaStatus.READY_FOR_VALIDATION
-    db.commit()
-    db.refresh(idea)
+    await db.commit()
+    await db.refresh(idea)
     return idea
 
 
@@ -951,13 +970,13 @@ async def answer_questions(
 async def validate_idea(
     idea_id: str,
     feedback: Optional[str] = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 2: Validation & Analysis - Validates idea against 6 core pillars.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -1035,17 +1054,17 @@ async def validate_idea(
     else:
         # Filter report_data to only include required fields
         filtered_report = {k: v for k, v in report_data.items() if k in required_fields}
-        report = crud_project_idea.project_idea.create_validation_report(
+        report = await crud_project_idea.project_idea.create_validation_report_async(
             db=db, idea_id=idea_id, report_data=filtered_report
         )
 
     idea.status = IdeaStatus.VALIDATED
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
 
     # Notify user
-    notification_service.notify_user(
-        db,
+    await db.run_sync(
+        notification_service.notify_user,
         recipient_id=current_user.id,
         type=NotificationType.AI_VALIDATION_READY,
         title="Validation Report Ready",
@@ -1068,14 +1087,14 @@ async def validate_idea(
 async def update_validation_report(
     idea_id: str,
     report_in: schemas.ValidationReportResponse,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 2: Manual Edit Update - Saves manual changes to the validation report.
     Auto-saves user edits.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea or not idea.validation_report:
         raise HTTPException(status_code=404, detail="Report not found")
 
@@ -1097,8 +1116,8 @@ async def update_validation_report(
     report.tech_stack = to_dict(report_in.tech_stack)
     report.pricing_model = to_dict(report_in.pricing_model)
 
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
 
     # Return serialized version to avoid Pydantic serialization issues
     return {
@@ -1115,14 +1134,14 @@ async def regenerate_validation_field(
     idea_id: str,
     field_name: str,
     feedback: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 2: Regenerate a specific validation field based on user feedback.
     Supports nested fields like 'tech_stack.database'.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea or not idea.validation_report:
         raise HTTPException(status_code=404, detail="Report not found")
 
@@ -1168,8 +1187,8 @@ async def regenerate_validation_field(
         flag_modified(idea.validation_report, parent_field)
     else:
         setattr(idea.validation_report, field_name, new_value)
-    db.commit()
-    db.refresh(idea.validation_report)
+    await db.commit()
+    await db.refresh(idea.validation_report)
 
     return {
         "market_feasibility": idea.validation_report.market_feasibility,
@@ -1187,7 +1206,7 @@ async def accept_improvements_and_revalidate(
     accepted_improvements: List[int] = Body(
         ..., description="List of improvement indices to accept (0-based)"
     ),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -1197,7 +1216,7 @@ async def accept_improvements_and_revalidate(
     - AI re-validates 6 core pillars considering accepted improvements
     """
     try:
-        idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+        idea = await crud_project_idea.project_idea.get_async(db, idea_id)
         if not idea or not idea.validation_report:
             raise HTTPException(status_code=404, detail="Report not found")
 
@@ -1342,14 +1361,14 @@ Now re-validate with ALL improvements applied. The score MUST be HIGHER. Each pi
                 setattr(idea.validation_report, key, report_data[key])
                 flag_modified(idea.validation_report, key)
 
-        db.commit()
-        db.refresh(idea.validation_report)
+        await db.commit()
+        await db.refresh(idea.validation_report)
         logger.info(f"Successfully updated validation report for idea {idea_id}")
 
         # Notify user
         try:
-            notification_service.notify_user(
-                db,
+            await db.run_sync(
+                notification_service.notify_user,
                 recipient_id=current_user.id,
                 type=NotificationType.AI_VALIDATION_READY,
                 title="Validation Updated",
@@ -1380,13 +1399,13 @@ Now re-validate with ALL improvements applied. The score MUST be HIGHER. Each pi
 @router.post("/idea/{idea_id}/blueprint", response_model=schemas.BlueprintResponse)
 async def generate_blueprint(
     idea_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 3: Visual Blueprint - Generates User Flow and Kanban.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea or not idea.validation_report:
         raise HTTPException(status_code=400, detail="Idea not validated yet")
 
@@ -1399,7 +1418,7 @@ async def generate_blueprint(
     blueprint_data = await ai_service.generate_blueprint(context)
 
     # Save as assets
-    crud_project_idea.project_idea.create_or_update_asset(
+    await crud_project_idea.project_idea.create_or_update_asset_async(
         db=db,
         idea_id=idea_id,
         asset_type=AssetType.DIAGRAM_USER_FLOW,
@@ -1414,7 +1433,7 @@ async def generate_blueprint(
     nodes_data = blueprint_data.get("nodes", [])
     edges_data = blueprint_data.get("edges", [])
 
-    crud_project_idea.project_idea.create_or_update_asset(
+    await crud_project_idea.project_idea.create_or_update_asset_async(
         db=db,
         idea_id=idea_id,
         asset_type=AssetType.DIAGRAM_KANBAN,
@@ -1426,7 +1445,7 @@ async def generate_blueprint(
     if nodes_data:
         import json
 
-        crud_project_idea.project_idea.create_or_update_asset(
+        await crud_project_idea.project_idea.create_or_update_asset_async(
             db=db,
             idea_id=idea_id,
             asset_type=AssetType.DIAGRAM_USER_FLOW,
@@ -1434,11 +1453,11 @@ async def generate_blueprint(
             status=AssetStatus.COMPLETED,
         )
     idea.status = IdeaStatus.BLUEPRINT_GENERATED
-    db.commit()
+    await db.commit()
 
     # Notify user
-    notification_service.notify_user(
-        db,
+    await db.run_sync(
+        notification_service.notify_user,
         recipient_id=current_user.id,
         type=NotificationType.AI_BLUEPRINT_READY,
         title="Blueprint Generated",
@@ -1459,13 +1478,13 @@ async def generate_blueprint(
 async def save_blueprint(
     idea_id: str,
     blueprint_in: Dict[str, Any],
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Manually save updated blueprint data (node positions, etc.).
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -1479,7 +1498,7 @@ async def save_blueprint(
         }
     )
 
-    crud_project_idea.project_idea.create_or_update_asset(
+    await crud_project_idea.project_idea.create_or_update_asset_async(
         db=db,
         idea_id=idea_id,
         asset_type=AssetType.DIAGRAM_USER_FLOW,
@@ -1494,7 +1513,7 @@ async def save_blueprint(
 async def get_doc_questions(
     idea_id: str,
     doc_type: AssetType,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -1502,7 +1521,7 @@ async def get_doc_questions(
     Returns empty if no questions are needed.
     Includes AI suggestions for skipping questions.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -1528,7 +1547,7 @@ async def get_doc_questions(
     if doc_index > 0:
         for i in range(doc_index):
             prev_type = DOC_ORDER[i]
-            prev_asset = crud_project_idea.project_idea.get_asset(
+            prev_asset = await crud_project_idea.project_idea.get_asset_async(
                 db, idea_id=idea_id, asset_type=prev_type
             )
             if prev_asset and prev_asset.content:
@@ -1536,10 +1555,10 @@ async def get_doc_questions(
 
     # Also include blueprint context
     if doc_index > 0:
-        blueprint_asset = crud_project_idea.project_idea.get_asset(
+        blueprint_asset = await crud_project_idea.project_idea.get_asset_async(
             db, idea_id=idea_id, asset_type=AssetType.DIAGRAM_USER_FLOW
         )
-        kanban_asset = crud_project_idea.project_idea.get_asset(
+        kanban_asset = await crud_project_idea.project_idea.get_asset_async(
             db, idea_id=idea_id, asset_type=AssetType.DIAGRAM_KANBAN
         )
         if blueprint_asset:
@@ -1566,8 +1585,9 @@ async def get_doc_questions(
 async def generate_document(
     idea_id: str,
     doc_type: AssetType,
+    background_tasks: BackgroundTasks,
     answers: Optional[List[Dict[str, str]]] = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -1575,7 +1595,7 @@ async def generate_document(
     Checks if previous docs are completed before proceeding.
     Answers are from the question flow that users answered (or skipped with AI suggestions).
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -1583,7 +1603,7 @@ async def generate_document(
     doc_index = ai_service.get_doc_index(doc_type.value)
     if doc_index > 0:
         prev_type = DOC_ORDER[doc_index - 1]
-        prev_asset = crud_project_idea.project_idea.get_asset(
+        prev_asset = await crud_project_idea.project_idea.get_asset_async(
             db, idea_id=idea_id, asset_type=prev_type
         )
         if not prev_asset or prev_asset.status != AssetStatus.COMPLETED:
@@ -1610,17 +1630,17 @@ async def generate_document(
     previous_docs = {}
     for i in range(doc_index):
         prev_type = DOC_ORDER[i]
-        prev_asset = crud_project_idea.project_idea.get_asset(
+        prev_asset = await crud_project_idea.project_idea.get_asset_async(
             db, idea_id=idea_id, asset_type=prev_type
         )
         if prev_asset and prev_asset.content:
             previous_docs[prev_type] = prev_asset.content
 
     # Also include blueprint context
-    blueprint_asset = crud_project_idea.project_idea.get_asset(
+    blueprint_asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=AssetType.DIAGRAM_USER_FLOW
     )
-    kanban_asset = crud_project_idea.project_idea.get_asset(
+    kanban_asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=AssetType.DIAGRAM_KANBAN
     )
     if blueprint_asset:
@@ -1637,7 +1657,7 @@ async def generate_document(
 
     # Get chat history from existing asset
     chat_history = []
-    existing_asset = crud_project_idea.project_idea.get_asset(
+    existing_asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=doc_type.value
     )
     if existing_asset and existing_asset.chat_history:
@@ -1663,49 +1683,32 @@ async def generate_document(
     r2_key = f"projects/{idea_id}/docs/{doc_type.value}.md"
     await storage_service.upload_content(r2_key, content)
 
-    asset = crud_project_idea.project_idea.create_or_update_asset(
-        db=db,
+    asset = await revision_service.save_asset_async(
+        db,
         idea_id=idea_id,
         asset_type=doc_type,
         content=content,
         status=AssetStatus.COMPLETED,
         r2_path=r2_key,
+        source="generate",
+        author_id=current_user.id,
     )
 
-    # 2. Dual-Source: Google Doc creation
-    try:
-        from app.services.document_service import document_service
-        from app.models.document import Document
-
-        title = f"{idea.name or 'Project'} - {doc_type.value.replace('_', ' ').title()}"
-        drive_file_id = await document_service.create_google_doc(title, content, user_email=current_user.email)
-
-        db_doc = Document(
-            project_id=idea.project_id,
-            idea_id=idea.id,
-            drive_file_id=drive_file_id,
-            r2_path=r2_key,
-            title=title
-        )
-        db.add(db_doc)
-        db.flush()
-    except Exception as e:
-        logger.error(f"Failed to create Google Doc: {e}")
-        # Don't fail the whole request if Drive fails
+    # 2. Dual-Source: the Google Doc mirror is created/updated by the Drive
+    # mirror pipeline so this request doesn't wait on Google
+    mark_for_mirror(asset)
     # Update chat history
     if chat_history:
         asset.chat_history = chat_history
-        db.commit()
+    await db.commit()
+    background_tasks.add_task(mirror_pending_assets, [asset.id])
 
-    try:
-        project_id = str(idea.project_id) if idea.project_id else None
-        await project_md_service.save_project_md(db, idea_id, project_id)
-    except Exception as e:
-        logger.warning(f"Failed to update project.md after doc generation: {e}")
+    project_id = str(idea.project_id) if idea.project_id else None
+    background_tasks.add_task(project_md_service.request_update, idea_id, project_id)
 
     # Notify user
-    notification_service.notify_user(
-        db,
+    await db.run_sync(
+        notification_service.notify_user,
         recipient_id=current_user.id,
         type=NotificationType.AI_DOC_GENERATED,
         title=f"{doc_type.value.replace('_', ' ')} Generated",
@@ -1722,20 +1725,20 @@ async def chat_document(
     idea_id: str,
     doc_type: AssetType,
     chat_req: schemas.DocChatRequest,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 4: Chat about Doc - Regenerates/Edits doc based on user feedback.
     Each doc has its own chat session.
     """
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db=db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset:
         raise HTTPException(status_code=404, detail="Doc not found")
 
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
 
     # Get chat history
     chat_history = asset.chat_history or []
@@ -1762,10 +1765,15 @@ async def chat_document(
     # Update R2
     await storage_service.upload_content(asset.r2_path, updated_content)
 
+    await db.run_sync(
+        revision_service.record, asset, updated_content, source="chat", author_id=current_user.id
+    )
+    patch = patch_for_edit(asset.content, updated_content)
     asset.content = updated_content
     asset.chat_history = chat_history
-    db.commit()
-    db.refresh(asset)
+    mark_for_mirror(asset, patch)
+    await db.commit()
+    await db.refresh(asset)
 
     return asset
 
@@ -1776,20 +1784,20 @@ async def regenerate_doc_section(
     doc_type: AssetType,
     section_content: str,
     user_message: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 4: Regenerate a specific section of a document.
     User can select text and ask AI to regenerate a better version.
     """
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db=db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset:
         raise HTTPException(status_code=404, detail="Doc not found")
 
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
 
     context = {
         "idea": idea.raw_input,
@@ -1805,16 +1813,36 @@ async def regenerate_doc_section(
         else None,
     }
 
-    updated_content = await ai_service.regenerate_doc_section(
-        doc_type.value, asset.content, section_content, user_message, context
-    )
+    updated_content = None
+    section = markdown_sections.locate(asset.content or "", section_content)
+    if section is not None:
+        # Send only the enclosing section and the outline, then splice the result back
+        new_text = await ai_service.regenerate_section_text(
+            doc_type.value,
+            markdown_sections.outline(asset.content),
+            section.text(asset.content),
+            user_message,
+            context,
+        )
+        new_index = markdown_sections.section_index(new_text.strip() + "\n")
+        if new_index and (new_index[0].title, new_index[0].level) == (section.title, section.level):
+            updated_content = markdown_sections.replace_section(asset.content, section, new_text.strip() + "\n")
+    if updated_content is None:
+        updated_content = await ai_service.regenerate_doc_section(
+            doc_type.value, asset.content, section_content, user_message, context
+        )
 
     # Update R2
     await storage_service.upload_content(asset.r2_path, updated_content)
 
+    await db.run_sync(
+        revision_service.record, asset, updated_content, source="regenerate_section", author_id=current_user.id
+    )
+    patch = patch_for_edit(asset.content, updated_content)
     asset.content = updated_content
-    db.commit()
-    db.refresh(asset)
+    mark_for_mirror(asset, patch)
+    await db.commit()
+    await db.refresh(asset)
 
     return asset
 
@@ -1823,47 +1851,165 @@ async def regenerate_doc_section(
 async def download_doc_as_docx(
     idea_id: str,
     doc_type: AssetType,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """
     Downloads a document as a .docx file.
     Converts Markdown content to HTML, then to Docx in memory.
     """
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db=db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset or not asset.content:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Convert Markdown to HTML
-    html_content = markdown.markdown(asset.content)
-
-    # Wrap in basic HTML structure for better conversion
-    full_html = f"<html><body>{html_content}</body></html>"
-
-    # Convert HTML to Docx in memory
-    docx_io = html2docx(full_html, title=doc_type.value)
-    docx_io.seek(0)
+    # Renders are cached by content hash; only changed documents are converted again
+    try:
+        docx_bytes = await export_service.get_docx(asset.content, doc_type.value)
+    except ConversionError as e:
+        raise HTTPException(status_code=500, detail=f"Could not convert document: {e}")
+    docx_io = io.BytesIO(docx_bytes)
 
     filename = f"{doc_type.value.replace('_', ' ')}.docx"
     return StreamingResponse(
         docx_io,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        media_type=DOCX_MEDIA_TYPE,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
+@router.get("/idea/{idea_id}/export")
+async def export_idea_documents(
+    idea_id: str,
+    formats: List[str] = Query(["docx", "md"], alias="format"),
+    include_project_md: bool = True,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Downloads every completed document of an idea as one zip archive.
+    Repeat ``format`` to choose docx and/or md; project.md is included by default.
+    The archive is streamed as it is built rather than assembled in memory.
+    """
+    formats = [f.lower() for f in formats]
+    if not formats or not set(formats) <= {"docx", "md"}:
+        raise HTTPException(status_code=400, detail="format must be 'docx' and/or 'md'")
+
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
+    if not idea:
+        raise HTTPException(status_code=404, detail="Idea not found")
+
+    assets = {
+        a.asset_type: a
+        for a in (
+            await db.execute(
+                select(ProjectAsset).where(
+                    ProjectAsset.project_idea_id == idea.id,
+                    ProjectAsset.status == AssetStatus.COMPLETED,
+                )
+            )
+        ).scalars()
+    }
+    # Read everything now: the response body is produced after the session closes
+    documents = [
+        (doc_type, assets[AssetType(doc_type)].content)
+        for doc_type in DOC_ORDER
+        if AssetType(doc_type) in assets and assets[AssetType(doc_type)].content
+    ]
+    extra_files = []
+    project_md = assets.get(AssetType.PROJECT_MD)
+    if include_project_md and project_md and project_md.content:
+        extra_files.append(("project.md", project_md.content))
+    if not documents and not extra_files:
+        raise HTTPException(status_code=404, detail="No completed documents to export")
+
+    return StreamingResponse(
+        export_service.stream_zip(documents, formats, extra_files),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=idea-{idea_id}-docs.zip"},
+    )
+
+
+async def _get_asset_or_404(db: AsyncSession, idea_id: str, doc_type: AssetType) -> ProjectAsset:
+    asset = await crud_project_idea.project_idea.get_asset_async(
+        db=db, idea_id=idea_id, asset_type=doc_type
+    )
+    if not asset:
+        raise HTTPException(status_code=404, detail="Doc not found")
+    return asset
+
+
+@router.get(
+    "/idea/{idea_id}/doc/{doc_type}/revisions",
+    response_model=List[schemas.AssetRevisionMeta],
+)
+async def list_doc_revisions(
+    idea_id: str,
+    doc_type: AssetType,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """List a document's revisions (newest first) with per-revision change stats."""
+    asset = await _get_asset_or_404(db, idea_id, doc_type)
+    return await db.run_sync(revision_service.list_revisions, asset.id)
+
+
+@router.get(
+    "/idea/{idea_id}/doc/{doc_type}/revisions/{revision}",
+    response_model=schemas.AssetRevisionResponse,
+)
+async def get_doc_revision(
+    idea_id: str,
+    doc_type: AssetType,
+    revision: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Return the full content of a document as of ``revision``."""
+    asset = await _get_asset_or_404(db, idea_id, doc_type)
+    meta = await db.run_sync(revision_service.get_revision, asset.id, revision)
+    content = await db.run_sync(revision_service.get_content, asset.id, revision) if meta else None
+    if content is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return {**schemas.AssetRevisionMeta.model_validate(meta).model_dump(), "content": content}
+
+
+@router.get(
+    "/idea/{idea_id}/doc/{doc_type}/revisions/{revision}/diff",
+    response_model=schemas.AssetRevisionDiff,
+)
+async def diff_doc_revision(
+    idea_id: str,
+    doc_type: AssetType,
+    revision: int,
+    against: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Unified diff of ``revision`` against ``against`` (default: the previous revision)."""
+    asset = await _get_asset_or_404(db, idea_id, doc_type)
+    base = against if against is not None else revision - 1
+    result = await db.run_sync(revision_service.diff, asset.id, base, revision)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return result
+
+
 @router.get("/idea/{idea_id}/blueprint/node/{node_id}/details")
 async def get_blueprint_node_details(
     idea_id: str,
     node_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get detailed issues and features linked to a specific node."""
-    issues = db.query(Issue).filter(Issue.blueprint_node_id == node_id).all()
-    features = db.query(Feature).filter(Feature.blueprint_node_id == node_id).all()
+    issues = (
+        await db.execute(select(Issue).where(Issue.blueprint_node_id == node_id))
+    ).scalars().all()
+    features = (
+        await db.execute(select(Feature).where(Feature.blueprint_node_id == node_id))
+    ).scalars().all()
 
     # Calculate completion
     total_issues = len(issues)
@@ -1895,16 +2041,17 @@ async def link_issue_to_node(
     idea_id: str,
     node_id: str,
     issue_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Manually link an issue to a blueprint node."""
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue_uuid = as_uuid(issue_id)
+    issue = await db.get(Issue, issue_uuid) if issue_uuid else None
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
 
     issue.blueprint_node_id = node_id
-    db.commit()
+    await db.commit()
     return {"message": "Issue linked successfully"}
 
 
@@ -1913,38 +2060,42 @@ async def unlink_issue_from_node(
     idea_id: str,
     node_id: str,
     issue_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Unlink an issue from a blueprint node."""
     issue = (
-        db.query(Issue)
-        .filter(Issue.id == issue_id, Issue.blueprint_node_id == node_id)
-        .first()
-    )
+        await db.execute(
+            select(Issue).where(
+                Issue.id == as_uuid(issue_id), Issue.blueprint_node_id == node_id
+            )
+        )
+    ).scalars().first()
     if not issue:
         raise HTTPException(status_code=404, detail="Issue link not found")
 
     issue.blueprint_node_id = None
-    db.commit()
+    await db.commit()
     return {"message": "Issue unlinked successfully"}
 
 
 @router.get("/idea/{idea_id}", response_model=Any)
 async def get_idea_details(
     idea_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get full idea details including assets and dynamic blueprint completion."""
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
     # Load assets
     assets = (
-        db.query(ProjectAsset).filter(ProjectAsset.project_idea_id == idea_id).all()
-    )
+        await db.execute(
+            select(ProjectAsset).where(ProjectAsset.project_idea_id == idea.id)
+        )
+    ).scalars().all()
 
     # Serialize validation report from SQLAlchemy model
     validation_report_data = None
@@ -1983,10 +2134,10 @@ async def get_idea_details(
                     for node in blueprint_data.get("nodes", []):
                         node_id = node.get("id")
                         issues = (
-                            db.query(Issue)
-                            .filter(Issue.blueprint_node_id == node_id)
-                            .all()
-                        )
+                            await db.execute(
+                                select(Issue).where(Issue.blueprint_node_id == node_id)
+                            )
+                        ).scalars().all()
                         if issues:
                             total = len(issues)
                             done = len(
@@ -2042,17 +2193,18 @@ async def get_idea_details(
 async def convert_to_project(
     idea_id: str,
     team_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Phase 3: Finalize - Converts the validated idea and blueprint into a real Project.
     """
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea or not idea.validation_report:
         raise HTTPException(status_code=400, detail="Idea not validated")
 
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team_id = as_uuid(team_id)
+    team = await db.get(Team, team_id) if team_id else None
     team_prefix = team.identifier if team else "AST"
 
     from app.models.project import Project, ProjectStatus
@@ -2069,28 +2221,30 @@ async def convert_to_project(
         color="#3b82f6",
     )
     db.add(new_project)
-    db.flush()
+    await db.flush()
 
     # Create Features
     features_map = {}
-    current_feature_num = crud_feature.get_max_identifier_num(db, team_prefix)
-    for i, f_data in enumerate(idea.validation_report.core_features):
-        current_feature_num += 1
+    core_features = idea.validation_report.core_features
+    feature_identifiers = await db.run_sync(
+        crud_feature.reserve_identifiers, team_prefix, len(core_features)
+    )
+    for f_data, f_identifier in zip(core_features, feature_identifiers):
         feature = Feature(
             project_id=new_project.id,
             name=f_data["name"],
             problem_statement=f_data.get("description"),
             status=FeatureStatus.VALIDATED,
             owner_id=current_user.id,
-            identifier=f"{team_prefix}-F{current_feature_num}",
+            identifier=f_identifier,
         )
         db.add(feature)
         features_map[f_data["name"]] = feature
 
-    db.flush()
+    await db.flush()
 
     # Create Issues from Kanban
-    kanban_asset = crud_project_idea.project_idea.get_asset(
+    kanban_asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=AssetType.DIAGRAM_KANBAN
     )
     if kanban_asset and kanban_asset.content:
@@ -2098,21 +2252,22 @@ async def convert_to_project(
 
         try:
             kanban_data = ast.literal_eval(kanban_asset.content)
-            current_issue_num = crud_issue.get_max_identifier_num(db, team_prefix)
-            for i, issue_data in enumerate(kanban_data):
+            issue_identifiers = await db.run_sync(
+                crud_issue.reserve_identifiers, team_prefix, len(kanban_data)
+            )
+            for i, (issue_data, identifier) in enumerate(zip(kanban_data, issue_identifiers)):
                 feature_list = list(features_map.values())
                 feature_id = (
                     feature_list[i % len(feature_list)].id if feature_list else None
                 )
 
-                current_issue_num += 1
                 issue = Issue(
                     title=issue_data["title"],
                     status=IssueStatus.TODO,
                     issue_type=IssueType.TASK,
                     team_id=team_id,
                     feature_id=feature_id,
-                    identifier=f"{team_prefix}-{current_issue_num}",
+                    identifier=identifier,
                 )
                 db.add(issue)
         except:
@@ -2123,9 +2278,11 @@ async def convert_to_project(
     
     # Link documents to the new project
     from app.models.document import Document
-    db.query(Document).filter(Document.idea_id == idea.id).update({"project_id": new_project.id})
+    await db.execute(
+        update(Document).where(Document.idea_id == idea.id).values(project_id=new_project.id)
+    )
     
-    db.commit()
+    await db.commit()
 
     try:
         await project_md_service.save_project_md(
@@ -2153,11 +2310,11 @@ async def get_core_pillars() -> Any:
 @router.post("/idea/{idea_id}/project-md/regenerate")
 async def regenerate_project_md(
     idea_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Regenerate project.md file for an idea."""
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -2178,11 +2335,11 @@ async def regenerate_project_md(
 @router.get("/idea/{idea_id}/project-md")
 async def get_project_md(
     idea_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get project.md content for an idea."""
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=AssetType.PROJECT_MD
     )
     if not asset:
@@ -2199,11 +2356,11 @@ async def get_project_md(
 async def get_document_analysis(
     idea_id: str,
     doc_type: AssetType,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Get the quality analysis for an uploaded document."""
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset:
@@ -2221,17 +2378,17 @@ async def get_document_analysis(
 async def generate_document_enhancement(
     idea_id: str,
     doc_type: AssetType,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Generate AI-enhanced version of the document."""
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+    idea = await crud_project_idea.project_idea.get_async(db, idea_id)
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
 
@@ -2262,7 +2419,7 @@ async def generate_document_enhancement(
         )
 
         asset.enhanced_content = enhanced_content
-        db.commit()
+        await db.commit()
 
         return {
             "success": True,
@@ -2282,11 +2439,11 @@ async def generate_document_enhancement(
 async def accept_document_enhancement(
     idea_id: str,
     doc_type: AssetType,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Accept the AI enhancement and replace the original document."""
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset:
@@ -2297,20 +2454,25 @@ async def accept_document_enhancement(
             status_code=400, detail="No enhanced version available. Generate one first."
         )
 
+    await db.run_sync(
+        revision_service.record, asset, asset.enhanced_content, source="enhancement", author_id=current_user.id
+    )
+    patch = patch_for_edit(asset.content, asset.enhanced_content)
     asset.content = asset.enhanced_content
     asset.enhanced_content = None
     asset.analysis_result = None
+    mark_for_mirror(asset, patch)
 
     if asset.r2_path:
         await storage_service.upload_content(asset.r2_path, asset.content)
 
-    db.commit()
+    await db.commit()
 
     try:
-        idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+        idea = await crud_project_idea.project_idea.get_async(db, idea_id)
         if idea:
             project_id = str(idea.project_id) if idea.project_id else None
-            await project_md_service.save_project_md(db, idea_id, project_id)
+            await project_md_service.request_update(idea_id, project_id)
     except Exception as e:
         logger.warning(f"Failed to update project.md after enhancement: {e}")
 
@@ -2321,11 +2483,11 @@ async def accept_document_enhancement(
 async def decline_document_enhancement(
     idea_id: str,
     doc_type: AssetType,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """Decline the AI enhancement and keep the original document."""
-    asset = crud_project_idea.project_idea.get_asset(
+    asset = await crud_project_idea.project_idea.get_asset_async(
         db, idea_id=idea_id, asset_type=doc_type
     )
     if not asset:
@@ -2333,6 +2495,6 @@ async def decline_document_enhancement(
 
     asset.enhanced_content = None
     asset.analysis_result = None
-    db.commit()
+    await db.commit()
 
     return {"success": True, "message": "Enhancement declined, original preserved"}
@@ -1,33 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File
 import sqlalchemy as sa
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any, Optional
 from uuid import UUID
 
 from app.api import deps
+from app.core import markdown_sections
 from app.models.document import Document
 from app.models.user import User
 from app.schemas import ai as schemas
+from app.services.conversion_service import ConversionError, ConversionTooLarge, conversion_service
 from app.services.document_service import document_service
+from app.services.storage_backends import ObjectNotFound, StorageBackendError
 from app.services.storage_service import storage_service
 
 router = APIRouter()
 
+
+async def _get_document_or_404(db: AsyncSession, doc_id: UUID) -> Document:
+    doc = await db.get(Document, doc_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return doc
+
+
 @router.post("/", response_model=schemas.DocumentMeta)
 async def create_document(
     project_id: UUID,
     title: str,
     content_md: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Create a new Google Doc and sync it to R2."""
     try:
-        drive_file_id = await document_service.create_google_doc(title, content_md, user_email=current_user.email)
+        # Create, share and export back in two Google round trips
+        drive_file_id, exported_md = await document_service.create_google_doc_with_export(
+            title, content_md, user_email=current_user.email
+        )
         r2_path = f"projects/{project_id}/docs/{title.replace(' ', '_').lower()}.md"
         
         # Initial sync to R2
-        await document_service.sync_doc_to_r2(drive_file_id, r2_path)
+        await storage_service.upload_content(r2_path, exported_md)
         
         db_doc = Document(
             project_id=project_id,
@@ -36,8 +50,8 @@ async def create_document(
             title=title
         )
         db.add(db_doc)
-        db.commit()
-        db.refresh(db_doc)
+        await db.commit()
+        await db.refresh(db_doc)
         
         # Add embed_url for response
         db_doc.embed_url = f"https://docs.google.com/document/d/{drive_file_id}/edit"
@@ -49,20 +63,20 @@ async def create_document(
 async def list_documents(
     project_id: Optional[UUID] = None,
     idea_id: Optional[UUID] = None,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """List documents for a project or an idea."""
-    query = db.query(Document)
+    query = sa.select(Document)
     if project_id:
-        query = query.filter(Document.project_id == project_id)
+        query = query.where(Document.project_id == project_id)
     if idea_id:
-        query = query.filter(Document.idea_id == idea_id)
+        query = query.where(Document.idea_id == idea_id)
     
     if not project_id and not idea_id:
         raise HTTPException(status_code=400, detail="Must provide either project_id or idea_id")
         
-    docs = query.all()
+    docs = (await db.execute(query)).scalars().all()
     for doc in docs:
         doc.embed_url = f"https://docs.google.com/document/d/{doc.drive_file_id}/edit"
     return docs
@@ -70,13 +84,11 @@ async def list_documents(
 @router.get("/doc/{doc_id}", response_model=schemas.DocumentMeta)
 async def get_document(
     doc_id: UUID,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Get document metadata and embed URL."""
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+    doc = await _get_document_or_404(db, doc_id)
     
     doc.embed_url = f"https://docs.google.com/document/d/{doc.drive_file_id}/edit"
     return doc
@@ -84,19 +96,17 @@ async def get_document(
 @router.delete("/doc/{doc_id}")
 async def delete_document(
     doc_id: UUID,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Delete document from Drive, R2, and DB."""
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+    doc = await _get_document_or_404(db, doc_id)
     
     try:
         await document_service.delete_google_doc(doc.drive_file_id)
         # R2 deletion could also be handled here
-        db.delete(doc)
-        db.commit()
+        await db.delete(doc)
+        await db.commit()
         return {"message": "Document deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -105,13 +115,11 @@ async def delete_document(
 async def sync_document(
     doc_id: UUID,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Manual trigger to sync Drive content to R2."""
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+    doc = await _get_document_or_404(db, doc_id)
     
     background_tasks.add_task(document_service.sync_doc_to_r2, doc.drive_file_id, doc.r2_path)
     return {"message": "Sync task started in background"}
@@ -120,40 +128,34 @@ async def sync_document(
 async def upload_document(
     doc_id: UUID,
     file: UploadFile = File(...),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Replace document with an uploaded .docx file."""
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+    doc = await _get_document_or_404(db, doc_id)
     
     if not file.filename.endswith(".docx"):
         raise HTTPException(status_code=400, detail="Only .docx files supported for replacement")
 
     try:
-        # 1. Convert .docx to Markdown
-        import mammoth
-        from markdownify import markdownify as md
-        
-        result = mammoth.convert_to_html(file.file)
-        content_md = md(result.value)
-        
+        with await conversion_service.spool(file) as upload:
+            # 1. Convert .docx to HTML and Markdown in one worker call
+            content_html, content_md = await conversion_service.docx_to_html_and_markdown(upload.source())
+    except ConversionTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ConversionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
         # 2. Update Drive (Simplest is to delete and recreate or update content)
-        # For Drive API update, we need media upload
-        from googleapiclient.http import MediaInMemoryUpload
-        media = MediaInMemoryUpload(result.value.encode('utf-8'), mimetype='text/html')
-        document_service.drive_service.files().update(
-            fileId=doc.drive_file_id,
-            media_body=media
-        ).execute()
+        await document_service.update_google_doc_html(doc.drive_file_id, content_html)
         
         # 3. Sync to R2
         await storage_service.upload_content(doc.r2_path, content_md)
         
         doc.updated_at = sa.func.now()
-        db.commit()
-        db.refresh(doc)
+        await db.commit()
+        await db.refresh(doc)
         
         doc.embed_url = f"https://docs.google.com/document/d/{doc.drive_file_id}/edit"
         return doc
@@ -164,13 +166,11 @@ async def upload_document(
 async def apply_change(
     doc_id: UUID,
     payload: schemas.ApplyDocumentChangeRequest,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Apply an AI-proposed change to the Google Doc."""
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+    doc = await _get_document_or_404(db, doc_id)
     
     try:
         requests = [
@@ -184,10 +184,24 @@ async def apply_change(
                 }
             }
         ]
-        await document_service.apply_batch_update(doc.drive_file_id, requests)
-        
-        # Trigger R2 sync
-        await document_service.sync_doc_to_r2(doc.drive_file_id, doc.r2_path)
+        reply = await document_service.apply_batch_update(doc.drive_file_id, requests)
+        changed = (reply or {}).get('replies', [{}])[0].get('replaceAllText', {}).get('occurrencesChanged', 0)
+
+        # A single plain-text replacement is applied to the stored Markdown as
+        # well, instead of exporting and re-converting the whole Doc. With more
+        # than one occurrence, or markup in the replacement, the Markdown could
+        # diverge from the Doc, so it is re-exported.
+        if changed:
+            content_md = None
+            if changed == 1 and "\n" not in payload.replace and not markdown_sections.has_markup(payload.replace):
+                try:
+                    content_md = await storage_service.get_content(doc.r2_path)
+                except (ObjectNotFound, StorageBackendError):
+                    pass
+            if content_md is not None and content_md.count(payload.find) == 1:
+                await storage_service.upload_content(doc.r2_path, content_md.replace(payload.find, payload.replace))
+            else:
+                await document_service.sync_doc_to_r2(doc.drive_file_id, doc.r2_path)
         
         return {"message": "Change applied successfully"}
     except Exception as e:
@@ -197,13 +211,11 @@ async def apply_change(
 async def chat_document(
     doc_id: UUID,
     chat_req: schemas.DocChatRequest,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Chat with AI about a specific document. Returns proposed changes if applicable."""
-    doc = db.query(Document).filter(Document.id == doc_id).first()
-    if not doc:
-        raise HTTPException(status_code=404, detail="Document not found")
+    doc = await _get_document_or_404(db, doc_id)
     
     try:
         from app.services.ai_service import ai_service
@@ -1,8 +1,9 @@
 from typing import Optional
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Response, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import optional_page_size, set_next_cursor
 from app.api.deps import (
     get_current_active_user,
     check_can_edit_feature,
@@ -20,6 +21,7 @@ from app.schemas.feature import (
 )
 from app.services import feature_service
 from app.crud import feature as crud_feature, project as crud_project
+from app.crud.loaders import PROJECT_ACCESS
 from uuid import UUID
 import logging
 
@@ -36,11 +38,10 @@ async def update_project_md_background(project_id: str):
     db = SessionLocal()
     try:
         idea = (
-            db.query(ProjectIdea).filter(ProjectIdea.project_id == project_id).first()
+            db.query(ProjectIdea).filter(ProjectIdea.project_id == UUID(project_id)).first()
         )
         if idea:
-            await project_md_service.save_project_md(db, str(idea.id), str(project_id))
-            logger.info(f"Updated project.md for project {project_id}")
+            await project_md_service.request_update(str(idea.id), str(project_id))
     except Exception as e:
         logger.error(f"Failed to update project.md: {e}")
     finally:
@@ -49,14 +50,17 @@ async def update_project_md_background(project_id: str):
 
 @router.get("", response_model=List[FeatureSchema])
 def list_features(
+    response: Response,
     project_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = optional_page_size(),
 ):
-    """List features (optionally filtered by project)"""
+    """List features (optionally filtered by project); paged only with ``cursor``/``limit``, next cursor in X-Next-Cursor"""
     if project_id:
         # Check project access
-        project = crud_project.get(db, id=project_id)
+        project = crud_project.get(db, id=project_id, loaders=PROJECT_ACCESS)
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
 
@@ -65,15 +69,21 @@ def list_features(
                 status_code=403, detail="Not authorized to view this project"
             )
 
-        return crud_feature.get_by_project(db, project_id=project_id)
-
-    # Return all features in organization
-    return crud_feature.get_multi_by_user_projects(
-        db,
-        user_id=current_user.id,
-        user_team_ids=[],
-        organization_id=current_user.organization_id,
-    )
+        features, next_cursor = crud_feature.get_by_project(
+            db, project_id=project_id, cursor=cursor, limit=limit
+        )
+    else:
+        # Return all features in organization
+        features, next_cursor = crud_feature.get_multi_by_user_projects(
+            db,
+            user_id=current_user.id,
+            user_team_ids=[],
+            organization_id=current_user.organization_id,
+            cursor=cursor,
+            limit=limit,
+        )
+    set_next_cursor(response, next_cursor)
+    return features
 
 
 @router.post("", response_model=FeatureSchema, status_code=status.HTTP_201_CREATED)
@@ -84,7 +94,7 @@ def create_feature(
     current_user: User = Depends(get_current_active_user),
 ):
     """Create a new feature"""
-    project = crud_project.get(db, id=feature_in.project_id)
+    project = crud_project.get(db, id=feature_in.project_id, loaders=PROJECT_ACCESS)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -1,15 +1,17 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import get_async_db, get_db
+from app.core.pagination import optional_page_size, page_size, set_next_cursor
 from app.api.deps import (
     get_current_active_user,
+    get_read_db,
     check_can_edit_issue,
     check_is_team_member,
 )
 from app.models.user import User
-from app.models.team_model import Team
-from app.models.issue import Issue, IssueStatus, IssuePriority, IssueType, TriageStatus
+from app.models.issue import IssueStatus, IssuePriority, IssueType
 from app.schemas.issue import IssueCreate, IssueUpdate, Issue as IssueSchema, IssueList
 from app.schemas.comment import Comment as CommentSchema, CommentCreate
 from app.schemas.comment import Activity as ActivitySchema
@@ -27,7 +29,7 @@ router = APIRouter()
 
 @router.get("", response_model=IssueList)
 def list_issues(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
     status: Optional[List[IssueStatus]] = Query(None),
     priority: Optional[List[IssuePriority]] = Query(None),
@@ -37,15 +39,22 @@ def list_issues(
     assignee_id: Optional[UUID] = None,
     team_id: Optional[UUID] = None,  # Added
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = page_size(),
+    include_total: bool = True,
 ):
-    """List issues with visibility rules"""
+    """List issues with visibility rules, newest first; page with ``cursor``.
+
+    ``skip`` pages by offset for older clients and can't be combined with ``cursor``.
+
+    ``include_total=false`` skips counting the matching issues (``total`` is null).
+    """
 
     # Get user's teams for logic
     user_team_ids = [team.id for team in current_user.teams]
 
-    issues, total = crud_issue.get_filtered(
+    issues, total, next_cursor = crud_issue.get_filtered(
         db,
         user_id=current_user.id,
         user_team_ids=user_team_ids,
@@ -60,42 +69,49 @@ def list_issues(
         skip=skip,
         limit=limit,
         organization_id=current_user.organization_id,
+        cursor=cursor,
+        include_total=include_total,
     )
 
-    return {"issues": issues, "total": total}
+    return {"issues": issues, "total": total, "next_cursor": next_cursor}
 
 
 @router.get("/my-issues", response_model=List[IssueSchema])
 def get_my_issues(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = optional_page_size(),
 ):
-    """Get issues assigned to current user"""
-    issues = crud_issue.get_by_assignee(db, assignee_id=current_user.id)
+    """Get issues assigned to current user; paged only with ``cursor``/``limit``, next cursor in X-Next-Cursor"""
+    issues, next_cursor = crud_issue.get_by_assignee(
+        db, assignee_id=current_user.id, cursor=cursor, limit=limit
+    )
+    set_next_cursor(response, next_cursor)
     return issues
 
 
 @router.get("/inbox", response_model=List[IssueSchema])
 def get_inbox_issues(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = optional_page_size(),
 ):
-    """Get issues pending triage"""
-    all_triage = (
-        db.query(Issue)
-        .options(joinedload(Issue.assignee))
-        .join(Issue.team)
-        .filter(
-            Issue.triage_status == TriageStatus.PENDING,
-            Team.organization_id == current_user.organization_id,
-        )
-        .all()
+    """Get issues pending triage; paged only with ``cursor``/``limit``, next cursor in X-Next-Cursor"""
+    issues, next_cursor = crud_issue.get_triage_issues(
+        db, organization_id=current_user.organization_id, cursor=cursor, limit=limit
     )
-    return all_triage
+    set_next_cursor(response, next_cursor)
+    return issues
 
 
 @router.post("", response_model=IssueSchema, status_code=status.HTTP_201_CREATED)
 async def create_issue(
     issue_in: IssueCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Create a new issue"""
@@ -197,20 +213,32 @@ def add_comment(
 @router.get("/{issue_id}/comments", response_model=List[CommentSchema])
 def get_comments(
     issue_id: UUID,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = optional_page_size(),
 ):
-    """Get comments for an issue"""
-    comments = crud_comment.get_by_issue(db, issue_id=issue_id)
+    """Get comments for an issue, oldest first; paged only with ``cursor``/``limit``, next cursor in X-Next-Cursor"""
+    comments, next_cursor = crud_comment.get_by_issue(
+        db, issue_id=issue_id, cursor=cursor, limit=limit
+    )
+    set_next_cursor(response, next_cursor)
     return comments
 
 
 @router.get("/{issue_id}/activities", response_model=List[ActivitySchema])
 def get_activities(
     issue_id: UUID,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = optional_page_size(),
 ):
-    """Get activity history for an issue"""
-    activities = crud_activity.get_by_issue(db, issue_id=issue_id)
+    """Get activity history for an issue, oldest first; paged only with ``cursor``/``limit``, next cursor in X-Next-Cursor"""
+    activities, next_cursor = crud_activity.get_by_issue(
+        db, issue_id=issue_id, cursor=cursor, limit=limit
+    )
+    set_next_cursor(response, next_cursor)
     return activities
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import Any, List
+from typing import Any, List, Optional
 from app.api import deps
+from app.core.pagination import page_size
 from app.schemas import notification as schemas
 from app.services.notification_service import notification_service
 from app.models.user import User
@@ -11,12 +12,15 @@ router = APIRouter()
 
 @router.get("", response_model=schemas.NotificationList)
 def get_notifications(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: User = Depends(deps.get_current_active_user),
-    limit: int = 50
+    cursor: Optional[str] = None,
+    limit: int = page_size(50),
 ) -> Any:
-    """Retrieve current user's notifications."""
-    notifications = notification_service.get_user_notifications(db, current_user.id, limit)
+    """Retrieve current user's notifications, newest first; page with ``cursor``."""
+    notifications, next_cursor = notification_service.get_user_notifications(
+        db, current_user.id, limit, cursor=cursor
+    )
     unread_count = notification_service.get_unread_count(db, current_user.id)
     
     # Enrich with actor names
@@ -27,7 +31,7 @@ def get_notifications(
             n_dict["actor_name"] = f"{n.actor.first_name} {n.actor.last_name}".strip() or n.actor.email
         enriched.append(n_dict)
         
-    return {"notifications": enriched, "unread_count": unread_count}
+    return {"notifications": enriched, "unread_count": unread_count, "next_cursor": next_cursor}
 
 @router.patch("/{notification_id}/read", response_model=schemas.Notification)
 def mark_notification_read(
@@ -1,9 +1,11 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.pagination import page_size, set_next_cursor
 from app.api.deps import (
     get_current_active_user,
+    get_read_db,
     check_is_admin,
     check_can_manage_project,
     check_is_team_member,
@@ -36,6 +38,7 @@ from app.crud.project import (
     project_update_comment,
     reaction,
 )
+from app.crud.loaders import PROJECT_ACCESS
 from app.services import project_service
 from uuid import UUID
 
@@ -44,19 +47,21 @@ router = APIRouter()
 
 @router.get("", response_model=List[ProjectSchema])
 def list_projects(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = page_size(),
     team_id: Optional[UUID] = None,
 ):
-    """List projects with permission rules"""
+    """List projects with permission rules; the next page's cursor is in X-Next-Cursor"""
     # Check if admin
     is_admin = check_is_admin(current_user)
 
     # REQUIREMENTS: Member can see all projects even if not in it
     # We pass organization_id to get_filtered to show all projects in org
-    projects = crud_project.get_filtered(
+    projects, next_cursor = crud_project.get_filtered(
         db,
         user_id=current_user.id,
         user_team_ids=[],  # Not used anymore for visibility
@@ -65,7 +70,9 @@ def list_projects(
         limit=limit,
         is_admin=is_admin,
         organization_id=current_user.organization_id,
+        cursor=cursor,
     )
+    set_next_cursor(response, next_cursor)
     return projects
 
 
@@ -108,7 +115,7 @@ def create_project(
 @router.get("/{project_id}", response_model=ProjectSchema)
 def get_project(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Get project by ID"""
@@ -139,7 +146,7 @@ def update_project(
     current_user: User = Depends(get_current_active_user),
 ):
     """Update a project with permission checks"""
-    project = crud_project.get(db, id=project_id)
+    project = crud_project.get(db, id=project_id, loaders=PROJECT_ACCESS)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -173,7 +180,7 @@ def delete_project(
     current_user: User = Depends(get_current_active_user),
 ):
     """Delete a project (Admin or Team Leader only)"""
-    project = crud_project.get(db, id=project_id)
+    project = crud_project.get(db, id=project_id, loaders=PROJECT_ACCESS)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -195,7 +202,7 @@ def create_project_update(
     current_user: User = Depends(get_current_active_user),
 ):
     """Create a new project update and update project health"""
-    project = crud_project.get(db, id=project_id)
+    project = crud_project.get(db, id=project_id, loaders=PROJECT_ACCESS)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -214,6 +221,8 @@ def create_project_update(
     db.add(project)
     db.commit()
 
+    # Load what the response serializes
+    db.refresh(new_update, ["author", "comments", "reactions"])
     return new_update
 
 
@@ -250,7 +259,7 @@ def create_project_resource(
     current_user: User = Depends(get_current_active_user),
 ):
     """Create a new project resource"""
-    project = crud_project.get(db, id=project_id)
+    project = crud_project.get(db, id=project_id, loaders=PROJECT_ACCESS)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -310,10 +319,14 @@ def create_update_comment(
     if not update or update.project_id != project_id:
         raise HTTPException(status_code=404, detail="Update not found")
 
-    return project_update_comment.create_with_author(
+    comment = project_update_comment.create_with_author(
         db, obj_in=comment_in, author_id=current_user.id
     )
 
+    # Load what the response serializes
+    db.refresh(comment, ["author", "reactions"])
+    return comment
+
 
 @router.delete(
     "/{project_id}/updates/{update_id}/comments/{comment_id}",
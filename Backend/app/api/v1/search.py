@@ -0,0 +1,29 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_current_active_user, get_read_db
+from app.models.user import User
+from app.schemas.search import SearchEntityType, SearchResults
+from app.services.search_service import search_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResults)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[SearchEntityType]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Search issues (title, description, comments), features and projects in the user's organization.
+
+    Results across all ``types`` (default: all) come best match first.
+    """
+    if not current_user.organization_id:
+        return {"query": q, "results": []}
+    results = search_service.search(
+        db, q, current_user.organization_id, entity_types=types, limit=limit
+    )
+    return {"query": q, "results": results}
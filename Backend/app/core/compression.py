@@ -0,0 +1,106 @@
+import base64
+import gzip
+import logging
+
+from sqlalchemy.orm import synonym
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GZIP = "gzip"
+ZSTD = "zstd"
+NONE = "none"
+
+# Prefix marking a compressed value stored in a Text column:
+# "zc1:<codec>:<base64 payload>". Values without it are returned untouched,
+# so rows written before compression was enabled keep working.
+COLUMN_MARKER = "zc1:"
+
+
+def get_codec() -> str:
+    """Return the configured codec, falling back to gzip when zstd is unavailable."""
+    codec = (settings.DOCUMENT_COMPRESSION or NONE).lower()
+    if codec == ZSTD and zstandard is None:
+        logger.warning("DOCUMENT_COMPRESSION=zstd but 'zstandard' is not installed; using gzip")
+        return GZIP
+    if codec not in (GZIP, ZSTD, NONE):
+        logger.warning(f"Unknown DOCUMENT_COMPRESSION '{codec}'; compression disabled")
+        return NONE
+    return codec
+
+
+def compress_bytes(data: bytes, codec: str) -> bytes:
+    if codec == GZIP:
+        return gzip.compress(data, compresslevel=settings.DOCUMENT_COMPRESSION_LEVEL or 6, mtime=0)
+    if codec == ZSTD:
+        level = settings.DOCUMENT_COMPRESSION_LEVEL or 3
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return data
+
+
+def decompress_bytes(data: bytes, codec: str) -> bytes:
+    if codec == GZIP:
+        return gzip.decompress(data)
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but 'zstandard' is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def should_compress(size: int) -> bool:
+    return size >= settings.DOCUMENT_COMPRESSION_MIN_BYTES and get_codec() != NONE
+
+
+def encode_text(value: str | None) -> str | None:
+    """Encode a text value for storage in a Text column, compressing large values."""
+    if value is None:
+        return None
+    data = value.encode("utf-8")
+    if not should_compress(len(data)):
+        return value
+    codec = get_codec()
+    payload = base64.b64encode(compress_bytes(data, codec)).decode("ascii")
+    encoded = f"{COLUMN_MARKER}{codec}:{payload}"
+    # Tiny or incompressible payloads can grow once base64-encoded
+    return encoded if len(encoded) < len(data) else value
+
+
+def decode_text(value: str | None) -> str | None:
+    """Inverse of :func:`encode_text`; plain values pass through unchanged."""
+    if value is None or not value.startswith(COLUMN_MARKER):
+        return value
+    codec, _, payload = value[len(COLUMN_MARKER):].partition(":")
+    return decompress_bytes(base64.b64decode(payload), codec).decode("utf-8")
+
+
+def compressed_synonym(attr_name: str):
+    """Expose the raw (possibly compressed) column ``attr_name`` as plain text.
+
+    Decompression happens on first attribute access and is cached on the
+    instance until the underlying column value changes, so loading rows whose
+    content is never read costs nothing.
+    """
+    cache_key = f"_{attr_name.lstrip('_')}_decoded"
+
+    def fget(obj):
+        raw = getattr(obj, attr_name)
+        cached = obj.__dict__.get(cache_key)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        value = decode_text(raw)
+        obj.__dict__[cache_key] = (raw, value)
+        return value
+
+    def fset(obj, value):
+        raw = encode_text(value)
+        setattr(obj, attr_name, raw)
+        obj.__dict__[cache_key] = (raw, value)
+
+    return synonym(attr_name, descriptor=property(fget, fset))
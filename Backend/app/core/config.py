@@ -8,6 +8,39 @@ import json
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # URL for the async engine; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+    DATABASE_ASYNC_URL: str | None = None
+    # Connection pool per engine (sync and async each get one, as does the replica)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Connections older than this are replaced on checkout (-1 = never)
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    # Postgres statement_timeout for every connection (0 = no limit)
+    DATABASE_STATEMENT_TIMEOUT_MS: int = 30000
+    # Read replica for read-only endpoints; reads use the primary when unset
+    DATABASE_REPLICA_URL: str | None = None
+    # Clients that wrote within this window read from the primary
+    DATABASE_REPLICA_CONSISTENCY_SECONDS: float = 5.0
+    # SQLite profile, applied on connect to file databases (ignored for other backends)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_FOREIGN_KEYS: bool = True
+    # Queue write transactions in-process instead of letting writers poll the file lock
+    SQLITE_SERIALIZE_WRITES: bool = True
+    # Planner statistics are refreshed at startup and then at this interval (0 = never)
+    SQLITE_ANALYZE_INTERVAL_MINUTES: int = 60
+    # Lazy loads on the core models raise instead of querying; the tests run with it on
+    ORM_RAISE_ON_LAZY_LOAD: bool = False
+    # Statements slower than this are logged with their route (0 = off)
+    SQL_SLOW_QUERY_MS: float = 200.0
+    # Report each request's statement count and DB time in a Server-Timing header
+    SQL_SERVER_TIMING: bool = True
+    # Dev: log every statement a request ran, with its duration
+    SQL_LOG_REQUEST_STATEMENTS: bool = False
     # Security
     SECRET_KEY: str = Field(
         validation_alias=AliasChoices("SECRET_KEY", "JWT_SECRET")
@@ -96,12 +129,70 @@ class Settings(BaseSettings):
     R2_BUCKET_NAME: str | None = None
     R2_ENDPOINT: str | None = None
 
+    # Object storage backend: "r2"/"s3" (uses the R2_* settings above) or
+    # "local" (files under LOCAL_STORAGE_PATH, for development and on-prem)
+    STORAGE_BACKEND: str = "r2"
+    LOCAL_STORAGE_PATH: str = "./data/storage"
+
+    # Number of object keys whose content hash is remembered to skip unchanged uploads
+    STORAGE_HASH_INDEX_SIZE: int = 10000
+
+    # Compression for large document payloads in the DB and object storage:
+    # "gzip", "zstd" (requires the optional 'zstandard' package) or "none"
+    DOCUMENT_COMPRESSION: str = "gzip"
+    DOCUMENT_COMPRESSION_LEVEL: int | None = None
+    DOCUMENT_COMPRESSION_MIN_BYTES: int = 4096
+
+    # Document revision history: a full snapshot is stored every N revisions,
+    # deltas in between, so rebuilding any revision replays at most N-1 deltas
+    REVISION_SNAPSHOT_INTERVAL: int = 10
+    REVISION_CACHE_SIZE: int = 256
+
+    # Uploaded docs go to the LLM reviewer only once they meet the minimum word
+    # count and cover at least this share of the expected sections
+    DOC_ANALYSIS_MIN_SECTION_COVERAGE: float = 0.5
+
     # Google OAuth
     GOOGLE_CLIENT_ID: str | None = None
     GOOGLE_CLIENT_SECRET: str | None = None
     GOOGLE_REDIRECT_URI: str | None = None
     GOOGLE_SERVICE_ACCOUNT_INFO: str | None = None
 
+    # Google Drive/Docs calls run on a dedicated thread pool, never on the event loop
+    GOOGLE_API_WORKERS: int = 8
+    GOOGLE_API_TIMEOUT_SECONDS: float = 30.0
+
+    # Per-user OAuth tokens are cached decrypted and refreshed this long before expiry
+    GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS: int = 300
+    GOOGLE_TOKEN_REFRESH_INTERVAL_SECONDS: int = 60
+    # Users whose tokens haven't been used for this long are dropped from the cache
+    GOOGLE_TOKEN_CACHE_IDLE_SECONDS: int = 86400
+
+    # Background mirroring of completed docs to Google Docs
+    DRIVE_MIRROR_INTERVAL_SECONDS: int = 60
+    DRIVE_MIRROR_BATCH_SIZE: int = 20
+    DRIVE_MIRROR_MAX_ATTEMPTS: int = 5
+    # Mirror single-section edits as a Docs range edit instead of re-uploading the doc
+    DRIVE_MIRROR_SECTION_PATCHES: bool = True
+
+    # project.md saves for the same idea within this window are merged into one
+    PROJECT_MD_DEBOUNCE_SECONDS: float = 5.0
+    # Ideas whose rendered project.md sections are kept in memory
+    PROJECT_MD_SECTION_CACHE_SIZE: int = 512
+
+    # docx/Markdown/HTML conversions run on a process pool (0 = in-process)
+    CONVERSION_WORKERS: int = 2
+    CONVERSION_TIMEOUT_SECONDS: float = 60.0
+    CONVERSION_MAX_INPUT_BYTES: int = 10 * 1024 * 1024
+    # Text inputs this small are converted in-process (.docx always uses the pool);
+    # a worker round trip costs more
+    CONVERSION_INLINE_MAX_BYTES: int = 16 * 1024
+    # Uploads larger than this are spooled to a temp file instead of memory
+    CONVERSION_SPOOL_MEMORY_BYTES: int = 1024 * 1024
+    # Multipart request bodies above this are refused before they are parsed
+    # (the document limit plus headroom for the form encoding)
+    UPLOAD_MAX_REQUEST_BYTES: int = 10 * 1024 * 1024 + 64 * 1024
+
     # JWT RS256 support (optional, for asymmetric signing)
     JWT_PRIVATE_KEY: str | None = None
     JWT_PUBLIC_KEY: str | None = None
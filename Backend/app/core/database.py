@@ -1,33 +1,267 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy import inspect
 from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.core.sqlite import configure_sqlite_engine
+
+# Async driver for each sync backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a sync database URL."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if drivername is None or parsed.drivername == drivername:
+        return url
+    query = dict(parsed.query)
+    if drivername == "postgresql+asyncpg" and "sslmode" in query:
+        # asyncpg spells libpq's sslmode as ssl
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername=drivername, query=query).render_as_string(hide_password=False)
+
+
+class PoolStats:
+    """Checkout counts and wait times for one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """Times every checkout from the pool, including waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(url: str, is_async: bool) -> dict:
+    """Pool sizing and statement timeout for an engine on ``url``."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory sqlite lives in a single connection; keep the default pool
+        return {}
+    options = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+    }
+    timeout = settings.DATABASE_STATEMENT_TIMEOUT_MS
+    if timeout and parsed.get_backend_name() == "postgresql":
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+# Every engine's pool stats, keyed by a label, for the metrics endpoint
+pool_stats: Dict[str, PoolStats] = {}
+
+
+def _register_pool(label: str, engine) -> None:
+    pool = engine.sync_engine.pool if hasattr(engine, "sync_engine") else engine.pool
+    if isinstance(pool, _TimedPoolMixin):
+        pool_stats[label] = pool.stats
+
+
+def _sync_engine(url: str):
+    eng = create_engine(url, pool_pre_ping=True, echo=False, **_engine_options(url, is_async=False))
+    if eng.url.get_backend_name() == "sqlite":
+        configure_sqlite_engine(eng)
+    instrument_engine(eng)
+    return eng
+
+
+def _async_engine(url: str):
+    eng = create_async_engine(url, pool_pre_ping=True, echo=False, **_engine_options(url, is_async=True))
+    if eng.url.get_backend_name() == "sqlite":
+        configure_sqlite_engine(eng.sync_engine, is_async=True)
+    instrument_engine(eng)
+    return eng
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False
-)
+engine = _sync_engine(settings.DATABASE_URL)
+_register_pool("primary", engine)
 
 # Create session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for `async def` routes, so their queries don't block the event loop
+async_engine = _async_engine(settings.DATABASE_ASYNC_URL or async_database_url(settings.DATABASE_URL))
+_register_pool("primary_async", async_engine)
+
+# Objects stay loaded after commit: an expired attribute would need lazy IO,
+# which AsyncSession cannot do implicitly
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Read replica for read-only endpoints; without one, reads go to the primary
+if settings.DATABASE_REPLICA_URL:
+    read_engine = _sync_engine(settings.DATABASE_REPLICA_URL)
+    _register_pool("replica", read_engine)
+    async_read_engine = _async_engine(async_database_url(settings.DATABASE_REPLICA_URL))
+    _register_pool("replica_async", async_read_engine)
+else:
+    read_engine = engine
+    async_read_engine = async_engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+class RecentWrites:
+    """Clients that wrote within the replica consistency window.
+
+    Their reads go to the primary until the window passes, so a client never
+    reads its own write from a replica that has not replayed it yet.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        self.window = window_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+
+    def note(self, key: str) -> None:
+        with self._lock:
+            self._writes[key] = time.monotonic()
+            self._writes.move_to_end(key)
+            while len(self._writes) > self.max_entries:
+                self._writes.popitem(last=False)
+
+    def is_recent(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        with self._lock:
+            written = self._writes.get(key)
+        return written is not None and time.monotonic() - written < self.window
+
+
+recent_writes = RecentWrites(settings.DATABASE_REPLICA_CONSISTENCY_SECONDS)
+
+
+def has_read_replica() -> bool:
+    return read_engine is not engine
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, float]]:
+    """Checkout wait times and current occupancy of every engine's pool."""
+    engines = {"primary": engine, "primary_async": async_engine}
+    if has_read_replica():
+        engines.update(replica=read_engine, replica_async=async_read_engine)
+    metrics = {}
+    for label, eng in engines.items():
+        pool = eng.sync_engine.pool if hasattr(eng, "sync_engine") else eng.pool
+        stats = pool_stats.get(label)
+        metrics[label] = {
+            "pool": type(pool).__name__,
+            "size": pool.size() if isinstance(pool, QueuePool) else None,
+            "checked_out": pool.checkedout() if isinstance(pool, QueuePool) else None,
+            "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+            **(stats.snapshot() if stats else {}),
+        }
+    return metrics
+
+
 # Create base class for models
 Base = declarative_base()
 
+# Loader strategy for relationships that endpoints load through explicit
+# loader profiles (app/crud/loaders.py); "raise_on_sql" turns a missed one
+# into an error instead of a query per row. Collections that write paths
+# append to or replace stay on the default "select".
+LAZY_LOAD = "raise_on_sql" if settings.ORM_RAISE_ON_LAZY_LOAD else "select"
+
 
 # Dependency to get DB session
 def get_db():
-    db = SessionLocal()
+    # Request sessions keep objects loaded after commit, as the async sessions
+    # do, so crud writes need no refresh SELECT. That holds because every
+    # column value is known to the session once it flushes: defaults and
+    # onupdates run in Python, and Document's server-side timestamps come back
+    # through RETURNING (eager_defaults). A write that bypasses the ORM on rows
+    # the session holds must use synchronize_session or expire them.
+    # tests/test_core/test_sessions.py checks this.
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def ensure_runtime_schema() -> None:
     if not settings.DATABASE_URL.startswith("sqlite"):
         return
@@ -43,6 +277,15 @@ def ensure_runtime_schema() -> None:
         "documents": {
             "idea_id": "UUID",
         },
+        "project_assets": {
+            "mirror_status": "VARCHAR(11)",
+            "mirror_attempts": "INTEGER NOT NULL DEFAULT 0",
+            "mirror_error": "VARCHAR",
+            "mirror_next_attempt_at": "DATETIME",
+            "mirrored_at": "DATETIME",
+            "mirror_patch": "JSON",
+            "source_hash": "VARCHAR(64)",
+        },
     }
 
     with engine.begin() as connection:
@@ -0,0 +1,178 @@
+"""Index of a Markdown document's sections, for editing one section in place.
+
+A section starts at an ATX heading (``#`` .. ``######``) and runs until the
+next heading of the same or a higher level, so it includes its subsections.
+Offsets are positions in the Python string. Indexes are cached by content
+hash, so repeated edits of the same document version share one parse.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$", re.MULTILINE)
+_FENCE = re.compile(r"^[ \t]*(```|~~~)", re.MULTILINE)
+
+INDEX_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    level: int
+    start: int       # offset of the heading line
+    body_start: int  # offset just past the heading line
+    end: int         # offset of the next heading at this level or above, or len(content)
+    has_subsections: bool
+
+    def text(self, content: str) -> str:
+        return content[self.start:self.end]
+
+    def body(self, content: str) -> str:
+        return content[self.body_start:self.end]
+
+
+_cache: "OrderedDict[str, Tuple[Section, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _fenced_ranges(content: str) -> List[Tuple[int, int]]:
+    fences = [m.start() for m in _FENCE.finditer(content)]
+    return [(fences[i], fences[i + 1]) for i in range(0, len(fences) - 1, 2)]
+
+
+def _parse(content: str) -> Tuple[Section, ...]:
+    fenced = _fenced_ranges(content)
+    headings = []
+    for match in _HEADING.finditer(content):
+        if any(lo <= match.start() < hi for lo, hi in fenced):
+            continue
+        line_end = content.find("\n", match.end())
+        body_start = len(content) if line_end == -1 else line_end + 1
+        headings.append((match.group(2).strip(), len(match.group(1)), match.start(), body_start))
+
+    sections = []
+    for i, (title, level, start, body_start) in enumerate(headings):
+        end = len(content)
+        has_subsections = False
+        for _, next_level, next_start, _ in headings[i + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+            has_subsections = True
+        sections.append(Section(title, level, start, body_start, end, has_subsections))
+    return tuple(sections)
+
+
+def section_index(content: str) -> Tuple[Section, ...]:
+    """All sections of ``content`` in document order (cached by content hash)."""
+    key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = _parse(content)
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def _normalize(title: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", title.lower()).strip()
+
+
+def find_by_title(content: str, title: str, level: Optional[int] = None) -> Optional[Section]:
+    wanted = _normalize(title)
+    for section in section_index(content):
+        if _normalize(section.title) == wanted and (level is None or section.level == level):
+            return section
+    return None
+
+
+def locate(content: str, snippet: str) -> Optional[Section]:
+    """The innermost section containing ``snippet``, if it occurs exactly once."""
+    snippet = snippet.strip()
+    if not snippet:
+        return None
+    pos = content.find(snippet)
+    if pos == -1 or content.find(snippet, pos + 1) != -1:
+        return None
+    containing = [
+        s for s in section_index(content)
+        if s.start <= pos and pos + len(snippet) <= s.end
+    ]
+    return max(containing, key=lambda s: s.level) if containing else None
+
+
+def replace_section(content: str, section: Section, new_text: str) -> str:
+    """Splice ``new_text`` in place of ``section``, keeping the blank line before the next heading."""
+    if section.end < len(content) and not new_text.endswith("\n\n"):
+        new_text = new_text.rstrip("\n") + "\n\n"
+    return content[:section.start] + new_text + content[section.end:]
+
+
+def outline(content: str) -> str:
+    """The heading tree as an indented list, used as cheap context for section edits."""
+    return "\n".join(
+        f"{'  ' * (s.level - 1)}- {s.title}" for s in section_index(content)
+    )
+
+
+def single_changed_section(old: str, new: str) -> Optional[Section]:
+    """If ``new`` differs from ``old`` only inside one leaf section, return that
+    section as indexed in ``new``; otherwise None."""
+    old_index, new_index = section_index(old), section_index(new)
+    if [(s.title, s.level) for s in old_index] != [(s.title, s.level) for s in new_index]:
+        return None
+    changed = [
+        n for o, n in zip(old_index, new_index)
+        if not o.has_subsections and o.text(old) != n.text(new)
+    ]
+    if len(changed) != 1:
+        return None
+    target = changed[0]
+    # Everything outside the changed section must be identical
+    old_target = old_index[new_index.index(target)]
+    if old[:old_target.start] != new[:target.start] or old[old_target.end:] != new[target.end:]:
+        return None
+    return target
+
+
+_TABLE_RULE = re.compile(r"^\s*\|?\s*:?-{3,}", re.MULTILINE)
+# Anything rendered as more than plain paragraphs: lists, quotes, rules, and
+# inline emphasis, code, links, images, HTML, entities and escapes
+_BLOCK_MARKUP = re.compile(
+    r"^(?: {4}|\t)|^[ \t]*(?:[*+-][ \t]|\d+[.)][ \t]|>|=+[ \t]*$|(?:[-*_][ \t]*){3,}$)", re.MULTILINE
+)
+_INLINE_MARKUP = re.compile(r"[*_`]|\][(\[:]|<[A-Za-z/!]|&#?\w+;|\\[!-/:-@\[-`{-~]")
+
+
+def has_markup(text: str) -> bool:
+    """Whether ``text`` renders as anything other than the same plain paragraphs."""
+    return bool(
+        _FENCE.search(text) or _TABLE_RULE.search(text) or _HEADING.search(text)
+        or _BLOCK_MARKUP.search(text) or _INLINE_MARKUP.search(text)
+    )
+
+
+def to_plain_text(body: str) -> Optional[str]:
+    """Flatten a section body of plain prose into Docs paragraphs.
+
+    Returns None for any body with Markdown formatting (lists, emphasis, links,
+    tables, code, nested headings...): written as plain text it would lose that
+    formatting, so the caller should render the whole document instead.
+    """
+    if has_markup(body):
+        return None
+    # Blank lines separate paragraphs; lines within one are joined, as when rendered
+    paragraphs = [
+        " ".join(line.strip() for line in block.splitlines())
+        for block in re.split(r"\n[ \t]*\n", body.strip())
+    ]
+    text = "\n".join(p for p in paragraphs if p)
+    return text + "\n" if text else ""
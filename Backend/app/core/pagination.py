@@ -0,0 +1,164 @@
+"""Keyset (cursor) pagination.
+
+A page is read as ``WHERE (sort, id) < (last_sort, last_id) ORDER BY sort, id
+LIMIT n``: with an index on the key columns the database seeks straight to
+the page, so page N costs the same as page 1, and rows inserted meanwhile
+never shift a page the way they do with OFFSET. The cursor handed to the
+client is the key of the last row, base64-encoded; clients treat it as
+opaque.
+"""
+import base64
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query as QueryParam, Response
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the next cursor on endpoints that return a bare list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_size(default: int = DEFAULT_PAGE_SIZE):
+    """``limit`` query parameter bounded by ``MAX_PAGE_SIZE``."""
+    return QueryParam(default, ge=1, le=MAX_PAGE_SIZE)
+
+
+def optional_page_size():
+    """``limit`` for lists that were never paged: without it (and without a
+    cursor) the whole list comes back, so clients that don't page see every row."""
+    return QueryParam(None, ge=1, le=MAX_PAGE_SIZE)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, "value"):  # enums
+        return value.value
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of key values")
+        return [_decode_value(col, v) for col, v in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        logger.info(f"Rejected cursor {cursor[:100]!r}: {e}")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _page(
+    query: Query, key: Sequence, cursor: Optional[str], limit: Optional[int], descending: bool, skip: int
+) -> list:
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip cannot be combined with cursor")
+    if cursor:
+        after = decode_cursor(cursor, key)
+        row_key = tuple_(*key)
+        query = query.filter(row_key < tuple_(*after) if descending else row_key > tuple_(*after))
+    order = [col.desc() if descending else col.asc() for col in key]
+    query = query.order_by(None).order_by(*order)
+    if skip:
+        query = query.offset(skip)
+    if limit is None:
+        return query.all()
+    return query.limit(limit + 1).all()
+
+
+def _next_cursor(rows: list, key: Sequence, limit: Optional[int]) -> Optional[str]:
+    if limit is None or len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor([getattr(last, col.key) for col in key])
+
+
+def paginate(
+    query: Query,
+    *,
+    key: Sequence,
+    cursor: Optional[str],
+    limit: Optional[int],
+    descending: bool = True,
+    skip: int = 0,
+) -> Tuple[list, Optional[str]]:
+    """One page of ``query`` ordered by the ``key`` columns (a unique tie-breaker last).
+
+    Returns the rows and the cursor for the next page, or None on the last page.
+    ``limit=None`` returns every row, unless a cursor is given, in which case the
+    page is ``DEFAULT_PAGE_SIZE`` rows.
+    ``skip`` is for clients still paging by offset; combined with a cursor it's a 400.
+    """
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    rows = _page(query, key, cursor, limit, descending, skip)
+    return rows[:limit], _next_cursor(rows, key, limit)
+
+
+def paginate_with_total(
+    query: Query,
+    *,
+    key: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    include_total: bool = True,
+    descending: bool = True,
+    skip: int = 0,
+) -> Tuple[list, Optional[int], Optional[str]]:
+    """Like :func:`paginate`, plus the number of rows ``query`` matches across all pages.
+
+    The total rides along on every row of the page as a scalar subquery, so it
+    costs no extra round trip; with ``include_total=False`` it isn't computed
+    and comes back as None.
+    """
+    if not include_total:
+        rows, next_cursor = paginate(
+            query, key=key, cursor=cursor, limit=limit, descending=descending, skip=skip
+        )
+        return rows, None, next_cursor
+
+    counted = query.enable_eagerloads(False).order_by(None).statement.subquery()
+    total_column = select(func.count()).select_from(counted).scalar_subquery().label("total")
+    rows = _page(query.add_columns(total_column), key, cursor, limit, descending, skip)
+    entities = [row[0] for row in rows]
+    if rows:
+        total = rows[0].total
+    elif cursor or skip:
+        # Paged past the end: no row carries the total
+        total = query.order_by(None).count()
+    else:
+        total = 0
+    return entities[:limit], total, _next_cursor(entities, key, limit)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,136 @@
+"""Per-request SQL statistics: statement count and database time.
+
+Every engine is instrumented once (``instrument_engine``); its cursor events
+add to the ``RequestQueryStats`` of the request being served, found through
+a context variable. The context is copied into the threadpool for sync
+routes and into ``run_sync`` for async ones, so both count. Work outside a
+request (scheduler jobs, scripts) is only checked against the slow-query
+threshold.
+
+``QueryStatsMiddleware`` reports the totals as a ``Server-Timing`` header
+(``db;dur=12.3;desc="7 queries"``), so browser dev tools show them per
+request, and with ``SQL_LOG_REQUEST_STATEMENTS`` logs each statement.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Connection.info key for the start times of the statements in flight
+_STARTED = "query_stats_started"
+
+
+class RequestQueryStats:
+    """Statements one request ran and the time spent in them."""
+
+    def __init__(self, scope: Optional[dict] = None, keep_statements: bool = False):
+        self.scope = scope or {}
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[List[Tuple[float, str]]] = [] if keep_statements else None
+
+    @property
+    def route(self) -> str:
+        """Method and route template once routing has matched, else the raw path."""
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}".strip()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        if self.statements is not None:
+            self.statements.append((elapsed, statement))
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    """Stats of the request being served, if any."""
+    return _current.get()
+
+
+@contextmanager
+def collecting(stats: RequestQueryStats) -> Iterator[RequestQueryStats]:
+    """Add the statements run in this context (and contexts copied from it) to ``stats``."""
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _compact(statement: str, limit: int = 500) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get(_STARTED)
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    threshold = settings.SQL_SLOW_QUERY_MS
+    if threshold and elapsed * 1000 >= threshold:
+        route = stats.route if stats is not None else "outside a request"
+        logger.warning(f"Slow query ({elapsed * 1000:.0f} ms) in {route}: {_compact(statement)}")
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_STARTED):
+        conn.info[_STARTED].pop()
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement ``engine`` (sync, or async via its sync engine) runs."""
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """Collect a request's SQL statistics and report them in ``Server-Timing``."""
+
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestQueryStats(request.scope, keep_statements=settings.SQL_LOG_REQUEST_STATEMENTS)
+        with collecting(stats):
+            response = await call_next(request)
+
+        if settings.SQL_SERVER_TIMING:
+            existing = response.headers.get("Server-Timing")
+            timing = stats.server_timing()
+            response.headers["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        if stats.statements is not None and stats.count:
+            lines = "\n".join(
+                f"  {elapsed * 1000:7.1f} ms  {_compact(statement)}" for elapsed, statement in stats.statements
+            )
+            logger.info(
+                f"{stats.route}: {stats.count} queries, {stats.duration * 1000:.1f} ms\n{lines}"
+            )
+        return response
@@ -0,0 +1,224 @@
+"""SQLite deployment profile: per-connection pragmas and a process-wide writer queue.
+
+SQLite allows one writer at a time. Left to itself, every blocked writer polls
+the database file until its busy timeout runs out and then fails with
+"database is locked". Here write transactions instead wait their turn in a
+FIFO queue, handed over as each writer commits or rolls back; sync writers
+wait on a thread event, async writers on a future, so a queued async writer
+never blocks the event loop.
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.util import await_
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements that make pysqlite/aiosqlite open a write transaction
+_WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER|ANALYZE)\b", re.IGNORECASE)
+
+# Connection.info key marking a connection whose transaction holds the queue
+_HOLDS_WRITE_LOCK = "sqlite_writer_queue"
+
+
+class _AsyncWaiter:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+
+
+class WriterQueue:
+    """FIFO lock shared by every sync and async connection to one database file."""
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._held = False
+        self._waiters: deque = deque()
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _record(self, waited: float, acquired: bool) -> None:
+        if acquired:
+            self.acquired += 1
+        else:
+            self.timeouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def acquire(self, timeout: float) -> bool:
+        start = time.perf_counter()
+        with self._mutex:
+            if not self._held:
+                self._held = True
+                self._record(0.0, True)
+                return True
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+        acquired = waiter.wait(timeout)
+        with self._mutex:
+            if not acquired:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Handed over just as the wait timed out
+                    acquired = True
+            self._record(time.perf_counter() - start, acquired)
+        return acquired
+
+    async def acquire_async(self, timeout: float) -> bool:
+        start = time.perf_counter()
+        with self._mutex:
+            if not self._held:
+                self._held = True
+                self._record(0.0, True)
+                return True
+            waiter = _AsyncWaiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            return self._abandon(waiter, start)
+        except asyncio.CancelledError:
+            if self._abandon(waiter, start):
+                self.release()
+            raise
+        with self._mutex:
+            self._record(time.perf_counter() - start, True)
+        return True
+
+    def _abandon(self, waiter: _AsyncWaiter, start: float) -> bool:
+        """Withdraw a timed-out or cancelled async waiter; True if it was handed the lock."""
+        # _wake runs on the waiter's loop, i.e. not concurrently with this
+        with self._mutex:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            owned = waiter.future.done() and not waiter.future.cancelled()
+            if not owned:
+                # If ownership is already on its way, _wake passes it on
+                waiter.future.cancel()
+            self._record(time.perf_counter() - start, owned)
+        return owned
+
+    def release(self) -> None:
+        with self._mutex:
+            if not self._waiters:
+                self._held = False
+                return
+            waiter = self._waiters.popleft()
+        # Ownership passes straight to the next writer; _held stays set
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            waiter.loop.call_soon_threadsafe(self._wake, waiter)
+
+    def _wake(self, waiter: _AsyncWaiter) -> None:
+        if waiter.future.done():
+            # The waiter gave up after being handed the lock
+            self.release()
+        else:
+            waiter.future.set_result(True)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._mutex:
+            return {
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "waiting": len(self._waiters),
+                "wait_avg_ms": round(self.wait_total / self.acquired * 1000, 3) if self.acquired else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+# One queue per database file, shared by the sync and async engines
+writer_queues: Dict[str, WriterQueue] = {}
+
+
+def _apply_pragmas(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size = {-int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA foreign_keys = {'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(engine: Engine, is_async: bool = False) -> Optional[WriterQueue]:
+    """Apply the SQLite profile to ``engine`` (the ``sync_engine`` of an async engine).
+
+    Returns the engine's writer queue, or None when writes aren't serialized.
+    """
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection)
+
+    if not settings.SQLITE_SERIALIZE_WRITES:
+        return None
+
+    queue = writer_queues.setdefault(database, WriterQueue())
+    timeout = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_write(conn, cursor, statement, parameters, context, executemany):
+        if conn.info.get(_HOLDS_WRITE_LOCK) or not _WRITE_STATEMENT.match(statement):
+            return
+        # Async engines run events inside SQLAlchemy's greenlet, so the wait
+        # can be awaited without blocking the event loop
+        acquired = await_(queue.acquire_async(timeout)) if is_async else queue.acquire(timeout)
+        if acquired:
+            conn.info[_HOLDS_WRITE_LOCK] = True
+        else:
+            logger.warning(f"SQLite writer queue wait exceeded {timeout}s; writing without it")
+
+    def release(conn):
+        # Fires just before the COMMIT/ROLLBACK reaches SQLite; a writer let in
+        # that early is covered by busy_timeout for the few microseconds left
+        if conn.info.pop(_HOLDS_WRITE_LOCK, False):
+            queue.release()
+
+    event.listen(engine, "commit", release)
+    event.listen(engine, "rollback", release)
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        # A connection returned mid-transaction is rolled back by the pool
+        if connection_record.info.pop(_HOLDS_WRITE_LOCK, False):
+            queue.release()
+
+    return queue
+
+
+def analyze(engine: Engine) -> None:
+    """Refresh the query planner's statistics.
+
+    Without them SQLite assumes any equality filter is selective, e.g. it
+    sorts a whole org's issues by team instead of walking the created_at
+    index for the newest page. Postgres keeps its statistics itself.
+    """
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    logger.info(f"SQLite ANALYZE took {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def get_writer_queue_metrics() -> Dict[str, Dict[str, float]]:
+    return {database: queue.snapshot() for database, queue in writer_queues.items()}
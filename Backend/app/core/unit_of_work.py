@@ -0,0 +1,49 @@
+"""Unit of work: several crud and service writes committed as one transaction.
+
+    with unit_of_work(db):
+        crud_activity.create(db, ...)
+        notification_service.notify_user(db, ...)
+        crud_issue.update(db, db_obj=issue, obj_in=issue_in)
+
+Writes that commit on their own (through ``commit``) only stage their
+objects inside the block. On exit the block flushes them together and
+commits once, or rolls all of them back if it raises. Blocks nest; only
+the outermost one commits.
+
+Sessions don't autoflush, so staged rows have no defaults yet: primary keys
+and timestamps are filled in, and queries see the rows, only after a flush.
+Call ``db.flush()`` inside the block where a later step needs one.
+"""
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+# Session.info key counting the open units of work
+_DEPTH = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    return db.info.get(_DEPTH, 0) > 0
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """Commit every write in the block at once, at the end of the outermost block."""
+    db.info[_DEPTH] = db.info.get(_DEPTH, 0) + 1
+    try:
+        yield db
+    except BaseException:
+        db.info[_DEPTH] -= 1
+        if not in_unit_of_work(db):
+            db.rollback()
+        raise
+    db.info[_DEPTH] -= 1
+    if not in_unit_of_work(db):
+        db.commit()
+
+
+def commit(db: Session) -> None:
+    """Commit, or leave it to the enclosing unit of work."""
+    if not in_unit_of_work(db):
+        db.commit()
@@ -1,5 +1,7 @@
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
+from app.core.pagination import paginate
+from app.core.unit_of_work import commit
 from app.models.activity import Activity, ActivityType
 from uuid import UUID
 
@@ -26,13 +28,22 @@ class CRUDActivity:
             new_value=new_value
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
     
-    def get_by_issue(self, db: Session, *, issue_id: UUID) -> List[Activity]:
-        """Get all activities for an issue"""
-        return db.query(Activity).options(joinedload(Activity.actor)).filter(Activity.issue_id == issue_id).all()
+    def get_by_issue(
+        self,
+        db: Session,
+        *,
+        issue_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[List[Activity], Optional[str]]:
+        """Get an issue's activity history, oldest first; one page if ``cursor`` or ``limit`` is given"""
+        query = db.query(Activity).options(joinedload(Activity.actor)).filter(Activity.issue_id == issue_id)
+        return paginate(
+            query, key=(Activity.created_at, Activity.id), cursor=cursor, limit=limit, descending=False
+        )
 
 
 activity = CRUDActivity()
@@ -1,13 +1,47 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any
+import uuid
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
 from pydantic import BaseModel
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.database import Base
+from app.core.unit_of_work import commit
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def as_uuid(value: Any) -> Optional[uuid.UUID]:
+    """``value`` as a UUID, or None if it isn't one (path ids arrive as strings)."""
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def apply_changes(db_obj: Any, update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the column attributes of ``db_obj`` whose value differs; returns those changes.
+
+    Synonyms (e.g. ``compressed_synonym`` text over a raw column) count as
+    columns and are compared and set through their descriptor. Other keys
+    are ignored. An empty result means there is nothing to write, so callers
+    can skip the UPDATE and the commit.
+    """
+    mapper = inspect(type(db_obj))
+    writable = set(mapper.column_attrs.keys()) | set(mapper.synonyms.keys())
+    changes = {
+        field: value
+        for field, value in update_data.items()
+        if field in writable and getattr(db_obj, field) != value
+    }
+    for field, value in changes.items():
+        setattr(db_obj, field, value)
+    return changes
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for CRUD operations"""
     
@@ -36,8 +70,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in_data = obj_in.model_dump()
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def update(
@@ -47,21 +80,15 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: UpdateSchemaType | dict[str, Any]
     ) -> ModelType:
-        """Update an existing record"""
-        obj_data = db_obj.__dict__
-        
+        """Update an existing record; only changed columns are written, and nothing if none change"""
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+
+        if apply_changes(db_obj, update_data):
+            db.add(db_obj)
+            commit(db)
         return db_obj
 
     def delete(self, db: Session, *, id: Any) -> ModelType:
@@ -70,3 +97,49 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+
+    # -- AsyncSession variants, for `async def` routes ------------------------
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """Get a single record by ID"""
+        id = as_uuid(id)
+        return await db.get(self.model, id) if id else None
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """Get multiple records with pagination"""
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Create a new record"""
+        db_obj = self.model(**obj_in.model_dump())
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any]
+    ) -> ModelType:
+        """Update an existing record; only changed columns are written, and nothing if none change"""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        if apply_changes(db_obj, update_data):
+            db.add(db_obj)
+            await db.commit()
+        return db_obj
+
+    async def delete_async(self, db: AsyncSession, *, id: Any) -> ModelType:
+        """Delete a record"""
+        obj = await db.get(self.model, as_uuid(id))
+        await db.delete(obj)
+        await db.commit()
+        return obj
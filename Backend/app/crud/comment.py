@@ -1,5 +1,7 @@
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
+from app.core.pagination import paginate
+from app.core.unit_of_work import commit
 from app.crud.base import CRUDBase
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate
@@ -9,9 +11,19 @@ from uuid import UUID
 class CRUDComment(CRUDBase[Comment, CommentCreate, dict]):
     """CRUD operations for Comment model"""
     
-    def get_by_issue(self, db: Session, *, issue_id: UUID) -> List[Comment]:
-        """Get all comments for an issue"""
-        return db.query(Comment).options(joinedload(Comment.author)).filter(Comment.issue_id == issue_id).all()
+    def get_by_issue(
+        self,
+        db: Session,
+        *,
+        issue_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[List[Comment], Optional[str]]:
+        """Get an issue's comments, oldest first; one page if ``cursor`` or ``limit`` is given"""
+        query = db.query(Comment).options(joinedload(Comment.author)).filter(Comment.issue_id == issue_id)
+        return paginate(
+            query, key=(Comment.created_at, Comment.id), cursor=cursor, limit=limit, descending=False
+        )
     
     def create_for_issue(
         self,
@@ -28,8 +40,7 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, dict]):
             content=obj_in.content
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
 
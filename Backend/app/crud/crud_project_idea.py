@@ -1,6 +1,9 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
+from typing import Any, Optional, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.core.unit_of_work import commit
+from app.crud.base import CRUDBase, as_uuid
 from app.models.project_idea import ProjectIdea, ValidationReport, ProjectAsset, IdeaStatus
 from app.schemas.ai import IdeaSubmit, IdeaUpdate
 
@@ -12,8 +15,7 @@ class CRUDProjectIdea(CRUDBase[ProjectIdea, IdeaSubmit, IdeaUpdate]):
             status=IdeaStatus.DRAFT
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def get_by_user(self, db: Session, *, user_id: str) -> List[ProjectIdea]:
@@ -25,8 +27,7 @@ class CRUDProjectIdea(CRUDBase[ProjectIdea, IdeaSubmit, IdeaUpdate]):
             **report_data
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def get_asset(self, db: Session, *, idea_id: str, asset_type: str) -> Optional[ProjectAsset]:
@@ -35,7 +36,16 @@ class CRUDProjectIdea(CRUDBase[ProjectIdea, IdeaSubmit, IdeaUpdate]):
             ProjectAsset.asset_type == asset_type
         ).first()
 
-    def create_or_update_asset(self, db: Session, *, idea_id: str, asset_type: str, content: str, status: str, r2_path: str = None) -> ProjectAsset:
+    def create_or_update_asset(
+        self,
+        db: Session,
+        *,
+        idea_id: str,
+        asset_type: str,
+        content: str,
+        status: str,
+        r2_path: str = None,
+    ) -> ProjectAsset:
         asset = self.get_asset(db, idea_id=idea_id, asset_type=asset_type)
         if asset:
             asset.content = content
@@ -51,8 +61,78 @@ class CRUDProjectIdea(CRUDBase[ProjectIdea, IdeaSubmit, IdeaUpdate]):
                 r2_path=r2_path
             )
             db.add(asset)
-        db.commit()
-        db.refresh(asset)
+        commit(db)
+        return asset
+
+    # -- AsyncSession variants ------------------------------------------------
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ProjectIdea]:
+        """Get an idea with its validation report loaded (AsyncSession can't lazy-load it)."""
+        id = as_uuid(id)
+        if id is None:
+            return None
+        result = await db.execute(
+            select(ProjectIdea)
+            .options(selectinload(ProjectIdea.validation_report))
+            .where(ProjectIdea.id == id)
+        )
+        return result.scalar_one_or_none()
+
+    async def create_with_user_async(self, db: AsyncSession, *, obj_in: IdeaSubmit, user_id: str) -> ProjectIdea:
+        db_obj = ProjectIdea(
+            raw_input=obj_in.raw_input,
+            user_id=as_uuid(user_id),
+            status=IdeaStatus.DRAFT
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def create_validation_report_async(self, db: AsyncSession, *, idea_id: Any, report_data: dict) -> ValidationReport:
+        db_obj = ValidationReport(
+            project_idea_id=as_uuid(idea_id),
+            **report_data
+        )
+        db.add(db_obj)
+        await db.commit()
+        return db_obj
+
+    async def get_asset_async(self, db: AsyncSession, *, idea_id: Any, asset_type: str) -> Optional[ProjectAsset]:
+        result = await db.execute(
+            select(ProjectAsset).where(
+                ProjectAsset.project_idea_id == as_uuid(idea_id),
+                ProjectAsset.asset_type == asset_type,
+            ).limit(1)
+        )
+        return result.scalars().first()
+
+    async def create_or_update_asset_async(
+        self,
+        db: AsyncSession,
+        *,
+        idea_id: Any,
+        asset_type: str,
+        content: str,
+        status: str,
+        r2_path: str = None,
+    ) -> ProjectAsset:
+        """Async :meth:`create_or_update_asset`"""
+        asset = await self.get_asset_async(db, idea_id=idea_id, asset_type=asset_type)
+        if asset:
+            asset.content = content
+            asset.status = status
+            if r2_path:
+                asset.r2_path = r2_path
+        else:
+            asset = ProjectAsset(
+                project_idea_id=as_uuid(idea_id),
+                asset_type=asset_type,
+                content=content,
+                status=status,
+                r2_path=r2_path
+            )
+            db.add(asset)
+        await db.commit()
         return asset
 
 project_idea = CRUDProjectIdea(ProjectIdea)
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from app.core.unit_of_work import commit
 from uuid import uuid4
 from app.models.document import Document
 
@@ -14,8 +15,7 @@ class CRUDDocument:
             title=title,
         )
         db.add(doc)
-        db.commit()
-        db.refresh(doc)
+        commit(db)
         return doc
 
     def get(self, db: Session, doc_id: str) -> Document | None:
@@ -1,7 +1,11 @@
 from typing import List, Optional, Any, Tuple
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
 from sqlalchemy import or_, func
-from app.crud.base import CRUDBase
+from app.core.pagination import paginate
+from app.core.unit_of_work import commit
+from app.crud.base import CRUDBase, apply_changes
+from app.crud.identifier_counter import FEATURE, identifier_counter
+from app.crud.loaders import FEATURE_DETAIL, FEATURE_LIST
 from app.models.feature import Feature, Milestone, FeatureStatus, FeatureHealth
 from app.models.issue import IssuePriority
 from app.schemas.feature import FeatureCreate, FeatureUpdate, MilestoneCreate, MilestoneUpdate
@@ -12,15 +16,22 @@ class CRUDFeature(CRUDBase[Feature, FeatureCreate, FeatureUpdate]):
     """CRUD operations for Feature model"""
     
     def get(self, db: Session, id: Any) -> Optional[Feature]:
-        return db.query(Feature).options(
-            selectinload(Feature.milestones)
-        ).filter(Feature.id == id).first()
+        return db.query(Feature).options(*FEATURE_DETAIL).filter(Feature.id == id).first()
 
-    def get_by_project(self, db: Session, *, project_id: UUID) -> List[Feature]:
-        """Get all features for a project"""
-        return db.query(Feature).options(
-            selectinload(Feature.milestones)
-        ).filter(Feature.project_id == project_id).all()
+    # Keyset for feature lists: newest first, id breaks ties
+    PAGE_KEY = (Feature.created_at, Feature.id)
+
+    def get_by_project(
+        self,
+        db: Session,
+        *,
+        project_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Feature], Optional[str]]:
+        """Get a project's features; one page if ``cursor`` or ``limit`` is given"""
+        query = db.query(Feature).options(*FEATURE_LIST).filter(Feature.project_id == project_id)
+        return paginate(query, key=self.PAGE_KEY, cursor=cursor, limit=limit)
 
     def get_multi_by_user_projects(
         self, 
@@ -28,52 +39,33 @@ class CRUDFeature(CRUDBase[Feature, FeatureCreate, FeatureUpdate]):
         *, 
         user_id: UUID, 
         user_team_ids: List[UUID],
-        organization_id: Optional[UUID] = None
-    ) -> List[Feature]:
-        """Get all features for all projects the user has access to"""
+        organization_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Feature], Optional[str]]:
+        """Get features for all projects the user has access to; one page if ``cursor`` or ``limit`` is given"""
         from app.models.project import Project
         from app.models.team_model import Team
-        query = db.query(Feature).options(
-            selectinload(Feature.milestones)
-        ).join(Project).join(Project.team)
+        query = db.query(Feature).options(*FEATURE_LIST).join(Project).join(Project.team)
         
         if organization_id:
             query = query.filter(Team.organization_id == organization_id)
             
-        return query.all()
+        return paginate(query, key=self.PAGE_KEY, cursor=cursor, limit=limit)
 
     def get_next_identifier(self, db: Session, prefix: str) -> str:
-        """Get the next identifier for a given prefix (e.g., ENG-F1, ENG-F2)"""
-        from sqlalchemy import func
-        # We use a distinct suffix for features, like prefix-F{number}
-        feature_prefix = f"{prefix}-F"
-        pattern = f"{feature_prefix}%"
-        
-        # We sort by length first, then alphabetically to handle numeric strings correctly
-        # e.g., 'JAW-F10' (len 7) should be > 'JAW-F9' (len 6)
-        max_id_row = db.query(Feature.identifier).filter(
-            Feature.identifier.like(pattern)
-        ).order_by(
-            func.length(Feature.identifier).desc(),
-            Feature.identifier.desc()
-        ).first()
-        
-        if not max_id_row:
-            return f"{feature_prefix}1"
-        
-        try:
-            # Extract number from prefix-Fnumber
-            if hasattr(max_id_row, "_mapping"):
-                id_str = max_id_row[0]
-            elif isinstance(max_id_row, (tuple, list)):
-                id_str = max_id_row[0]
-            else:
-                id_str = str(max_id_row)
+        """Allocate the next identifier for a given prefix (e.g., ENG-F1, ENG-F2)"""
+        return self.reserve_identifiers(db, prefix, 1)[0]
 
-            current_num = int(id_str.replace(feature_prefix, ""))
-            return f"{feature_prefix}{current_num + 1}"
-        except (ValueError, IndexError, AttributeError):
-            return f"{feature_prefix}1"
+    def reserve_identifiers(self, db: Session, prefix: str, count: int) -> List[str]:
+        """Allocate ``count`` consecutive feature identifiers for a prefix, for bulk creates"""
+        if count < 1:
+            return []
+        first = identifier_counter.reserve(
+            db, FEATURE, prefix, count,
+            current_max=lambda: self.get_max_identifier_num(db, prefix),
+        )
+        return [f"{prefix}-F{n}" for n in range(first, first + count)]
 
     def get_max_identifier_num(self, db: Session, prefix: str) -> int:
         """Get the current maximum identifier number for a team's features."""
@@ -115,8 +107,7 @@ class CRUDFeature(CRUDBase[Feature, FeatureCreate, FeatureUpdate]):
             del obj_in_data["identifier"]
         db_obj = Feature(**obj_in_data, identifier=identifier)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def create_milestone(self, db: Session, *, feature_id: UUID, obj_in: MilestoneCreate) -> Milestone:
@@ -129,8 +120,7 @@ class CRUDFeature(CRUDBase[Feature, FeatureCreate, FeatureUpdate]):
             completed=obj_in.completed
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         
         return db_obj
         
@@ -141,13 +131,10 @@ class CRUDFeature(CRUDBase[Feature, FeatureCreate, FeatureUpdate]):
         return db.query(Milestone).filter(Milestone.id == id).first()
 
     def update_milestone(self, db: Session, *, db_obj: Milestone, obj_in: MilestoneUpdate) -> Milestone:
-        update_data = obj_in.model_dump(exclude_unset=True)
-        for field in update_data:
-            setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        
+        if apply_changes(db_obj, obj_in.model_dump(exclude_unset=True)):
+            db.add(db_obj)
+            commit(db)
+
         return db_obj
 
     def delete_milestone(self, db: Session, *, id: UUID) -> Optional[Milestone]:
@@ -0,0 +1,65 @@
+from typing import Callable
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models.identifier_counter import IdentifierCounter
+
+# Identifier sequences
+ISSUE = "issue"
+SUBISSUE = "subissue"
+FEATURE = "feature"
+
+
+class CRUDIdentifierCounter:
+    """Allocates identifier numbers from ``identifier_counters``.
+
+    Each allocation is a single ``UPDATE ... RETURNING`` on the sequence's
+    row, so it costs the same however many issues a team has, and concurrent
+    allocations queue on the row lock instead of racing to the same number.
+    The row is updated in the caller's transaction: numbers given to work
+    that is rolled back are handed out again, leaving no gaps.
+    """
+
+    def reserve(
+        self,
+        db: Session,
+        kind: str,
+        scope: str,
+        count: int = 1,
+        *,
+        current_max: Callable[[], int],
+    ) -> int:
+        """Reserve ``count`` consecutive numbers and return the first.
+
+        ``current_max`` returns the highest number already used in the
+        sequence; it only runs the first time a sequence is used, to start
+        the counter after identifiers created before it existed.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        stmt = (
+            update(IdentifierCounter)
+            .where(IdentifierCounter.kind == kind, IdentifierCounter.scope == scope)
+            .values(value=IdentifierCounter.value + count)
+            .returning(IdentifierCounter.value)
+            .execution_options(synchronize_session=False)
+        )
+        value = db.execute(stmt).scalar_one_or_none()
+        if value is None:
+            self._start(db, kind, scope, current_max())
+            value = db.execute(stmt).scalar_one()
+        return value - count + 1
+
+    def _start(self, db: Session, kind: str, scope: str, value: int) -> None:
+        # A concurrent first use may insert the row first; its value wins and
+        # the UPDATE that follows waits for it
+        insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        db.execute(
+            insert(IdentifierCounter)
+            .values(kind=kind, scope=scope, value=value)
+            .on_conflict_do_nothing(index_elements=["kind", "scope"])
+        )
+
+
+identifier_counter = CRUDIdentifierCounter()
@@ -1,8 +1,11 @@
 from typing import List, Optional
-from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, func
-from app.crud.base import CRUDBase
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func
+from app.core.pagination import DEFAULT_PAGE_SIZE, paginate, paginate_with_total
+from app.core.unit_of_work import commit
+from app.crud.base import CRUDBase, apply_changes
+from app.crud.identifier_counter import ISSUE, SUBISSUE, identifier_counter
+from app.crud.loaders import ISSUE_DETAIL, ISSUE_LIST
 from app.models.issue import (
     Issue,
     IssueStatus,
@@ -23,138 +26,112 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
     def get(self, db: Session, id: any) -> Optional[Issue]:
         return (
             db.query(self.model)
-            .options(joinedload(Issue.assignee))
+            .options(*ISSUE_DETAIL)
             .filter(self.model.id == id)
             .first()
         )
 
     def create(self, db: Session, *, obj_in: IssueCreate, identifier: str) -> Issue:
-        """Create issue with collision retry using savepoints"""
-        from sqlalchemy.exc import IntegrityError
-        from app.models.team_model import Team
-
+        """Create issue with an identifier allocated by ``get_next_identifier``"""
         obj_in_data = obj_in.model_dump()
         resources_data = obj_in_data.pop("resources", None)
 
-        current_identifier = identifier
-
-        for attempt in range(5):
-            try:
-                # Start a savepoint
-                savepoint = db.begin_nested()
-                db_obj = Issue(**obj_in_data, identifier=current_identifier)
-                db.add(db_obj)
-                db.flush()
-
-                # If flush succeeds, we've successfully reserved the ID
-                if resources_data:
-                    for res in resources_data:
-                        resource_obj = Resource(
-                            name=res["name"],
-                            url=res["url"],
-                            type=res["type"],
-                            target_id=db_obj.id,
-                            target_type=ResourceTargetType.ISSUE,
-                        )
-                        db.add(resource_obj)
-
-                db.commit()
-                db.refresh(db_obj)
-                return db_obj
-
-            except IntegrityError:
-                # Rollback to the savepoint on collision
-                db.rollback()
-
-                # Handle sub-issue retry
-                parent_id = obj_in_data.get("parent_id")
-                if parent_id:
-                    parent = db.query(Issue).filter(Issue.id == parent_id).first()
-                    if parent:
-                        current_identifier = self.get_next_subissue_identifier(
-                            db, parent_identifier=parent.identifier
-                        )
-                        continue
-
-                team = db.query(Team).filter(Team.id == obj_in.team_id).first()
-                if not team:
-                    raise ValueError(f"Team {obj_in.team_id} not found during retry")
-
-                current_identifier = self.get_next_identifier(
-                    db, prefix=team.identifier
+        db_obj = Issue(**obj_in_data, identifier=identifier)
+        db.add(db_obj)
+        db.flush()
+
+        if resources_data:
+            for res in resources_data:
+                resource_obj = Resource(
+                    name=res["name"],
+                    url=res["url"],
+                    type=res["type"],
+                    target_id=db_obj.id,
+                    target_type=ResourceTargetType.ISSUE,
                 )
-                continue
+                db.add(resource_obj)
 
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to generate unique issue identifier after multiple attempts",
-        )
+        commit(db)
+        return db_obj
 
     def update(self, db: Session, *, db_obj: Issue, obj_in: IssueUpdate) -> Issue:
-        """Update issue"""
-        update_data = obj_in.model_dump(exclude_unset=True)
-        # Update fields
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        """Update issue; only changed columns are written, and nothing if none change"""
+        if apply_changes(db_obj, obj_in.model_dump(exclude_unset=True)):
+            db.add(db_obj)
+            commit(db)
         return db_obj
 
-    def get_by_assignee(self, db: Session, *, assignee_id: UUID) -> List[Issue]:
-        """Get all issues assigned to a user"""
-        return (
+    # Keyset for issue lists: newest first, id breaks ties
+    PAGE_KEY = (Issue.created_at, Issue.id)
+
+    def get_by_assignee(
+        self,
+        db: Session,
+        *,
+        assignee_id: UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[List[Issue], Optional[str]]:
+        """Get issues assigned to a user; one page if ``cursor`` or ``limit`` is given"""
+        query = (
             db.query(Issue)
-            .options(joinedload(Issue.assignee))
+            .options(*ISSUE_LIST)
             .filter(Issue.assignee_id == assignee_id)
-            .all()
         )
+        return paginate(query, key=self.PAGE_KEY, cursor=cursor, limit=limit)
 
-    def get_triage_issues(self, db: Session) -> List[Issue]:
-        """Get all issues pending triage"""
-        return (
+    def get_triage_issues(
+        self,
+        db: Session,
+        *,
+        organization_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[List[Issue], Optional[str]]:
+        """Get issues pending triage; one page if ``cursor`` or ``limit`` is given"""
+        from app.models.team_model import Team
+
+        query = (
             db.query(Issue)
-            .options(joinedload(Issue.assignee))
+            .options(*ISSUE_LIST)
             .filter(Issue.triage_status == TriageStatus.PENDING)
-            .all()
         )
+        if organization_id:
+            query = query.join(Issue.team).filter(Team.organization_id == organization_id)
+        return paginate(query, key=self.PAGE_KEY, cursor=cursor, limit=limit)
 
     def get_next_identifier(self, db: Session, prefix: str) -> str:
-        """Get the next identifier for a given prefix (e.g., ENG-1, ENG-2)"""
-        # Query for the highest identifier number with the given prefix
-        # We sort by length first, then alphabetically to handle numeric strings correctly
-        # e.g., 'JAW-10' (len 6) should be > 'JAW-9' (len 5)
-
-        pattern = f"{prefix}-%"
-        # Filter out sub-issues (containing -S) to get the true next parent ID
-        max_id = (
-            db.query(Issue.identifier)
-            .filter(Issue.identifier.like(pattern), Issue.identifier.not_like("%-S%"))
-            .order_by(func.length(Issue.identifier).desc(), Issue.identifier.desc())
-            .first()
+        """Allocate the next identifier for a given prefix (e.g., ENG-1, ENG-2)"""
+        return self.reserve_identifiers(db, prefix, 1)[0]
+
+    def reserve_identifiers(self, db: Session, prefix: str, count: int) -> List[str]:
+        """Allocate ``count`` consecutive identifiers for a prefix, for bulk creates"""
+        if count < 1:
+            return []
+        first = identifier_counter.reserve(
+            db, ISSUE, prefix, count,
+            current_max=lambda: self.get_max_identifier_num(db, prefix),
         )
-
-        if not max_id:
-            return f"{prefix}-1"
-
-        try:
-            # Extract number from prefix-number using rsplit to handle prefixes with hyphens
-            # identifier is a Row in SQLAlchemy 2.0 if we only queried one column
-            if hasattr(max_id, "_mapping"):
-                id_str = max_id[0]
-            elif isinstance(max_id, (tuple, list)):
-                id_str = max_id[0]
-            else:
-                id_str = str(max_id)
-
-            current_num = int(id_str.rsplit("-", 1)[1])
-            return f"{prefix}-{current_num + 1}"
-        except (ValueError, IndexError, AttributeError):
-            # Fallback if parsing fails
-            return f"{prefix}-1"
+        return [f"{prefix}-{n}" for n in range(first, first + count)]
 
     def get_next_subissue_identifier(self, db: Session, parent_identifier: str) -> str:
-        """Get the next sub-issue identifier for a given parent (e.g., ENG-1-S1, ENG-1-S2)"""
+        """Allocate the next sub-issue identifier for a given parent (e.g., ENG-1-S1, ENG-1-S2)"""
+        return self.reserve_subissue_identifiers(db, parent_identifier, 1)[0]
+
+    def reserve_subissue_identifiers(
+        self, db: Session, parent_identifier: str, count: int
+    ) -> List[str]:
+        """Allocate ``count`` consecutive sub-issue identifiers under a parent"""
+        if count < 1:
+            return []
+        first = identifier_counter.reserve(
+            db, SUBISSUE, parent_identifier, count,
+            current_max=lambda: self.get_max_subissue_num(db, parent_identifier),
+        )
+        return [f"{parent_identifier}-S{n}" for n in range(first, first + count)]
+
+    def get_max_subissue_num(self, db: Session, parent_identifier: str) -> int:
+        """Get the current maximum sub-issue number under a parent."""
         pattern = f"{parent_identifier}-S%"
         max_id = (
             db.query(Issue.identifier)
@@ -164,22 +141,13 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         )
 
         if not max_id:
-            return f"{parent_identifier}-S1"
+            return 0
 
         try:
-            if hasattr(max_id, "_mapping"):
-                id_str = max_id[0]
-            elif isinstance(max_id, (tuple, list)):
-                id_str = max_id[0]
-            else:
-                id_str = str(max_id)
-
             # Extract number from parent_id-SN
-            current_num_str = id_str.rsplit("-S", 1)[1]
-            current_num = int(current_num_str)
-            return f"{parent_identifier}-S{current_num + 1}"
+            return int(max_id[0].rsplit("-S", 1)[1])
         except (ValueError, IndexError, AttributeError):
-            return f"{parent_identifier}-S1"
+            return 0
 
     def get_max_identifier_num(self, db: Session, prefix: str) -> int:
         """Get the current maximum identifier number for a team (excluding sub-issues)."""
@@ -221,14 +189,20 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
         team_id: Optional[UUID] = None,
         search: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100,
+        limit: int = DEFAULT_PAGE_SIZE,
         organization_id: Optional[UUID] = None,
-    ) -> tuple[List[Issue], int]:
-        """Get filtered issues with visibility rules"""
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> tuple[List[Issue], Optional[int], Optional[str]]:
+        """Get a page of filtered issues with visibility rules, the total and the next cursor.
+
+        The total comes back in the same query as the page, or is skipped (None)
+        with ``include_total=False``.
+        """
 
         from app.models.team_model import Team
 
-        query = db.query(Issue).options(joinedload(Issue.assignee)).join(Issue.team)
+        query = db.query(Issue).options(*ISSUE_LIST).join(Issue.team)
 
         if organization_id:
             query = query.filter(Team.organization_id == organization_id)
@@ -252,17 +226,20 @@ class CRUDIssue(CRUDBase[Issue, IssueCreate, IssueUpdate]):
             query = query.filter(Issue.team_id == team_id)
 
         if search:
+            from app.services.search_service import search_service
+
             query = query.filter(
-                or_(
-                    Issue.title.ilike(f"%{search}%"),
-                    Issue.identifier.ilike(f"%{search}%"),
-                )
+                Issue.id.in_(search_service.matching_ids(db, search, "issue", organization_id))
             )
 
-        total = query.count()
-        issues = query.offset(skip).limit(limit).all()
-
-        return issues, total
+        return paginate_with_total(
+            query,
+            key=self.PAGE_KEY,
+            cursor=cursor,
+            limit=limit,
+            include_total=include_total,
+            skip=skip,
+        )
 
 
 issue = CRUDIssue(Issue)
@@ -0,0 +1,61 @@
+"""Loader profiles: the relationships each endpoint serializes, loaded up front.
+
+Every profile covers its response schema, so a page of N rows costs a fixed
+number of statements instead of N lazy loads. Self-referencing trees
+(sub-issues, sub-features) load level by level with ``recursion_depth=-1``:
+one statement per level of depth, whatever the page size.
+
+With ``ORM_RAISE_ON_LAZY_LOAD`` the core models raise on a lazy load
+(``LAZY_LOAD``), so a relationship missing from a profile fails loudly. The
+tests run that way and check per-endpoint statement budgets
+(tests/test_api/test_query_counts.py). Write routes return their object
+reloaded through the same profile as the read routes.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.feature import Feature
+from app.models.issue import Issue
+from app.models.project import Project, ProjectUpdate, ProjectUpdateComment, Reaction
+from app.models.team_model import Team
+
+# schemas.issue.Issue: assignee, resources and the sub-issue tree with the same
+ISSUE_LIST = (
+    joinedload(Issue.assignee),
+    selectinload(Issue.resources),
+    selectinload(Issue.sub_issues, recursion_depth=-1).options(
+        joinedload(Issue.assignee),
+        selectinload(Issue.resources),
+    ),
+)
+# GET /issues/{id} also checks the team's organization
+ISSUE_DETAIL = ISSUE_LIST + (joinedload(Issue.team),)
+
+# schemas.feature.Feature: milestones and the sub-feature tree with the same
+FEATURE_LIST = (
+    selectinload(Feature.milestones),
+    selectinload(Feature.sub_features, recursion_depth=-1).selectinload(Feature.milestones),
+)
+# GET /features/{id} also checks the project's organization
+FEATURE_DETAIL = FEATURE_LIST + (joinedload(Feature.project).joinedload(Project.team),)
+
+# Organization check only, for routes that don't return the project
+PROJECT_ACCESS = (joinedload(Project.team),)
+# schemas.project.Project, list and detail: lead, members, teams with their
+# people, updates with authors, comments and reactions, and resources
+PROJECT = PROJECT_ACCESS + (
+    joinedload(Project.lead),
+    selectinload(Project.members),
+    selectinload(Project.teams).options(
+        selectinload(Team.leaders),
+        selectinload(Team.members),
+    ),
+    selectinload(Project.updates).options(
+        joinedload(ProjectUpdate.author),
+        selectinload(ProjectUpdate.reactions).joinedload(Reaction.user),
+        selectinload(ProjectUpdate.comments).options(
+            joinedload(ProjectUpdateComment.author),
+            selectinload(ProjectUpdateComment.reactions).joinedload(Reaction.user),
+        ),
+    ),
+    selectinload(Project.resources),
+)
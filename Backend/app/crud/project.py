@@ -1,7 +1,10 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import or_, and_
+from app.core.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.core.unit_of_work import commit
 from app.crud.base import CRUDBase
+from app.crud.loaders import PROJECT
 from app.models.project import (
     Project,
     Visibility,
@@ -25,6 +28,10 @@ from uuid import UUID
 
 
 class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdateSchema]):
+    def get(self, db: Session, id: Any, *, loaders: tuple = PROJECT) -> Optional[Project]:
+        """Get a project with the relationships its schema serializes, or ``loaders``"""
+        return db.query(Project).options(*loaders).filter(Project.id == id).first()
+
     def get_filtered(
         self,
         db: Session,
@@ -34,13 +41,14 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdateSchema]):
         team_id: Optional[UUID] = None,
         organization_id: Optional[UUID] = None,
         skip: int = 0,
-        limit: int = 100,
+        limit: int = DEFAULT_PAGE_SIZE,
         is_admin: bool = False,
-    ) -> List[Project]:
-        """Get filtered projects with visibility rules"""
+        cursor: Optional[str] = None,
+    ) -> tuple[List[Project], Optional[str]]:
+        """Get a page of filtered projects with visibility rules and the next cursor"""
         from app.models.team_model import Team
 
-        query = db.query(Project).join(Project.team)
+        query = db.query(Project).options(*PROJECT).join(Project.team)
 
         if organization_id:
             query = query.filter(Team.organization_id == organization_id)
@@ -53,7 +61,9 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdateSchema]):
         # Members see all in org (as per requirement: "Member can see all projects even if not in it")
         # So we don't need additional filters here if organization_id is provided
 
-        return query.offset(skip).limit(limit).all()
+        return paginate(
+            query, key=(Project.created_at, Project.id), cursor=cursor, limit=limit, skip=skip
+        )
 
     def create_with_relations(
         self,
@@ -79,8 +89,7 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdateSchema]):
             db_obj.teams = teams
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def update_with_relations(
@@ -115,8 +124,7 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdateSchema]):
             setattr(db_obj, field, update_data[field])
 
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def get_multi(
@@ -209,8 +217,7 @@ class CRUDProjectUpdate(
         obj_in_data = obj_in.model_dump()
         db_obj = ProjectUpdate(**obj_in_data, author_id=author_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
 
@@ -226,8 +233,7 @@ class CRUDResource(CRUDBase[Resource, ProjectResourceCreate, ProjectResourceSche
         obj_in_data = obj_in.model_dump()
         db_obj = Resource(**obj_in_data, target_id=target_id, target_type=target_type)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
 
@@ -240,8 +246,7 @@ class CRUDProjectUpdateComment(
         obj_in_data = obj_in.model_dump()
         db_obj = ProjectUpdateComment(**obj_in_data, author_id=author_id)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
 
@@ -272,8 +277,7 @@ class CRUDReaction(CRUDBase[Reaction, any, any]):
             emoji=emoji,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def toggle_comment_reaction(
@@ -302,8 +306,7 @@ class CRUDReaction(CRUDBase[Reaction, any, any]):
             emoji=emoji,
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
 
@@ -1,5 +1,6 @@
 from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.unit_of_work import commit
 from app.crud.base import CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -29,8 +30,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             is_active=True
         )
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit(db)
         return db_obj
 
     def authenticate(self, db: Session, *, username: str, password: str) -> Optional[User]:
@@ -4,13 +4,27 @@ import logging
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
 from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.core.rate_limit import limiter
 from app.services.audit_service import log_event, RATE_LIMIT_EXCEEDED
 from app.api.v1 import api_router
-from app.core.database import Base, engine, ensure_runtime_schema
+from app.core.database import (
+    Base,
+    async_engine,
+    async_read_engine,
+    engine,
+    ensure_runtime_schema,
+    get_pool_metrics,
+    has_read_replica,
+    recent_writes,
+)
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.sqlite import get_writer_queue_metrics
+from app.api.deps import RECENT_WRITE_COOKIE, get_token_from_request
 
 logger = logging.getLogger(__name__)
 
@@ -31,22 +45,150 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class RecentWriteMiddleware(BaseHTTPMiddleware):
+    """Pin a client's reads to the primary for a while after it writes.
+
+    The client is remembered by its token in this process and by a short-lived
+    cookie across workers, so its next reads don't hit a lagging replica.
+    """
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in self.SAFE_METHODS and response.status_code < 400:
+            token = get_token_from_request(request)
+            if token:
+                recent_writes.note(token)
+            window = settings.DATABASE_REPLICA_CONSISTENCY_SECONDS
+            response.set_cookie(
+                key=RECENT_WRITE_COOKIE,
+                value="1",
+                httponly=True,
+                secure=True,
+                samesite="lax",
+                max_age=max(1, round(window)),
+                path="/",
+            )
+        return response
+
+
+class UploadSizeLimitMiddleware:
+    """Refuse oversized multipart bodies before the form parser spools them.
+
+    A declared Content-Length over the limit is rejected without reading the
+    body. Chunked bodies are cut off as soon as the running total exceeds it:
+    the app sees the client disconnect, and whatever it answers is replaced
+    by the 413.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload too large. Maximum request size is {self.max_bytes} bytes."},
+        )
+        length = headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_bytes:
+            return await response(scope, receive, send)
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded and not started:
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded or started:
+                raise
+        if exceeded and not started:
+            await response(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     from apscheduler.schedulers.background import BackgroundScheduler
     from app.tasks.sync_drive_to_r2 import run_sync_task
+    from app.tasks.mirror_assets_to_drive import run_mirror_task
+    from app.services.google_credentials import google_credentials
+    from app.services.conversion_service import conversion_service
+    from app.services.project_md_service import project_md_service
 
     scheduler = BackgroundScheduler()
     scheduler.add_job(run_sync_task, 'interval', minutes=15, id='doc_sync_job')
+    scheduler.add_job(
+        run_mirror_task,
+        'interval',
+        seconds=settings.DRIVE_MIRROR_INTERVAL_SECONDS,
+        id='drive_mirror_job',
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        google_credentials.refresh_due,
+        'interval',
+        seconds=settings.GOOGLE_TOKEN_REFRESH_INTERVAL_SECONDS,
+        id='google_token_refresh_job',
+        max_instances=1,
+        coalesce=True,
+    )
+    if engine.url.get_backend_name() == "sqlite" and settings.SQLITE_ANALYZE_INTERVAL_MINUTES > 0:
+        from datetime import datetime
+        from app.core.sqlite import analyze
+
+        scheduler.add_job(
+            analyze,
+            'interval',
+            args=[engine],
+            minutes=settings.SQLITE_ANALYZE_INTERVAL_MINUTES,
+            next_run_time=datetime.now(),
+            id='sqlite_analyze_job',
+            max_instances=1,
+            coalesce=True,
+        )
     scheduler.start()
     app.state.scheduler = scheduler
     logger.info("Started background scheduler for document sync")
     try:
         yield
     finally:
+        await project_md_service.flush()
         if hasattr(app.state, "scheduler"):
             app.state.scheduler.shutdown()
             logger.info("Shutdown background scheduler")
+        google_credentials.close()
+        conversion_service.shutdown()
+        await async_engine.dispose()
+        if has_read_replica():
+            await async_read_engine.dispose()
 
 
 app = FastAPI(
@@ -82,9 +224,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing"],
 )
 
+app.add_middleware(QueryStatsMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+if has_read_replica():
+    app.add_middleware(RecentWriteMiddleware)
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=settings.UPLOAD_MAX_REQUEST_BYTES)
 
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -103,3 +250,9 @@ def root():
 def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/health/db")
+def database_health():
+    """Connection pool occupancy and checkout wait times per engine"""
+    return {"pools": get_pool_metrics(), "sqlite_writer_queues": get_writer_queue_metrics()}
@@ -28,8 +28,11 @@ from app.models.project_idea import (
     ProjectIdea,
     ValidationReport,
     ProjectAsset,
+    AssetRevision,
 )
 from app.models.notification import Notification
+from app.models.search_document import SearchDocument
+from app.models.identifier_counter import IdentifierCounter
 
 from app.models.enums import (
     ProjectStatus,
@@ -51,6 +54,7 @@ from app.models.enums import (
     IdeaStatus,
     AssetType,
     AssetStatus,
+    MirrorStatus,
     NotificationType,
     UserRoleType,
     ReactionTargetType,
@@ -79,7 +83,10 @@ __all__ = [
     "ProjectIdea",
     "ValidationReport",
     "ProjectAsset",
+    "AssetRevision",
     "Notification",
+    "SearchDocument",
+    "IdentifierCounter",
     # Enums
     "ProjectStatus",
     "ProjectHealth",
@@ -100,6 +107,7 @@ __all__ = [
     "IdeaStatus",
     "AssetType",
     "AssetStatus",
+    "MirrorStatus",
     "NotificationType",
     "UserRoleType",
     "ReactionTargetType",
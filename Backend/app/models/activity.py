@@ -33,4 +33,5 @@ class Activity(Base):
         Index("idx_activities_issue_id", "issue_id"),
         Index("idx_activities_actor_id", "actor_id"),
         Index("idx_activities_created_at", "created_at"),
+        Index("idx_activities_issue_created_at_id", "issue_id", "created_at", "id"),
     )
@@ -3,7 +3,7 @@ from sqlalchemy import Column, Text, DateTime, ForeignKey, Index, UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.time import utc_now
-from app.core.database import Base
+from app.core.database import Base, LAZY_LOAD
 
 
 class Comment(Base):
@@ -21,10 +21,11 @@ class Comment(Base):
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    issue = relationship("Issue", back_populates="comments")
-    author = relationship("User", back_populates="comments")
+    issue = relationship("Issue", back_populates="comments", lazy=LAZY_LOAD)
+    author = relationship("User", back_populates="comments", lazy=LAZY_LOAD)
 
     __table_args__ = (
         Index("idx_comments_issue_id", "issue_id"),
         Index("idx_comments_author_id", "author_id"),
+        Index("idx_comments_issue_created_at_id", "issue_id", "created_at", "id"),
     )
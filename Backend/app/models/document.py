@@ -26,6 +26,10 @@ class Document(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # Timestamps come from the database; RETURNING hands them back with the
+    # INSERT or UPDATE instead of a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     # Relationships
     project = relationship("Project", back_populates="documents")
     idea = relationship("ProjectIdea")
@@ -142,6 +142,13 @@ class AssetStatus(str, enum.Enum):
     FAILED = "FAILED"
 
 
+class MirrorStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    IN_PROGRESS = "IN_PROGRESS"
+    SYNCED = "SYNCED"
+    FAILED = "FAILED"
+
+
 class NotificationType(str, enum.Enum):
     ISSUE_ASSIGNED = "ISSUE_ASSIGNED"
     ISSUE_STATUS_CHANGED = "ISSUE_STATUS_CHANGED"
@@ -15,7 +15,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.time import utc_now
-from app.core.database import Base
+from app.core.database import Base, LAZY_LOAD
 from app.models.enums import IssuePriority, FeatureType, FeatureStatus, FeatureHealth
 
 
@@ -63,23 +63,25 @@ class Feature(Base):
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    project = relationship("Project", back_populates="features")
-    owner = relationship("User", foreign_keys=[owner_id])
+    project = relationship("Project", back_populates="features", lazy=LAZY_LOAD)
+    owner = relationship("User", foreign_keys=[owner_id], lazy=LAZY_LOAD)
     milestones = relationship(
-        "Milestone", back_populates="feature", cascade="all, delete-orphan"
+        "Milestone", back_populates="feature", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     issues = relationship(
-        "Issue", back_populates="feature", cascade="all, delete-orphan"
+        "Issue", back_populates="feature", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
 
     sub_features = relationship(
-        "Feature", cascade="all, delete-orphan", back_populates="parent"
+        "Feature", cascade="all, delete-orphan", back_populates="parent", lazy=LAZY_LOAD
     )
-    parent = relationship("Feature", remote_side=[id], back_populates="sub_features")
+    parent = relationship("Feature", remote_side=[id], back_populates="sub_features", lazy=LAZY_LOAD)
 
     __table_args__ = (
         Index("idx_features_project_id", "project_id"),
         Index("idx_features_status", "status"),
+        Index("idx_features_created_at_id", "created_at", "id"),
+        Index("idx_features_project_created_at_id", "project_id", "created_at", "id"),
     )
 
     @property
@@ -103,6 +105,6 @@ class Milestone(Base):
     created_at = Column(DateTime, default=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    feature = relationship("Feature", back_populates="milestones")
+    feature = relationship("Feature", back_populates="milestones", lazy=LAZY_LOAD)
 
     __table_args__ = (Index("idx_milestones_feature_id", "feature_id"),)
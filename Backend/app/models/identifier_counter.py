@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String
+from app.core.database import Base
+
+
+class IdentifierCounter(Base):
+    """Last number handed out in one identifier sequence.
+
+    ``scope`` is the identifier prefix the numbers follow: the team
+    identifier for issues (``ENG-7``) and features (``ENG-F3``), the parent
+    issue's identifier for sub-issues (``ENG-7-S2``). Identifiers are unique
+    across organizations and teams can be renamed, so the prefix, not the
+    team, is what a sequence must be unique within.
+    """
+
+    __tablename__ = "identifier_counters"
+
+    kind = Column(String(16), primary_key=True)
+    scope = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
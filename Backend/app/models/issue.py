@@ -16,7 +16,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship, foreign
 from datetime import datetime
 from app.core.time import utc_now
-from app.core.database import Base
+from app.core.database import Base, LAZY_LOAD
 from app.models.enums import (
     IssueStatus,
     IssuePriority,
@@ -68,29 +68,30 @@ class Issue(Base):
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    team = relationship("Team", back_populates="issues")
-    feature = relationship("Feature", back_populates="issues")
-    milestone = relationship("Milestone")
+    team = relationship("Team", back_populates="issues", lazy=LAZY_LOAD)
+    feature = relationship("Feature", back_populates="issues", lazy=LAZY_LOAD)
+    milestone = relationship("Milestone", lazy=LAZY_LOAD)
     assignee = relationship(
-        "User", back_populates="assigned_issues", foreign_keys=[assignee_id]
+        "User", back_populates="assigned_issues", foreign_keys=[assignee_id], lazy=LAZY_LOAD
     )
     comments = relationship(
-        "Comment", back_populates="issue", cascade="all, delete-orphan"
+        "Comment", back_populates="issue", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     activities = relationship(
-        "Activity", back_populates="issue", cascade="all, delete-orphan"
+        "Activity", back_populates="issue", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     resources = relationship(
         "Resource",
         primaryjoin="and_(Issue.id==Resource.target_id, Resource.target_type=='issue')",
         foreign_keys="[Resource.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
 
     sub_issues = relationship(
-        "Issue", cascade="all, delete-orphan", back_populates="parent"
+        "Issue", cascade="all, delete-orphan", back_populates="parent", lazy=LAZY_LOAD
     )
-    parent = relationship("Issue", remote_side=[id], back_populates="sub_issues")
+    parent = relationship("Issue", remote_side=[id], back_populates="sub_issues", lazy=LAZY_LOAD)
 
     __table_args__ = (
         Index("idx_issues_team_id", "team_id"),
@@ -98,4 +99,9 @@ class Issue(Base):
         Index("idx_issues_status", "status"),
         Index("idx_issues_assignee_id", "assignee_id"),
         Index("idx_issues_identifier", "identifier"),
+        # Keyset pagination: (filter column,) created_at, id
+        Index("idx_issues_created_at_id", "created_at", "id"),
+        Index("idx_issues_team_created_at_id", "team_id", "created_at", "id"),
+        Index("idx_issues_assignee_created_at_id", "assignee_id", "created_at", "id"),
+        Index("idx_issues_triage_created_at_id", "triage_status", "created_at", "id"),
     )
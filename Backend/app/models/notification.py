@@ -49,4 +49,5 @@ class Notification(Base):
     __table_args__ = (
         Index("idx_notifications_recipient_id", "recipient_id"),
         Index("idx_notifications_is_read", "is_read"),
+        Index("idx_notifications_recipient_created_at_id", "recipient_id", "created_at", "id"),
     )
@@ -16,7 +16,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship, backref, foreign
 from datetime import datetime
 from app.core.time import utc_now
-from app.core.database import Base
+from app.core.database import Base, LAZY_LOAD
 from app.models.enums import (
     ProjectStatus,
     ProjectHealth,
@@ -81,23 +81,20 @@ class Project(Base):
     deleted_at = Column(DateTime, nullable=True)
 
     team = relationship(
-        "Team", back_populates="primary_projects", foreign_keys=[team_id]
-    )
-    lead = relationship("User", back_populates="led_projects", foreign_keys=[lead_id])
-    members = relationship(
-        "User", secondary=project_members, back_populates="project_memberships"
-    )
-    teams = relationship(
-        "Team", secondary=project_teams, back_populates="contributing_projects"
+        "Team", back_populates="primary_projects", foreign_keys=[team_id], lazy=LAZY_LOAD
     )
+    lead = relationship("User", back_populates="led_projects", foreign_keys=[lead_id], lazy=LAZY_LOAD)
+    # Replaced by crud.project on update, so never raise (LAZY_LOAD)
+    members = relationship("User", secondary=project_members, back_populates="project_memberships")
+    teams = relationship("Team", secondary=project_teams, back_populates="contributing_projects")
     features = relationship(
-        "Feature", back_populates="project", cascade="all, delete-orphan"
+        "Feature", back_populates="project", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     updates = relationship(
-        "ProjectUpdate", back_populates="project", cascade="all, delete-orphan"
+        "ProjectUpdate", back_populates="project", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     documents = relationship(
-        "Document", back_populates="project", cascade="all, delete-orphan"
+        "Document", back_populates="project", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     resources = relationship(
         "Resource",
@@ -106,6 +103,7 @@ class Project(Base):
         primaryjoin="and_(Project.id==Resource.target_id, Resource.target_type=='project')",
         foreign_keys="[Resource.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
 
     __table_args__ = (
@@ -113,6 +111,7 @@ class Project(Base):
         Index("idx_projects_status", "status"),
         Index("idx_projects_health", "health"),
         Index("idx_projects_created_at", "created_at"),
+        Index("idx_projects_created_at_id", "created_at", "id"),
     )
 
 
@@ -133,10 +132,10 @@ class ProjectUpdate(Base):
     created_at = Column(DateTime, default=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    project = relationship("Project", back_populates="updates")
-    author = relationship("User", back_populates="project_updates")
+    project = relationship("Project", back_populates="updates", lazy=LAZY_LOAD)
+    author = relationship("User", back_populates="project_updates", lazy=LAZY_LOAD)
     comments = relationship(
-        "ProjectUpdateComment", back_populates="update", cascade="all, delete-orphan"
+        "ProjectUpdateComment", back_populates="update", cascade="all, delete-orphan", lazy=LAZY_LOAD
     )
     reactions = relationship(
         "Reaction",
@@ -144,6 +143,7 @@ class ProjectUpdate(Base):
         primaryjoin="and_(ProjectUpdate.id==Reaction.target_id, Reaction.target_type=='project_update')",
         foreign_keys="[Reaction.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
 
     __table_args__ = (
@@ -173,12 +173,13 @@ class ProjectUpdateComment(Base):
     created_at = Column(DateTime, default=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    update = relationship("ProjectUpdate", back_populates="comments")
-    author = relationship("User")
+    update = relationship("ProjectUpdate", back_populates="comments", lazy=LAZY_LOAD)
+    author = relationship("User", lazy=LAZY_LOAD)
     replies = relationship(
         "ProjectUpdateComment",
         backref=backref("parent", remote_side="ProjectUpdateComment.id"),
         cascade="all, delete-orphan",
+        lazy=LAZY_LOAD,
     )
     reactions = relationship(
         "Reaction",
@@ -186,6 +187,7 @@ class ProjectUpdateComment(Base):
         primaryjoin="and_(ProjectUpdateComment.id==Reaction.target_id, Reaction.target_type=='project_update_comment')",
         foreign_keys="[Reaction.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
 
     __table_args__ = (Index("idx_project_update_comments_update_id", "update_id"),)
@@ -209,12 +211,14 @@ class Resource(Base):
         primaryjoin="and_(Resource.target_id==Project.id, Resource.target_type=='project')",
         foreign_keys="[Resource.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
     issue = relationship(
         "Issue",
         primaryjoin="and_(Resource.target_id==Issue.id, Resource.target_type=='issue')",
         foreign_keys="[Resource.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
 
     __table_args__ = (Index("idx_resources_target", "target_type", "target_id"),)
@@ -233,18 +237,20 @@ class Reaction(Base):
     created_at = Column(DateTime, default=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    user = relationship("User")
+    user = relationship("User", lazy=LAZY_LOAD)
     update = relationship(
         "ProjectUpdate",
         primaryjoin="and_(Reaction.target_id==ProjectUpdate.id, Reaction.target_type=='project_update')",
         foreign_keys="[Reaction.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
     comment = relationship(
         "ProjectUpdateComment",
         primaryjoin="and_(Reaction.target_id==ProjectUpdateComment.id, Reaction.target_type=='project_update_comment')",
         foreign_keys="[Reaction.target_id]",
         viewonly=True,
+        lazy=LAZY_LOAD,
     )
 
     __table_args__ = (
@@ -8,13 +8,17 @@ from sqlalchemy import (
     Enum as SQLEnum,
     Text,
     Index,
+    Integer,
+    UniqueConstraint,
     UUID,
+    event,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.time import utc_now
 from app.core.database import Base
-from app.models.enums import IdeaStatus, AssetType, AssetStatus
+from app.core.compression import compressed_synonym
+from app.models.enums import IdeaStatus, AssetType, AssetStatus, MirrorStatus
 
 
 class ProjectIdea(Base):
@@ -88,19 +92,92 @@ class ProjectAsset(Base):
     )
 
     asset_type = Column(SQLEnum(AssetType), nullable=False)
-    content = Column(Text, nullable=True)
+    # Large payloads are stored compressed; `content` reads and writes plain text
+    _content = Column("content", Text, nullable=True)
+    content = compressed_synonym("_content")
     r2_path = Column(String, nullable=True)
     status = Column(SQLEnum(AssetStatus), default=AssetStatus.PENDING, nullable=False)
 
     chat_history = Column(JSON, nullable=True)
 
     analysis_result = Column(JSON, nullable=True)
-    enhanced_content = Column(Text, nullable=True)
+    _enhanced_content = Column("enhanced_content", Text, nullable=True)
+    enhanced_content = compressed_synonym("_enhanced_content")
+
+    # Google Doc mirror state, driven by app.tasks.mirror_assets_to_drive
+    mirror_status = Column(SQLEnum(MirrorStatus), nullable=True)
+    mirror_attempts = Column(Integer, nullable=False, default=0)
+    mirror_error = Column(String, nullable=True)
+    mirror_next_attempt_at = Column(DateTime, nullable=True)
+    mirrored_at = Column(DateTime, nullable=True)
+    # Pending single-section edit ({"title", "level", "body"}) the mirror can apply
+    # as a range edit instead of re-uploading the whole doc; None means full sync
+    mirror_patch = Column(JSON, nullable=True)
+    # SHA-256 of the uploaded file the current content was converted from;
+    # cleared whenever the content is changed any other way
+    source_hash = Column(String(64), nullable=True)
 
     created_at = Column(DateTime, default=utc_now)
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
     project_idea = relationship("ProjectIdea", back_populates="assets")
+    revisions = relationship(
+        "AssetRevision",
+        back_populates="asset",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="dynamic",
+    )
+
+    __table_args__ = (
+        Index("idx_project_assets_project_idea_id", "project_idea_id"),
+        Index("idx_project_assets_mirror_status", "mirror_status"),
+    )
+
+
+@event.listens_for(ProjectAsset._content, "set")
+def _content_changed(asset, value, oldvalue, initiator):
+    # Any write of the content invalidates the upload it came from; the upload
+    # path sets source_hash again after assigning the content
+    asset.source_hash = None
+
+
+class AssetRevision(Base):
+    """One saved version of a ProjectAsset's content.
+
+    ``kind`` is either "snapshot" (``payload`` holds the full text) or "delta"
+    (``payload`` holds line-level edit ops against the previous revision).
+    Added/removed line counts are kept on the row so "what changed" listings
+    never need to rebuild content.
+    """
+
+    __tablename__ = "asset_revisions"
 
-    __table_args__ = (Index("idx_project_assets_project_idea_id", "project_idea_id"),)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    asset_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("project_assets.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    revision = Column(Integer, nullable=False)
+    kind = Column(String(16), nullable=False)
+    _payload = Column("payload", Text, nullable=False)
+    payload = compressed_synonym("_payload")
+    content_hash = Column(String(64), nullable=False)
+    content_length = Column(Integer, nullable=False, default=0)
+    lines_added = Column(Integer, nullable=False, default=0)
+    lines_removed = Column(Integer, nullable=False, default=0)
+    source = Column(String(32), nullable=True)
+    author_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+
+    created_at = Column(DateTime, default=utc_now)
+
+    asset = relationship("ProjectAsset", back_populates="revisions")
+
+    __table_args__ = (
+        UniqueConstraint("asset_id", "revision", name="uq_asset_revisions_asset_revision"),
+        Index("idx_asset_revisions_asset_kind", "asset_id", "kind", "revision"),
+    )
@@ -0,0 +1,71 @@
+from sqlalchemy import Column, DDL, Integer, String, Text, Index, UUID, event
+from app.core.database import Base
+
+# Entity types kept in the search index
+SEARCH_ENTITY_TYPES = ("issue", "feature", "project")
+
+
+class SearchDocument(Base):
+    """Denormalised, org-scoped text of one searchable entity.
+
+    Kept in step with the entities by ``app.services.search_service``. The
+    full-text index lives beside it and depends on the backend: a weighted
+    ``search_vector`` column with GIN and trigram indexes on Postgres, the
+    ``search_documents_fts`` FTS5 table on SQLite.
+    """
+
+    __tablename__ = "search_documents"
+
+    # Integer key: FTS5 addresses rows by rowid, which must survive VACUUM
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(16), nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    organization_id = Column(UUID(as_uuid=True), nullable=True)
+    identifier = Column(String, nullable=True)
+    title = Column(String, nullable=False)
+    body = Column(Text, nullable=False, default="")
+
+    __table_args__ = (
+        Index("idx_search_documents_entity", "entity_type", "entity_id", unique=True),
+        Index("idx_search_documents_org_type", "organization_id", "entity_type"),
+    )
+
+
+# Full-text structures for databases built with create_all; the migration
+# creates the same ones for databases managed by Alembic
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE search_documents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(identifier, '')), 'A') || "
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', body), 'B')) STORED",
+    "CREATE INDEX idx_search_documents_vector ON search_documents USING gin (search_vector)",
+    "CREATE INDEX idx_search_documents_title_trgm ON search_documents USING gin (title gin_trgm_ops)",
+    "CREATE INDEX idx_search_documents_identifier_trgm ON search_documents USING gin (identifier gin_trgm_ops)",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE search_documents_fts USING fts5("
+    "identifier, title, body, content='search_documents', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, identifier, title, body) "
+    "VALUES (new.id, new.identifier, new.title, new.body); END",
+    "CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, identifier, title, body) "
+    "VALUES ('delete', old.id, old.identifier, old.title, old.body); END",
+    "CREATE TRIGGER search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, identifier, title, body) "
+    "VALUES ('delete', old.id, old.identifier, old.title, old.body); "
+    "INSERT INTO search_documents_fts(rowid, identifier, title, body) "
+    "VALUES (new.id, new.identifier, new.title, new.body); END",
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    SearchDocument.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS search_documents_fts").execute_if(dialect="sqlite"),
+)
@@ -12,7 +12,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.time import utc_now
-from app.core.database import Base
+from app.core.database import Base, LAZY_LOAD
 
 
 team_members = Table(
@@ -59,13 +59,14 @@ class Team(Base):
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
     deleted_at = Column(DateTime, nullable=True)
 
-    organization = relationship("Organization", back_populates="teams")
+    organization = relationship("Organization", back_populates="teams", lazy=LAZY_LOAD)
+    # Written to by the team and organization services, so never raise (LAZY_LOAD)
     leaders = relationship("User", secondary=team_leaders, back_populates="led_teams")
     members = relationship("User", secondary=team_members, back_populates="teams")
-    issues = relationship("Issue", back_populates="team")
-    primary_projects = relationship("Project", back_populates="team")
+    issues = relationship("Issue", back_populates="team", lazy=LAZY_LOAD)
+    primary_projects = relationship("Project", back_populates="team", lazy=LAZY_LOAD)
     contributing_projects = relationship(
-        "Project", secondary="project_teams", back_populates="teams"
+        "Project", secondary="project_teams", back_populates="teams", lazy=LAZY_LOAD
     )
 
     __table_args__ = (
@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from uuid import UUID
-from app.models.project_idea import IdeaStatus, AssetType, AssetStatus
+from app.models.project_idea import IdeaStatus, AssetType, AssetStatus, MirrorStatus
 
 
 class IdeaSubmit(BaseModel):
@@ -117,6 +117,7 @@ class DocResponse(BaseModel):
     status: AssetStatus
     r2_path: Optional[str]
     chat_history: Optional[List[Dict[str, str]]] = None
+    mirror_status: Optional[MirrorStatus] = None
 
     model_config = {"from_attributes": True}
 
@@ -168,3 +169,29 @@ class RegenerateFieldRequest(BaseModel):
 class RegenerateSectionRequest(BaseModel):
     section_content: str
     user_message: str
+
+
+class AssetRevisionMeta(BaseModel):
+    revision: int
+    kind: str
+    source: Optional[str] = None
+    author_id: Optional[UUID] = None
+    content_hash: str
+    content_length: int
+    lines_added: int
+    lines_removed: int
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class AssetRevisionResponse(AssetRevisionMeta):
+    content: str
+
+
+class AssetRevisionDiff(BaseModel):
+    from_revision: int
+    to_revision: int
+    lines_added: int
+    lines_removed: int
+    diff: str
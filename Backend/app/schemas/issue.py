@@ -1,4 +1,4 @@
-from pydantic import BaseModel, UUID4, ConfigDict
+from pydantic import BaseModel, UUID4, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime, date
 from app.models.issue import (
@@ -23,7 +23,8 @@ class IssueResourceCreate(IssueResourceBase):
 
 class IssueResource(IssueResourceBase):
     id: UUID4
-    issue_id: UUID4
+    # Resources are polymorphic; the issue is their target
+    issue_id: UUID4 = Field(validation_alias="target_id")
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
@@ -85,4 +86,7 @@ class Issue(IssueBase):
 
 class IssueList(BaseModel):
     issues: List[Issue]
-    total: int
+    # None when the list was requested with include_total=false
+    total: Optional[int] = None
+    # Pass as ``cursor`` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
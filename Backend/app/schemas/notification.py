@@ -31,3 +31,4 @@ class Notification(NotificationBase):
 class NotificationList(BaseModel):
     notifications: List[Notification]
     unread_count: int
+    next_cursor: Optional[str] = None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, UUID4, ConfigDict
+from pydantic import BaseModel, UUID4, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime, date
 from app.models.project import (
@@ -111,6 +111,8 @@ class ProjectUpdateCommentReactionCreate(ProjectUpdateCommentReactionBase):
 
 class ProjectUpdateCommentReaction(ProjectUpdateCommentReactionBase):
     id: UUID4
+    # Reactions are polymorphic; the comment is their target
+    comment_id: UUID4 = Field(validation_alias="target_id")
     user_id: UUID4
     user: Optional[UserBase] = None
     created_at: datetime
@@ -139,6 +141,8 @@ class ProjectUpdateReactionCreate(ProjectUpdateReactionBase):
 
 class ProjectUpdateReaction(ProjectUpdateReactionBase):
     id: UUID4
+    # Reactions are polymorphic; the update is their target
+    update_id: UUID4 = Field(validation_alias="target_id")
     user_id: UUID4
     user: Optional[UserBase] = None
     created_at: datetime
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from uuid import UUID
+
+SearchEntityType = Literal["issue", "feature", "project"]
+
+
+class SearchResult(BaseModel):
+    type: SearchEntityType
+    id: UUID
+    identifier: Optional[str] = None
+    title: str
+    # Title and body excerpt with the matched words in <mark> tags
+    title_highlight: str
+    snippet: Optional[str] = None
+    score: float
+
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchResult]
@@ -5,6 +5,7 @@ from app.services.project_service import project_service
 from app.services.organization_service import organization_service
 from app.services.team_service import team_service
 from app.services.feature_service import feature_service
+from app.services.search_service import search_service
 
 __all__ = [
     "auth_service",
@@ -13,4 +14,5 @@ __all__ = [
     "organization_service",
     "team_service",
     "feature_service",
+    "search_service",
 ]
@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 from fastapi import HTTPException
 from app.core.config import settings
 import json
@@ -82,7 +82,8 @@ class AIService:
         api_key = settings.OPENROUTER_API_KEY
         if api_key:
             api_key = api_key.strip().strip('"').strip("'")
-            self.client = OpenAI(
+            # Async client: completions are awaited, not run on the event loop thread
+            self.client = AsyncOpenAI(
                 base_url="https://openrouter.ai/api/v1",
                 api_key=api_key,
             )
@@ -177,9 +178,9 @@ class AIService:
         """Prepend the guardrail to user-facing prompts to prevent prompt injection."""
         return GUARDRAIL + user_content
 
-    def _call_ai(self, prompt: str, **kwargs) -> Any:
+    async def _call_ai(self, prompt: str, **kwargs) -> Any:
         """Call the AI model with the prompt."""
-        return self.client.chat.completions.create(
+        return await self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": self._build_prompt(prompt)}],
             **kwargs,
@@ -210,7 +211,7 @@ class AIService:
         Return a JSON object with a "questions" key containing a list of strings, e.g., {{"questions": ["Question 1?", "Question 2?"]}}.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=2000,
@@ -259,7 +260,7 @@ class AIService:
         Provide a clear, actionable suggestion. Return ONLY the suggested answer text.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 max_tokens=3000,
             )
@@ -468,7 +469,7 @@ class AIService:
         """
         try:
             logger.info(f"Calling AI model: {self.model}")
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=8192,
@@ -640,7 +641,7 @@ class AIService:
         {field_instruction}
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=3000,
@@ -689,7 +690,7 @@ class AIService:
         }}
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=8192,
@@ -744,7 +745,7 @@ class AIService:
         }}
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=8192,
@@ -794,7 +795,7 @@ class AIService:
         Otherwise, return the ID in a JSON object: {{"node_id": "the_matching_id"}}.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=500,
@@ -832,7 +833,7 @@ class AIService:
         Return a JSON object with a "features" key containing the list.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=4000,
@@ -899,7 +900,7 @@ class AIService:
         }}
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=3000,
@@ -1046,7 +1047,7 @@ class AIService:
         Return the COMPLETE Markdown content for the document with proper formatting.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 max_tokens=8000,
             )
@@ -1083,7 +1084,7 @@ class AIService:
         Return the complete updated Markdown content for the entire document with the regenerated section.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 max_tokens=8000,
             )
@@ -1092,6 +1093,47 @@ class AIService:
             logger.error(f"Doc section regeneration failed: {str(e)}")
             return current_content
 
+    async def regenerate_section_text(
+        self,
+        doc_type: str,
+        doc_outline: str,
+        section_text: str,
+        user_message: str,
+        project_context: Dict[str, Any],
+    ) -> str:
+        """Regenerate one section given only that section and the document outline.
+
+        Returns the new Markdown for the section alone, starting with its heading,
+        so the prompt and response scale with the section rather than the document.
+        """
+        heading = section_text.splitlines()[0] if section_text else ""
+        prompt = f"""
+        You are editing one section of a {doc_type} document.
+
+        Document Outline:
+        {doc_outline}
+
+        Section to Regenerate:
+        {section_text}
+
+        Project Context:
+        {json.dumps(project_context, indent=2)}
+
+        User Request: {user_message}
+
+        Return ONLY the updated Markdown for this section. Start with the unchanged
+        heading line "{heading}" and do not include any other section.
+        """
+        try:
+            response = await self._call_ai(
+                prompt,
+                max_tokens=4000,
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            logger.error(f"Doc section regeneration failed: {str(e)}")
+            return section_text
+
     async def chat_about_doc(
         self,
         doc_type: str,
@@ -1126,7 +1168,7 @@ class AIService:
         Return the COMPLETE UPDATED Markdown content for the document, incorporating the user's changes.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 max_tokens=8000,
             )
@@ -1171,7 +1213,7 @@ class AIService:
         Be precise with the 'find' text. It must match exactly.
         """
         try:
-            response = self._call_ai(
+            response = await self._call_ai(
                 prompt,
                 response_format={"type": "json_object"},
                 max_tokens=4000,
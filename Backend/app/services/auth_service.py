@@ -41,7 +41,6 @@ class AuthService:
         )
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def login_user(
@@ -0,0 +1,356 @@
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Dict, Optional, Set, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A conversion input is either the raw bytes or the path of a spooled temp file
+Source = Union[bytes, str]
+
+
+class ConversionError(Exception):
+    """The document could not be converted."""
+
+
+class ConversionTooLarge(ConversionError):
+    pass
+
+
+class ConversionTimeout(ConversionError):
+    pass
+
+
+# -- worker functions --------------------------------------------------------
+# These run inside the pool's processes, so they must be module-level and take
+# and return only picklable values. Heavy libraries are imported lazily.
+
+
+def _open_source(source: Source):
+    return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+
+def _docx_to_markdown(source: Source) -> str:
+    import mammoth
+    with _open_source(source) as f:
+        return mammoth.convert_to_markdown(f).value
+
+
+def _docx_to_html_and_markdown(source: Source) -> Tuple[str, str]:
+    import mammoth
+    from markdownify import markdownify
+    with _open_source(source) as f:
+        html = mammoth.convert_to_html(f).value
+    return html, markdownify(html)
+
+
+def _html_to_markdown(html: Union[str, bytes]) -> str:
+    from markdownify import markdownify
+    if isinstance(html, bytes):
+        html = html.decode("utf-8")
+    return markdownify(html)
+
+
+def _markdown_to_html(text: str) -> str:
+    import markdown
+    return markdown.markdown(text)
+
+
+def _markdown_to_docx(text: str, title: str) -> bytes:
+    import markdown
+    from html2docx import html2docx
+    html = f"<html><body>{markdown.markdown(text)}</body></html>"
+    return html2docx(html, title=title).getvalue()
+
+
+def _warm_up():
+    import mammoth  # noqa: F401
+    import markdown  # noqa: F401
+    import markdownify  # noqa: F401
+    import html2docx  # noqa: F401
+
+
+# -- spooled input -----------------------------------------------------------
+
+
+class SpooledUpload:
+    """Upload body buffered in memory up to a threshold, then in a named temp file.
+
+    Unlike ``b"".join(chunks)``, a large upload is never held in memory, and a
+    spilled upload is handed to the conversion workers by path rather than
+    pickled across the process boundary. The body is hashed as it is written,
+    so callers can recognise a repeated upload without reading it again.
+    """
+
+    def __init__(self, memory_limit: int):
+        self.memory_limit = memory_limit
+        self.size = 0
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file = None
+        self._digest = hashlib.sha256()
+
+    @property
+    def on_disk(self) -> bool:
+        return self._file is not None
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of everything written so far."""
+        return self._digest.hexdigest()
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._digest.update(chunk)
+        if self._file is None and self.size > self.memory_limit:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload-", delete=False)
+            self._file.write(self._buffer.getvalue())
+            self._buffer = None
+        (self._file or self._buffer).write(chunk)
+
+    def source(self) -> Source:
+        """The value to pass to a conversion: the bytes, or the temp file's path."""
+        if self._file is not None:
+            self._file.flush()
+            return self._file.name
+        return self._buffer.getvalue()
+
+    def read_bytes(self) -> bytes:
+        if self._file is not None:
+            self._file.flush()
+            with open(self._file.name, "rb") as f:
+                return f.read()
+        return self._buffer.getvalue()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except FileNotFoundError:
+                pass
+            self._file = None
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -- service -----------------------------------------------------------------
+
+
+class ConversionService:
+    """Runs CPU-bound document conversions (docx, Markdown, HTML) off the event loop.
+
+    Conversions run on a process pool so a large document neither blocks the
+    event loop nor holds the GIL other request threads need. Inputs are size
+    checked before any work is queued and every conversion is bounded by a
+    timeout. Killing one worker breaks every job in its pool, so on a timeout
+    new work moves to a fresh pool and the old one is killed once its other
+    jobs have finished.
+    Text inputs below ``CONVERSION_INLINE_MAX_BYTES`` are converted in-process
+    (on the threadpool), where the work is cheaper than the round trip to a
+    worker. A .docx is always pooled: its size is that of the compressed zip,
+    which says little about how much work converting it takes.
+    """
+
+    def __init__(self):
+        self.workers = settings.CONVERSION_WORKERS
+        self.timeout = settings.CONVERSION_TIMEOUT_SECONDS
+        self.max_input_bytes = settings.CONVERSION_MAX_INPUT_BYTES
+        self.inline_max_bytes = settings.CONVERSION_INLINE_MAX_BYTES
+        self.spool_memory_bytes = settings.CONVERSION_SPOOL_MEMORY_BYTES
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Unfinished jobs per pool, including retired pools still draining
+        self._inflight: Dict[ProcessPoolExecutor, Set[Future]] = {}
+        self._retiring: Set[ProcessPoolExecutor] = set()
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    # -- pool management ------------------------------------------------------
+
+    def _submit(self, fn: Callable, *args) -> Tuple[ProcessPoolExecutor, Future]:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the parent runs the scheduler and several
+                # thread pools, and forking a threaded process is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_up,
+                )
+            pool = self._pool
+            future = pool.submit(fn, *args)
+            self._inflight.setdefault(pool, set()).add(future)
+        future.add_done_callback(partial(self._finished, pool))
+        return pool, future
+
+    def _finished(self, pool: ProcessPoolExecutor, future: Future) -> None:
+        with self._pool_lock:
+            self._inflight.get(pool, set()).discard(future)
+
+    @staticmethod
+    def _kill(pool: ProcessPoolExecutor) -> None:
+        # The executor has no public way to stop a running task
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _retire_pool(self, pool: ProcessPoolExecutor, stuck: Future) -> None:
+        """Send new work to a fresh pool; kill ``pool`` once its other jobs finish.
+
+        Those jobs are each bounded by their own timeout, so the wait is too.
+        """
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+            if pool in self._retiring:
+                return
+            self._retiring.add(pool)
+
+        def drain_and_kill():
+            with self._pool_lock:
+                others = [f for f in self._inflight.get(pool, ()) if f is not stuck]
+            wait(others, timeout=self.timeout)
+            with self._pool_lock:
+                self._inflight.pop(pool, None)
+                self._retiring.discard(pool)
+            self._kill(pool)
+
+        threading.Thread(target=drain_and_kill, name="conversion-pool-retire", daemon=True).start()
+
+    def _reset_pool(self, pool: Optional[ProcessPoolExecutor] = None) -> None:
+        """Drop ``pool`` (default: the current one) so the next job starts a new one."""
+        with self._pool_lock:
+            pool = pool or self._pool
+            if pool is None:
+                return
+            if self._pool is pool:
+                self._pool = None
+            self._inflight.pop(pool, None)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+    # -- execution ------------------------------------------------------------
+
+    def _record(self, operation: str, size: int, elapsed: float, where: str, error: bool = False):
+        with self._metrics_lock:
+            m = self._metrics.setdefault(operation, {
+                "count": 0, "inline": 0, "pooled": 0, "errors": 0,
+                "bytes_in": 0, "total_ms": 0.0, "max_ms": 0.0,
+            })
+            m["count"] += 1
+            m[where] += 1
+            m["errors"] += int(error)
+            m["bytes_in"] += size
+            m["total_ms"] += elapsed * 1000
+            m["max_ms"] = max(m["max_ms"], elapsed * 1000)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        with self._metrics_lock:
+            return {
+                op: {**m, "avg_ms": round(m["total_ms"] / m["count"], 2) if m["count"] else 0.0}
+                for op, m in self._metrics.items()
+            }
+
+    def _check_size(self, size: int) -> None:
+        if size > self.max_input_bytes:
+            raise ConversionTooLarge(
+                f"Document is too large to convert ({size} bytes, limit {self.max_input_bytes})"
+            )
+
+    async def _convert(self, operation: str, fn: Callable, size: int, *args, inline: bool = True):
+        self._check_size(size)
+        start = time.perf_counter()
+        inline = self.workers <= 0 or (inline and size <= self.inline_max_bytes)
+        where = "inline" if inline else "pooled"
+        try:
+            if inline:
+                result = await run_in_threadpool(fn, *args)
+            else:
+                pool, future = self._submit(fn, *args)
+                try:
+                    result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    self._retire_pool(pool, future)
+                    raise ConversionTimeout(f"Conversion '{operation}' timed out after {self.timeout}s")
+                except BrokenProcessPool:
+                    self._reset_pool(pool)
+                    raise ConversionError(f"Conversion worker crashed during '{operation}'")
+        except ConversionError:
+            self._record(operation, size, time.perf_counter() - start, where, error=True)
+            raise
+        except Exception as e:
+            self._record(operation, size, time.perf_counter() - start, where, error=True)
+            raise ConversionError(f"Could not convert document: {e}") from e
+        self._record(operation, size, time.perf_counter() - start, where)
+        return result
+
+    @staticmethod
+    def _size(source: Source) -> int:
+        return os.path.getsize(source) if isinstance(source, str) else len(source)
+
+    # -- public API -----------------------------------------------------------
+
+    async def spool(self, file, max_bytes: Optional[int] = None, chunk_size: int = 64 * 1024) -> SpooledUpload:
+        """Stream an ``UploadFile`` into a :class:`SpooledUpload`, rejecting it as
+        soon as it exceeds ``max_bytes``. The caller closes the result."""
+        max_bytes = max_bytes or self.max_input_bytes
+        # The multipart parser records the part size; refuse without copying it
+        size = getattr(file, "size", None)
+        if size is not None and size > max_bytes:
+            raise ConversionTooLarge(f"Upload exceeds {max_bytes} bytes")
+        spooled = SpooledUpload(self.spool_memory_bytes)
+        try:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                spooled.write(chunk)
+                if spooled.size > max_bytes:
+                    raise ConversionTooLarge(f"Upload exceeds {max_bytes} bytes")
+        except BaseException:
+            spooled.close()
+            raise
+        return spooled
+
+    async def docx_to_markdown(self, source: Source) -> str:
+        return await self._convert(
+            "docx_to_markdown", _docx_to_markdown, self._size(source), source, inline=False
+        )
+
+    async def docx_to_html_and_markdown(self, source: Source) -> Tuple[str, str]:
+        return await self._convert(
+            "docx_to_html_and_markdown", _docx_to_html_and_markdown, self._size(source), source,
+            inline=False,
+        )
+
+    async def html_to_markdown(self, html: Union[str, bytes]) -> str:
+        return await self._convert("html_to_markdown", _html_to_markdown, len(html), html)
+
+    async def markdown_to_html(self, text: str) -> str:
+        return await self._convert("markdown_to_html", _markdown_to_html, len(text), text)
+
+    async def markdown_to_docx(self, text: str, title: str) -> bytes:
+        return await self._convert("markdown_to_docx", _markdown_to_docx, len(text), text, title)
+
+
+conversion_service = ConversionService()
@@ -1,6 +1,9 @@
 import json
+import re
+import time
+from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.core.config import settings
 import logging
 
@@ -91,13 +94,116 @@ DOC_REQUIREMENTS = {
 }
 
 
+_ATX_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+_SETEXT_UNDERLINE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+# Whole-line bold text, which is how .docx headings often come through mammoth
+_BOLD_LINE = re.compile(r"^\s*(\*\*|__)(.+?)\1\s*:?\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_WORD = re.compile(r"[A-Za-z0-9][\w'-]*")
+_STOPWORDS = {"and", "or", "the", "a", "an", "of", "for", "to", "in", "on", "with"}
+
+# A heading matches a required section alternative at this similarity
+SECTION_MATCH_THRESHOLD = 0.6
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("&", " and ")
+    text = re.sub(r"[*_`\[\]()]", "", text)
+    # Drop numbering such as "1.", "2.3)" or "Phase 1:" prefixes
+    text = re.sub(r"^\s*(\d+[.)]?\s*)+", "", text)
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def _tokens(text: str) -> set:
+    return {w.rstrip("s") for w in text.split() if w not in _STOPWORDS}
+
+
+def parse_headings(content: str) -> List[str]:
+    """Return the document's headings in order (ATX, setext and bold-only lines)."""
+    headings = []
+    lines = content.splitlines()
+    in_fence = False
+    for i, line in enumerate(lines):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence or not line.strip():
+            continue
+        match = _ATX_HEADING.match(line)
+        if match:
+            headings.append(match.group(1).strip())
+            continue
+        nxt = lines[i + 1] if i + 1 < len(lines) else ""
+        if _SETEXT_UNDERLINE.match(nxt) and not line.lstrip().startswith(("-", "*", "|")):
+            headings.append(line.strip())
+            continue
+        match = _BOLD_LINE.match(line)
+        if match and len(match.group(2)) <= 80:
+            headings.append(match.group(2).strip())
+    return headings
+
+
+def _alternatives(section: str) -> List[tuple]:
+    """Normalized text and tokens of each "A / B" alternative of a required section."""
+    alternatives = []
+    for alternative in section.split("/"):
+        alt = _normalize(alternative)
+        if alt:
+            alternatives.append((alt, _tokens(alt)))
+    return alternatives
+
+
+def _section_similarity(heading: str, heading_tokens: set, alternatives: List[tuple]) -> float:
+    """Best similarity between a normalized heading and any alternative of a section."""
+    best = 0.0
+    for alt, alt_tokens in alternatives:
+        if alt_tokens:
+            best = max(best, len(alt_tokens & heading_tokens) / len(alt_tokens))
+        if best >= 1.0:
+            break
+        matcher = SequenceMatcher(None, heading, alt)
+        # Cheap upper bounds first; the full ratio is only computed when it could win
+        if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+            best = max(best, matcher.ratio())
+    return best
+
+
+def match_sections(headings: List[str], required_sections: List[str]) -> Dict[str, Optional[str]]:
+    """Map each required section to the heading that covers it, or None."""
+    normalized = [(h, n, _tokens(n)) for h in headings for n in [_normalize(h)] if n]
+    matches: Dict[str, Optional[str]] = {}
+    for section in required_sections:
+        alternatives = _alternatives(section)
+        best_heading, best_score = None, 0.0
+        for heading, norm, tokens in normalized:
+            score = _section_similarity(norm, tokens, alternatives)
+            if score > best_score:
+                best_heading, best_score = heading, score
+                if score >= 1.0:
+                    break
+        matches[section] = best_heading if best_score >= SECTION_MATCH_THRESHOLD else None
+    return matches
+
+
+def count_words(content: str) -> int:
+    return len(_WORD.findall(content))
+
+
+def _severity(score: int) -> str:
+    if score < 30:
+        return "critical"
+    if score < 60:
+        return "warning"
+    return "info"
+
+
 class DocAnalyzerService:
     def __init__(self):
         api_key = settings.OPENROUTER_API_KEY
         if api_key:
             # Clean key of common whitespace/quote issues from .env
             api_key = api_key.strip().strip('"').strip("'")
-            self.client = OpenAI(
+            self.client = AsyncOpenAI(
                 api_key=api_key,
                 base_url="https://openrouter.ai/api/v1",
             )
@@ -107,31 +213,100 @@ class DocAnalyzerService:
         
         self.model = settings.MODEL_NAME
 
+    def structural_analysis(self, doc_type: str, content: str) -> Dict[str, Any]:
+        """
+        Check a document's length and required sections locally, without the LLM.
+        Returns the same shape as the LLM review plus the structural measurements.
+        """
+        start = time.perf_counter()
+        requirements = DOC_REQUIREMENTS.get(doc_type, DOC_REQUIREMENTS["PRD"])
+        required = requirements["required_sections"]
+        min_words = requirements["min_words"]
+
+        headings = parse_headings(content)
+        matches = match_sections(headings, required)
+        detected = [section for section, heading in matches.items() if heading]
+        missing = [section for section, heading in matches.items() if not heading]
+        word_count = count_words(content)
+        coverage = len(detected) / len(required) if required else 1.0
+        length_ratio = min(word_count / min_words, 1.0) if min_words else 1.0
+        score = round(100 * (0.6 * coverage + 0.4 * length_ratio))
+
+        issues = []
+        if word_count < min_words:
+            issues.append(f"Too short: {word_count} words, at least {min_words} recommended")
+        if not headings:
+            issues.append("No headings found; the document has no recognizable structure")
+        elif missing:
+            issues.append(f"Missing {len(missing)} of {len(required)} expected sections")
+
+        suggestions = [f"Add a '{section}' section" for section in missing[:4]]
+        if word_count < min_words:
+            suggestions.append("Expand the existing sections with concrete details")
+
+        passes_gates = (
+            word_count >= min_words
+            and coverage >= settings.DOC_ANALYSIS_MIN_SECTION_COVERAGE
+        )
+        is_valid = bool(detected) or word_count >= min_words
+        if passes_gates:
+            summary = f"Structure looks complete ({len(detected)}/{len(required)} sections, {word_count} words)"
+        else:
+            summary = f"Incomplete {requirements['name']}: {len(detected)}/{len(required)} sections, {word_count} words"
+
+        return {
+            "is_valid": is_valid,
+            "quality_score": score,
+            "detected_sections": detected,
+            "missing_sections": missing,
+            "issues": issues,
+            "suggestions": suggestions,
+            "ai_can_enhance": is_valid and bool(missing or word_count < min_words) and self.client is not None,
+            "enhancement_preview": (
+                f"Add the missing sections: {', '.join(missing)}" if missing else ""
+            ),
+            "summary": summary,
+            "severity": _severity(score),
+            "doc_type": doc_type,
+            "doc_name": requirements["name"],
+            "analysis_source": "structural",
+            "structure": {
+                "word_count": word_count,
+                "min_words": min_words,
+                "headings": len(headings),
+                "section_coverage": round(coverage, 2),
+                "matched_headings": {section: heading for section, heading in matches.items() if heading},
+                "passes_gates": passes_gates,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            },
+        }
+
     async def analyze_document(
         self,
         doc_type: str,
         content: str,
         project_context: Optional[Dict[str, Any]] = None,
+        deep_review: bool = False,
     ) -> Dict[str, Any]:
         """
         Analyze an uploaded document for quality and relevance.
+
+        Length and required sections are checked locally first. The LLM review
+        only runs for documents that pass those gates, or when ``deep_review``
+        is requested; otherwise the structural result is returned as is.
         """
+        structural = self.structural_analysis(doc_type, content)
+        if not structural["structure"]["passes_gates"] and not deep_review:
+            logger.info(
+                f"Document analysis for {doc_type}: structural score={structural['quality_score']} "
+                f"in {structural['structure']['elapsed_ms']}ms, LLM review skipped"
+            )
+            return structural
+
         if not self.client:
             logger.error("Attempted to analyze document but OpenAI client is not initialized.")
-            return {
-                "is_valid": True,
-                "quality_score": 50,
-                "detected_sections": [],
-                "missing_sections": [],
-                "issues": ["AI Analysis service is currently disabled (missing API key)"],
-                "suggestions": ["Configure OPENROUTER_API_KEY to enable AI analysis"],
-                "ai_can_enhance": False,
-                "enhancement_preview": "",
-                "summary": "AI Analysis Disabled",
-                "severity": "warning",
-                "doc_type": doc_type,
-                "doc_name": DOC_REQUIREMENTS.get(doc_type, DOC_REQUIREMENTS["PRD"])["name"],
-            }
+            structural["suggestions"].append("Configure OPENROUTER_API_KEY to enable AI review")
+            return structural
         requirements = DOC_REQUIREMENTS.get(doc_type, DOC_REQUIREMENTS["PRD"])
 
         prompt = f"""
@@ -147,6 +322,11 @@ class DocAnalyzerService:
         Expected Sections: {", ".join(requirements["required_sections"])}
         Minimum Recommended Length: {requirements["min_words"]} words
 
+        LOCAL STRUCTURE CHECK (already verified, do not recount):
+        Word count: {structural["structure"]["word_count"]}
+        Sections found: {", ".join(structural["detected_sections"]) or "none"}
+        Sections missing: {", ".join(structural["missing_sections"]) or "none"}
+
         PROJECT CONTEXT:
         {json.dumps(project_context, indent=2) if project_context else "Not provided"}
 
@@ -174,7 +354,7 @@ class DocAnalyzerService:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"},
@@ -185,13 +365,9 @@ class DocAnalyzerService:
 
             result["doc_type"] = doc_type
             result["doc_name"] = requirements["name"]
-
-            if result.get("quality_score", 0) < 30:
-                result["severity"] = "critical"
-            elif result.get("quality_score", 0) < 60:
-                result["severity"] = "warning"
-            else:
-                result["severity"] = "info"
+            result["severity"] = _severity(result.get("quality_score", 0))
+            result["analysis_source"] = "llm"
+            result["structure"] = structural["structure"]
 
             logger.info(
                 f"Document analysis for {doc_type}: score={result.get('quality_score')}, valid={result.get('is_valid')}"
@@ -201,20 +377,9 @@ class DocAnalyzerService:
 
         except Exception as e:
             logger.error(f"Document analysis failed: {str(e)}")
-            return {
-                "is_valid": True,
-                "quality_score": 50,
-                "detected_sections": [],
-                "missing_sections": [],
-                "issues": ["Could not analyze document - analysis service error"],
-                "suggestions": ["Try re-uploading the document"],
-                "ai_can_enhance": False,
-                "enhancement_preview": "",
-                "summary": "Analysis unavailable",
-                "severity": "warning",
-                "doc_type": doc_type,
-                "doc_name": requirements["name"],
-            }
+            # Fall back to the local result rather than an uninformative placeholder
+            structural["issues"].append("AI review unavailable - showing structural checks only")
+            return structural
 
     async def generate_enhanced_content(
         self,
@@ -258,7 +423,7 @@ class DocAnalyzerService:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=6000,
@@ -1,100 +1,212 @@
+import asyncio
 import logging
-import io
-import uuid
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable, Tuple
+import google_auth_httplib2
+import httplib2
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaInMemoryUpload
-from markdownify import markdownify as md
+from googleapiclient.http import MediaInMemoryUpload
+from app.core import markdown_sections
 from app.core.config import settings
+from app.services.conversion_service import conversion_service
 from app.services.storage_service import storage_service
 from app.services.service_account import get_service_account_credentials
-from app.models.document import Document
-from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_DOC_MIME_TYPE = 'application/vnd.google-apps.document'
+
+
 class DocumentService:
-    """Service to handle Google Drive and Docs interactions along with R2 sync."""
+    """Service to handle Google Drive and Docs interactions along with R2 sync.
+
+    Google's client is blocking, so every call runs on a dedicated thread pool
+    with its own timeout. googleapiclient service objects are not thread-safe;
+    each worker thread builds and keeps its own. Independent calls run side by
+    side, each bounded by the timeout on its own.
+    """
 
     def __init__(self):
         self.creds = get_service_account_credentials()
-        self.drive_service = build('drive', 'v3', credentials=self.creds) if self.creds else None
-        self.docs_service = build('docs', 'v1', credentials=self.creds) if self.creds else None
+        self.timeout = settings.GOOGLE_API_TIMEOUT_SECONDS
+        self.workers = settings.GOOGLE_API_WORKERS
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="google-api"
+        )
+        self._local = threading.local()
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.creds is not None
+
+    # -- execution plumbing -------------------------------------------------
+
+    def _http(self):
+        http = httplib2.Http(timeout=self.timeout)
+        return google_auth_httplib2.AuthorizedHttp(self.creds, http=http)
+
+    def _drive(self):
+        if getattr(self._local, "drive", None) is None:
+            self._local.drive = build('drive', 'v3', http=self._http(), cache_discovery=False)
+        return self._local.drive
+
+    def _docs(self):
+        if getattr(self._local, "docs", None) is None:
+            self._local.docs = build('docs', 'v1', http=self._http(), cache_discovery=False)
+        return self._local.docs
+
+    def _record(self, operation: str, elapsed: float, calls: int = 1, error: bool = False):
+        with self._metrics_lock:
+            m = self._metrics.setdefault(
+                operation, {"count": 0, "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            m["count"] += 1
+            m["calls"] += calls
+            m["errors"] += int(error)
+            m["total_ms"] += elapsed * 1000
+            m["max_ms"] = max(m["max_ms"], elapsed * 1000)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation counters: round trips, API calls carried, errors and latency."""
+        with self._metrics_lock:
+            return {
+                op: {**m, "avg_ms": round(m["total_ms"] / m["count"], 2) if m["count"] else 0.0}
+                for op, m in self._metrics.items()
+            }
+
+    async def _run(self, operation: str, fn: Callable[[], Any], calls: int = 1) -> Any:
+        """Run blocking ``fn`` on the Google executor, bounded by the API timeout."""
+        if not self.enabled:
+            raise Exception("Google Drive service not initialized (check service-account.json)")
+
+        def timed():
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception:
+                self._record(operation, time.perf_counter() - start, calls, error=True)
+                raise
+            self._record(operation, time.perf_counter() - start, calls)
+            return result
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._executor, timed), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            self._record(f"{operation}.timeout", self.timeout, calls, error=True)
+            raise TimeoutError(f"Google API call '{operation}' timed out after {self.timeout}s")
+
+    @staticmethod
+    def _permission_body(email: str, role: str) -> Dict[str, str]:
+        return {'type': 'user', 'role': role, 'emailAddress': email}
+
+    # -- public API ---------------------------------------------------------
 
     async def create_google_doc(self, title: str, content_md: str, user_email: Optional[str] = None) -> str:
         """Creates a Google Doc from Markdown content and optionally shares it.
-        
+
         Returns: drive_file_id
         """
-        if not self.drive_service:
-            raise Exception("Google Drive service not initialized (check service-account.json)")
+        drive_file_id, _ = await self._create(title, content_md, user_email, export=False)
+        return drive_file_id
+
+    async def create_google_doc_with_export(
+        self, title: str, content_md: str, user_email: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Creates (and optionally shares) a Google Doc and returns it exported back to Markdown.
+
+        The upload, then the share and the export side by side.
+        Returns: (drive_file_id, content_md as Google renders it)
+        """
+        return await self._create(title, content_md, user_email, export=True)
+
+    async def _create(
+        self, title: str, content_md: str, user_email: Optional[str], export: bool
+    ) -> Tuple[str, Optional[str]]:
+        # Convert Markdown to HTML for initial upload; Drive converts it to a Doc
+        html_content = await conversion_service.markdown_to_html(content_md)
+
+        def upload():
+            media = MediaInMemoryUpload(html_content.encode('utf-8'), mimetype='text/html')
+            file_metadata = {'name': title, 'mimeType': GOOGLE_DOC_MIME_TYPE}
+            file = self._drive().files().create(
+                body=file_metadata, media_body=media, fields='id'
+            ).execute()
+            return file.get('id')
+
+        drive_file_id = await self._run("files.create", upload)
 
-        # First create an empty Doc
-        file_metadata = {
-            'name': title,
-            'mimeType': 'application/vnd.google-apps.document'
-        }
-        
-        # Convert Markdown to HTML for initial upload
-        import markdown
-        html_content = markdown.markdown(content_md)
-        
-        media = MediaInMemoryUpload(html_content.encode('utf-8'), mimetype='text/html')
-        
-        file = self.drive_service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id'
-        ).execute()
-        
-        drive_file_id = file.get('id')
-        
-        # Share with user if email provided
+        followups = {}
         if user_email:
-            try:
-                self.share_document_with_user(drive_file_id, user_email)
-            except Exception as e:
-                logger.error(f"Failed to share document {drive_file_id} with {user_email}: {e}")
-        
-        return drive_file_id
+            followups["share"] = self.share_document_with_user(drive_file_id, user_email, 'writer')
+        if export:
+            followups["export"] = self.get_doc_content_as_markdown(drive_file_id)
+        if not followups:
+            return drive_file_id, None
+        results = dict(zip(followups, await asyncio.gather(*followups.values(), return_exceptions=True)))
 
-    def share_document_with_user(self, drive_file_id: str, email: str, role: str = 'writer'):
+        if isinstance(results.get("share"), Exception):
+            logger.error(f"Failed to share document {drive_file_id} with {user_email}: {results['share']}")
+
+        content = results.get("export")
+        if isinstance(content, Exception):
+            raise content
+        return drive_file_id, content
+
+    async def share_document_with_user(self, drive_file_id: str, email: str, role: str = 'writer'):
         """Shares the document with a specific user email."""
-        if not self.drive_service:
+        if not self.enabled:
             return
 
-        user_permission = {
-            'type': 'user',
-            'role': role,
-            'emailAddress': email
-        }
-
-        self.drive_service.permissions().create(
+        await self._run("permissions.create", lambda: self._drive().permissions().create(
             fileId=drive_file_id,
-            body=user_permission,
+            body=self._permission_body(email, role),
             fields='id',
             sendNotificationEmail=False
-        ).execute()
+        ).execute())
 
     def _decrypt_user_tokens(self, user) -> tuple:
-        """Decrypt Google tokens for a user. Returns (access_token, refresh_token)."""
-        from app.core.encryption import decrypt_token
-        access_token = decrypt_token(user.google_access_token)
-        refresh_token = decrypt_token(user.google_refresh_token)
-        return access_token, refresh_token
+        """Google tokens for a user from the credential cache. Returns (access_token, refresh_token)."""
+        from app.services.google_credentials import google_credentials
+        creds = google_credentials.get(user)
+        if creds is None:
+            return None, None
+        return creds.access_token, creds.refresh_token
 
     async def get_doc_content_as_markdown(self, drive_file_id: str) -> str:
         """Exports a Google Doc to Markdown."""
-        if not self.drive_service:
-            raise Exception("Google Drive service not initialized")
-
-        # Export as text/plain or text/markdown if supported, but html is safest for conversion
-        content_html = self.drive_service.files().export(
+        # Export as html, which converts to Markdown most faithfully
+        content_html = await self._run("files.export", lambda: self._drive().files().export(
             fileId=drive_file_id,
             mimeType='text/html'
-        ).execute()
-        
-        return md(content_html.decode('utf-8'))
+        ).execute())
+        return await conversion_service.html_to_markdown(content_html)
+
+    async def export_docs_as_markdown(self, drive_file_ids: List[str]) -> Dict[str, Any]:
+        """Exports many Google Docs to Markdown concurrently.
+
+        Returns drive_file_id -> Markdown, or the exception for docs that failed.
+        Exports are media downloads, which Drive batch requests don't carry, so
+        each doc is its own call under its own timeout. At most one export per
+        worker is in flight, so queued docs don't spend their timeout waiting.
+        """
+        if not drive_file_ids:
+            return {}
+        ids = list(dict.fromkeys(drive_file_ids))
+        slots = asyncio.Semaphore(self.workers)
+
+        async def export(file_id: str) -> str:
+            async with slots:
+                return await self.get_doc_content_as_markdown(file_id)
+
+        results = await asyncio.gather(*[export(file_id) for file_id in ids], return_exceptions=True)
+        return dict(zip(ids, results))
 
     async def sync_doc_to_r2(self, drive_file_id: str, r2_path: str):
         """Fetches from Drive and uploads to R2."""
@@ -102,19 +214,128 @@ class DocumentService:
         await storage_service.upload_content(r2_path, content_md)
         return content_md
 
+    async def sync_docs_to_r2(self, docs: List[Tuple[str, str]]) -> Dict[str, Optional[Exception]]:
+        """Concurrent variant of :meth:`sync_doc_to_r2` for ``(drive_file_id, r2_path)`` pairs.
+
+        Returns drive_file_id -> None on success or the exception that stopped it.
+        """
+        exported = await self.export_docs_as_markdown([file_id for file_id, _ in docs])
+        outcome: Dict[str, Optional[Exception]] = {}
+        for file_id, r2_path in docs:
+            content = exported.get(file_id)
+            if isinstance(content, Exception):
+                outcome[file_id] = content
+                continue
+            try:
+                await storage_service.upload_content(r2_path, content)
+                outcome[file_id] = None
+            except Exception as e:
+                outcome[file_id] = e
+        return outcome
+
+    async def update_google_doc_html(self, drive_file_id: str, html: str):
+        """Replaces a Google Doc's content with ``html``."""
+        media = MediaInMemoryUpload(html.encode('utf-8'), mimetype='text/html')
+        await self._run("files.update", lambda: self._drive().files().update(
+            fileId=drive_file_id,
+            media_body=media
+        ).execute())
+
     async def apply_batch_update(self, drive_file_id: str, requests: List[Dict[str, Any]]):
         """Applies batch updates to a Google Doc."""
-        if not self.docs_service:
+        if not self.enabled:
             raise Exception("Google Docs service not initialized")
-            
-        self.docs_service.documents().batchUpdate(
+
+        return await self._run("documents.batchUpdate", lambda: self._docs().documents().batchUpdate(
             documentId=drive_file_id,
             body={'requests': requests}
-        ).execute()
+        ).execute())
+
+    @staticmethod
+    def _section_range(document: Dict[str, Any], title: str, level: int) -> Optional[Tuple[int, int]]:
+        """Index range of the paragraphs under the one heading matching ``title``/``level``.
+
+        None if the heading is missing or ambiguous, or the section holds anything
+        other than plain paragraphs (tables, section breaks).
+        """
+        def heading_level(element) -> Optional[int]:
+            style = element["paragraph"].get("paragraphStyle", {}).get("namedStyleType", "")
+            return int(style[-1]) if style.startswith("HEADING_") else None
+
+        def text(element) -> str:
+            return "".join(
+                run.get("textRun", {}).get("content", "")
+                for run in element["paragraph"].get("elements", [])
+            )
+
+        content = document.get("body", {}).get("content", [])
+        wanted = markdown_sections._normalize(title)
+        hits = [
+            i for i, el in enumerate(content)
+            if "paragraph" in el and heading_level(el) == level
+            and markdown_sections._normalize(text(el)) == wanted
+        ]
+        if len(hits) != 1:
+            return None
+
+        start = content[hits[0]]["endIndex"]
+        # The body's final newline cannot be deleted
+        end = content[-1]["endIndex"] - 1
+        for el in content[hits[0] + 1:]:
+            if "paragraph" not in el:
+                return None
+            next_level = heading_level(el)
+            if next_level is not None and next_level <= level:
+                end = el["startIndex"]
+                break
+        return start, max(start, end)
+
+    async def replace_doc_section(self, drive_file_id: str, title: str, level: int, body_md: str) -> bool:
+        """Replace the text under one heading of a Google Doc with a range edit.
+
+        One read of the document structure and one batchUpdate, regardless of
+        document size. Returns False, without changing anything, when the section
+        can't be located or its content isn't plain prose (written as plain text,
+        any formatting would be lost); the caller then falls back to a full update.
+        """
+        text = markdown_sections.to_plain_text(body_md)
+        if text is None or not self.enabled:
+            return False
+        # Docs indexes count UTF-16 code units
+        text_length = len(text.encode("utf-16-le")) // 2
+
+        def patch() -> bool:
+            docs = self._docs()
+            document = docs.documents().get(
+                documentId=drive_file_id,
+                fields="body(content(startIndex,endIndex,paragraph(elements(textRun(content)),paragraphStyle(namedStyleType))))",
+            ).execute()
+            section = self._section_range(document, title, level)
+            if section is None:
+                return False
+            start, end = section
+            requests: List[Dict[str, Any]] = []
+            if end > start:
+                requests.append({"deleteContentRange": {"range": {"startIndex": start, "endIndex": end}}})
+            if text:
+                requests.append({"insertText": {"location": {"index": start}, "text": text}})
+                # Inserted text would otherwise take the style of the following heading
+                requests.append({"updateParagraphStyle": {
+                    "range": {"startIndex": start, "endIndex": start + text_length},
+                    "paragraphStyle": {"namedStyleType": "NORMAL_TEXT"},
+                    "fields": "namedStyleType",
+                }})
+            if requests:
+                docs.documents().batchUpdate(documentId=drive_file_id, body={"requests": requests}).execute()
+            return True
+
+        return await self._run("documents.replaceSection", patch, calls=2)
 
     async def delete_google_doc(self, drive_file_id: str):
         """Deletes a file from Google Drive."""
-        if self.drive_service:
-            self.drive_service.files().delete(fileId=drive_file_id).execute()
+        if self.enabled:
+            await self._run("files.delete", lambda: self._drive().files().delete(
+                fileId=drive_file_id
+            ).execute())
 
 document_service = DocumentService()
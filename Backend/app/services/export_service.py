@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import zipfile
+from typing import AsyncIterator, Dict, Iterable, List, Tuple
+
+from app.services.conversion_service import conversion_service
+from app.services.storage_backends import ObjectNotFound, StorageBackendError
+from app.services.storage_service import storage_service
+
+logger = logging.getLogger(__name__)
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOCX_CACHE_PREFIX = "renders/docx"
+# Bump when the Markdown -> DOCX rendering changes so stale renders are not served
+DOCX_RENDER_VERSION = 1
+
+
+class _ZipStream:
+    """Write-only, unseekable sink for ``zipfile``; the caller drains it between writes.
+
+    Because it cannot seek, ``zipfile`` writes each entry's sizes in a trailing
+    data descriptor, so the archive can be sent as it is produced.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """DOCX downloads and whole-idea zip exports.
+
+    DOCX renders are cached in storage under the hash of their source Markdown,
+    so an unchanged document is converted once rather than on every download.
+    Concurrent requests for the same uncached render share a single conversion.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "render_ms": 0.0}
+
+    @staticmethod
+    def docx_cache_key(content: str, title: str) -> str:
+        digest = hashlib.sha256(
+            f"{DOCX_RENDER_VERSION}\0{title}\0{content}".encode("utf-8")
+        ).hexdigest()
+        return f"{DOCX_CACHE_PREFIX}/{digest}.docx"
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    async def get_docx(self, content: str, title: str) -> bytes:
+        """Return ``content`` rendered as DOCX, from the render cache when possible."""
+        key = self.docx_cache_key(content, title)
+        if storage_service.backend:
+            try:
+                body = await storage_service.get_bytes(key)
+                with self._lock:
+                    self._stats["hits"] += 1
+                return body
+            except ObjectNotFound:
+                pass
+            except StorageBackendError as e:
+                logger.warning(f"DOCX render cache read failed for {key}: {e}")
+
+        # Single-flight: later callers await the render already in progress
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leading request was cancelled, not this one; render again
+                return await self.get_docx(content, title)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            start = time.perf_counter()
+            body = await conversion_service.markdown_to_docx(content, title)
+            with self._lock:
+                self._stats["misses"] += 1
+                self._stats["render_ms"] += (time.perf_counter() - start) * 1000
+            future.set_result(body)
+        except asyncio.CancelledError:
+            # Waiters must not hang on a render that will never finish
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a render nobody else awaited doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if storage_service.backend:
+            try:
+                await storage_service.upload_bytes(key, body, DOCX_MEDIA_TYPE, compress=False)
+            except StorageBackendError as e:
+                logger.warning(f"Could not cache DOCX render {key}: {e}")
+        return body
+
+    async def stream_zip(
+        self,
+        documents: Iterable[Tuple[str, str]],
+        formats: Iterable[str] = ("docx", "md"),
+        extra_files: Iterable[Tuple[str, str]] = (),
+    ) -> AsyncIterator[bytes]:
+        """Yield a zip archive of ``(name, markdown)`` documents as it is built.
+
+        Each document is added as ``<name>.md`` and/or ``<name>.docx``;
+        ``extra_files`` are ``(filename, text)`` pairs added as-is. Only one
+        entry is held in memory at a time. DOCX entries are stored without
+        recompression because the format is already a zip.
+        """
+        formats = set(formats)
+        sink = _ZipStream()
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, content in documents:
+                if "md" in formats:
+                    archive.writestr(f"{name}.md", content)
+                    yield sink.drain()
+                if "docx" in formats:
+                    body = await self.get_docx(content, name)
+                    archive.writestr(
+                        zipfile.ZipInfo(f"{name}.docx", date_time=time.localtime()[:6]),
+                        body,
+                        compress_type=zipfile.ZIP_STORED,
+                    )
+                    yield sink.drain()
+            for filename, text in extra_files:
+                archive.writestr(filename, text)
+                yield sink.drain()
+        # Central directory
+        yield sink.drain()
+
+
+export_service = ExportService()
@@ -32,7 +32,11 @@ class FeatureService:
             prefix = team.identifier
             
         identifier = crud_feature.get_next_identifier(db, prefix=prefix)
-        return crud_feature.create(db, obj_in=feature_in, identifier=identifier)
+        feature = crud_feature.create(db, obj_in=feature_in, identifier=identifier)
+
+        # Load what the response serializes
+        db.refresh(feature, ["milestones", "sub_features"])
+        return feature
 
     def update_status(
         self,
@@ -77,7 +81,6 @@ class FeatureService:
         
         feature.status = status
         db.commit()
-        db.refresh(feature)
         return feature
 
 
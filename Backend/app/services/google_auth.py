@@ -109,7 +109,9 @@ class GoogleAuthService:
 
             db.add(user)
             db.commit()
-            db.refresh(user)
+
+            from app.services.google_credentials import google_credentials
+            google_credentials.store(user)
             
         return user
 
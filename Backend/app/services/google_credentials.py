@@ -0,0 +1,199 @@
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.encryption import decrypt_token, encrypt_token
+from app.core.time import utc_now
+from app.models.user import User
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class CachedCredentials:
+    access_token: Optional[str]
+    refresh_token: Optional[str]
+    expires_at: Optional[datetime]
+    loaded_at: datetime
+    # Set by get(); entries that were only stored (e.g. at login) are never refreshed
+    last_used: Optional[datetime] = None
+
+    def expires_within(self, margin: timedelta) -> bool:
+        return self.expires_at is not None and utc_now() + margin >= self.expires_at
+
+
+class GoogleCredentialCache:
+    """In-process cache of decrypted per-user Google OAuth tokens.
+
+    Tokens are decrypted once per process instead of on every use. A scheduled
+    job (:meth:`refresh_due`) renews tokens of users who have actually used them
+    recently, shortly before they expire, so callers normally find a valid
+    access token and never wait on Google's token endpoint. Refreshes share one
+    pooled (blocking) HTTP client and are serialized per user.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, CachedCredentials] = {}
+        self._lock = threading.Lock()
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._client: Optional[httpx.Client] = None
+        self.margin = timedelta(seconds=settings.GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS)
+        self.idle_ttl = timedelta(seconds=settings.GOOGLE_TOKEN_CACHE_IDLE_SECONDS)
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=settings.GOOGLE_API_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                )
+            return self._client
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        with self._lock:
+            return self._user_locks.setdefault(user_id, threading.Lock())
+
+    def store(self, user: User) -> Optional[CachedCredentials]:
+        """(Re)load ``user``'s tokens from their encrypted columns, without marking them used."""
+        if not user.google_access_token and not user.google_refresh_token:
+            self.invalidate(user.id)
+            return None
+        entry = CachedCredentials(
+            access_token=decrypt_token(user.google_access_token),
+            refresh_token=decrypt_token(user.google_refresh_token),
+            expires_at=_as_utc(user.google_token_expires_at),
+            loaded_at=utc_now(),
+        )
+        with self._lock:
+            previous = self._entries.get(str(user.id))
+            entry.last_used = previous.last_used if previous else None
+            self._entries[str(user.id)] = entry
+        return entry
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def get(self, user: User) -> Optional[CachedCredentials]:
+        """Return usable credentials for ``user``.
+
+        Served from the cache when possible. Only a token that has already expired
+        (e.g. the first use after a restart) is refreshed inline, which blocks on
+        Google's token endpoint; async callers use :meth:`aget`.
+        """
+        user_id = str(user.id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None:
+            entry = self.store(user)
+            if entry is None:
+                return None
+        entry.last_used = utc_now()
+
+        if entry.expires_within(timedelta(0)):
+            entry = self.refresh(user_id) or entry
+        return entry
+
+    async def aget(self, user: User) -> Optional[CachedCredentials]:
+        """:meth:`get` on the threadpool, so an inline refresh never blocks the event loop."""
+        return await run_in_threadpool(self.get, user)
+
+    def refresh(self, user_id: str, force: bool = False) -> Optional[CachedCredentials]:
+        """Refresh ``user_id``'s access token; concurrent callers share one refresh."""
+        with self._user_lock(user_id):
+            with self._lock:
+                entry = self._entries.get(user_id)
+            if entry is None or not entry.refresh_token:
+                return entry
+            # Another thread may have refreshed while we waited for the lock
+            if not force and not entry.expires_within(self.margin):
+                return entry
+
+            try:
+                resp = self.client.post(TOKEN_URL, data={
+                    "client_id": settings.GOOGLE_CLIENT_ID,
+                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                    "refresh_token": entry.refresh_token,
+                    "grant_type": "refresh_token",
+                })
+                resp.raise_for_status()
+                tokens = resp.json()
+            except Exception as e:
+                logger.error(f"Failed to refresh Google token for user {user_id}: {e}")
+                return None
+
+            refreshed = CachedCredentials(
+                access_token=tokens.get("access_token"),
+                refresh_token=tokens.get("refresh_token") or entry.refresh_token,
+                expires_at=(
+                    utc_now() + timedelta(seconds=tokens["expires_in"])
+                    if tokens.get("expires_in") else entry.expires_at
+                ),
+                loaded_at=utc_now(),
+                last_used=entry.last_used,
+            )
+            with self._lock:
+                self._entries[user_id] = refreshed
+            self._persist(user_id, refreshed)
+            return refreshed
+
+    def _persist(self, user_id: str, entry: CachedCredentials) -> None:
+        db = SessionLocal()
+        try:
+            user = db.get(User, uuid.UUID(user_id))
+            if user:
+                user.google_access_token = encrypt_token(entry.access_token)
+                user.google_refresh_token = encrypt_token(entry.refresh_token)
+                user.google_token_expires_at = entry.expires_at
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to persist refreshed Google token for user {user_id}: {e}")
+        finally:
+            db.close()
+
+    def refresh_due(self) -> int:
+        """Scheduled job: renew used tokens expiring within the margin and drop idle users."""
+        now = utc_now()
+        with self._lock:
+            idle = [u for u, e in self._entries.items() if now - (e.last_used or e.loaded_at) > self.idle_ttl]
+            for user_id in idle:
+                del self._entries[user_id]
+            due = [
+                user_id for user_id, e in self._entries.items()
+                if e.last_used is not None and e.refresh_token and e.expires_within(self.margin)
+            ]
+
+        refreshed = 0
+        for user_id in due:
+            if self.refresh(user_id):
+                refreshed += 1
+        if due:
+            logger.info(f"Refreshed {refreshed}/{len(due)} Google tokens ahead of expiry")
+        return refreshed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+google_credentials = GoogleCredentialCache()
@@ -1,4 +1,9 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.unit_of_work import unit_of_work
 from app.crud import issue as crud_issue, activity as crud_activity
 from app.models.issue import Issue, IssueStatus, IssuePriority
 from app.models.activity import ActivityType
@@ -12,12 +17,24 @@ class IssueService:
     """Business logic for Issue management"""
 
     async def create_issue(
-        self, db: Session, *, issue_in: IssueCreate, current_user_id: UUID
+        self, db: AsyncSession, *, issue_in: IssueCreate, current_user_id: UUID
     ) -> Issue:
         """Create a new issue with activity tracking and optional AI auto-linking"""
-        # Fetch team to get its identifier
+        issue = await db.run_sync(self._create_issue, issue_in, current_user_id)
+
+        # Trigger AI Auto-linking in background if node ID is missing
+        if not issue.blueprint_node_id:
+            # We use asyncio.create_task to run this without blocking the response
+            # Note: This requires a separate DB session which auto_link_issue_background provides
+            asyncio.create_task(self.auto_link_issue_background(issue.id))
+
+        return issue
+
+    def _create_issue(
+        self, db: Session, issue_in: IssueCreate, current_user_id: UUID
+    ) -> Issue:
+        """The synchronous part of :meth:`create_issue`, run through ``AsyncSession.run_sync``."""
         from app.models.team_model import Team
-        import asyncio
 
         # Inherit context from parent if sub-issue
         parent_issue = None
@@ -40,98 +57,97 @@ class IssueService:
         else:
             identifier = crud_issue.get_next_identifier(db, prefix=team.identifier)
 
-        # Create issue
-        issue = crud_issue.create(db, obj_in=issue_in, identifier=identifier)
-
-        # Notify assignee if set
-        if issue.assignee_id and str(issue.assignee_id) != str(current_user_id):
-            notification_service.notify_user(
-                db,
-                recipient_id=issue.assignee_id,
-                type=NotificationType.ISSUE_ASSIGNED,
-                title="New Issue Assigned",
-                content=f"You were assigned to '{issue.title}'",
-                actor_id=current_user_id,
-                target_id=str(issue.id),
-                target_type="issue",
-            )
+        # The issue, its notification and activity commit together
+        with unit_of_work(db):
+            # Create issue
+            issue = crud_issue.create(db, obj_in=issue_in, identifier=identifier)
 
-        # Trigger AI Auto-linking in background if node ID is missing
-        if not issue.blueprint_node_id:
-            # We use asyncio.create_task to run this without blocking the response
-            # Note: This requires a separate DB session which auto_link_issue_background provides
-            asyncio.create_task(self.auto_link_issue_background(issue.id))
+            # Notify assignee if set
+            if issue.assignee_id and str(issue.assignee_id) != str(current_user_id):
+                notification_service.notify_user(
+                    db,
+                    recipient_id=issue.assignee_id,
+                    type=NotificationType.ISSUE_ASSIGNED,
+                    title="New Issue Assigned",
+                    content=f"You were assigned to '{issue.title}'",
+                    actor_id=current_user_id,
+                    target_id=str(issue.id),
+                    target_type="issue",
+                )
 
-        # Create activity
-        crud_activity.create(
-            db, issue_id=issue.id, type=ActivityType.CREATED, actor_id=current_user_id
-        )
+            # Create activity
+            crud_activity.create(
+                db, issue_id=issue.id, type=ActivityType.CREATED, actor_id=current_user_id
+            )
 
+        # Load what the response serializes; the async caller can't lazy-load
+        db.refresh(issue, ["assignee", "sub_issues", "resources"])
         return issue
 
     async def auto_link_issue_background(self, issue_id: UUID):
         """Background task to auto-link an issue to a blueprint node using AI."""
-        from app.core.database import SessionLocal
+        from app.core.database import AsyncSessionLocal
         from app.models.project_idea import ProjectIdea, ProjectAsset, AssetType
         from app.services.ai_service import ai_service
         from app.models.feature import Feature
-        from app.models.issue import Issue
         import json
         import logging
 
-        db = SessionLocal()
-        try:
-            issue = db.query(Issue).filter(Issue.id == issue_id).first()
-            if not issue or issue.blueprint_node_id:
-                return
-
-            feature = db.query(Feature).filter(Feature.id == issue.feature_id).first()
-            if not feature:
-                return
-
-            idea = (
-                db.query(ProjectIdea)
-                .filter(ProjectIdea.project_id == feature.project_id)
-                .order_by(ProjectIdea.created_at.desc())
-                .first()
-            )
+        async with AsyncSessionLocal() as db:
+            try:
+                issue = await db.get(Issue, issue_id)
+                if not issue or issue.blueprint_node_id:
+                    return
 
-            if not idea:
-                return
+                feature = await db.get(Feature, issue.feature_id)
+                if not feature:
+                    return
 
-            blueprint_asset = (
-                db.query(ProjectAsset)
-                .filter(
-                    ProjectAsset.project_idea_id == idea.id,
-                    ProjectAsset.asset_type == AssetType.DIAGRAM_USER_FLOW,
-                )
-                .first()
-            )
+                idea = (
+                    await db.execute(
+                        select(ProjectIdea)
+                        .where(ProjectIdea.project_id == feature.project_id)
+                        .order_by(ProjectIdea.created_at.desc())
+                        .limit(1)
+                    )
+                ).scalars().first()
+
+                if not idea:
+                    return
 
-            if not blueprint_asset or not blueprint_asset.content:
-                return
+                blueprint_asset = (
+                    await db.execute(
+                        select(ProjectAsset)
+                        .where(
+                            ProjectAsset.project_idea_id == idea.id,
+                            ProjectAsset.asset_type == AssetType.DIAGRAM_USER_FLOW,
+                        )
+                        .limit(1)
+                    )
+                ).scalars().first()
 
-            try:
-                blueprint_data = json.loads(blueprint_asset.content)
-                nodes = blueprint_data.get("nodes", [])
-                if not nodes:
+                if not blueprint_asset or not blueprint_asset.content:
                     return
 
-                matched_node_id = await ai_service.auto_link_issue_to_node(
-                    issue.title, issue.description or "", nodes
-                )
-                if matched_node_id:
-                    issue.blueprint_node_id = matched_node_id
-                    db.commit()
-                    logging.info(
-                        f"Auto-linked issue {issue_id} to node {matched_node_id}"
+                try:
+                    blueprint_data = json.loads(blueprint_asset.content)
+                    nodes = blueprint_data.get("nodes", [])
+                    if not nodes:
+                        return
+
+                    matched_node_id = await ai_service.auto_link_issue_to_node(
+                        issue.title, issue.description or "", nodes
                     )
+                    if matched_node_id:
+                        issue.blueprint_node_id = matched_node_id
+                        await db.commit()
+                        logging.info(
+                            f"Auto-linked issue {issue_id} to node {matched_node_id}"
+                        )
+                except Exception as e:
+                    logging.error(f"AI auto-linking logic failed: {str(e)}")
             except Exception as e:
-                logging.error(f"AI auto-linking logic failed: {str(e)}")
-        except Exception as e:
-            logging.error(f"Background auto-linking failed: {str(e)}")
-        finally:
-            db.close()
+                logging.error(f"Background auto-linking failed: {str(e)}")
 
     def update_issue(
         self,
@@ -147,108 +163,110 @@ class IssueService:
         if not issue:
             return None
 
-        # Track changes
-        update_data = issue_in.model_dump(exclude_unset=True)
+        # Activities, notifications and the update commit together
+        with unit_of_work(db):
+            # Track changes
+            update_data = issue_in.model_dump(exclude_unset=True)
 
-        # Status change
-        if "status" in update_data and update_data["status"] != issue.status:
-            crud_activity.create(
-                db,
-                issue_id=issue.id,
-                type=ActivityType.STATUS_CHANGED,
-                actor_id=current_user_id,
-                old_value=issue.status.value,
-                new_value=update_data["status"].value,
-            )
+            # Status change
+            if "status" in update_data and update_data["status"] != issue.status:
+                crud_activity.create(
+                    db,
+                    issue_id=issue.id,
+                    type=ActivityType.STATUS_CHANGED,
+                    actor_id=current_user_id,
+                    old_value=issue.status.value,
+                    new_value=update_data["status"].value,
+                )
 
-            # Notify assignee
-            if issue.assignee_id and str(issue.assignee_id) != str(current_user_id):
-                notification_service.notify_user(
+                # Notify assignee
+                if issue.assignee_id and str(issue.assignee_id) != str(current_user_id):
+                    notification_service.notify_user(
+                        db,
+                        recipient_id=issue.assignee_id,
+                        type=NotificationType.ISSUE_STATUS_CHANGED,
+                        title="Issue Status Updated",
+                        content=f"Issue '{issue.identifier}' moved to {update_data['status'].value}",
+                        actor_id=current_user_id,
+                        target_id=str(issue.id),
+                        target_type="issue",
+                    )
+
+            # Priority change
+            if "priority" in update_data and update_data["priority"] != issue.priority:
+                crud_activity.create(
                     db,
-                    recipient_id=issue.assignee_id,
-                    type=NotificationType.ISSUE_STATUS_CHANGED,
-                    title="Issue Status Updated",
-                    content=f"Issue '{issue.identifier}' moved to {update_data['status'].value}",
+                    issue_id=issue.id,
+                    type=ActivityType.PRIORITY_CHANGED,
                     actor_id=current_user_id,
-                    target_id=str(issue.id),
-                    target_type="issue",
+                    old_value=issue.priority.value,
+                    new_value=update_data["priority"].value,
                 )
 
-        # Priority change
-        if "priority" in update_data and update_data["priority"] != issue.priority:
-            crud_activity.create(
-                db,
-                issue_id=issue.id,
-                type=ActivityType.PRIORITY_CHANGED,
-                actor_id=current_user_id,
-                old_value=issue.priority.value,
-                new_value=update_data["priority"].value,
-            )
+                # Notify if escalated to high/urgent
+                if (
+                    update_data["priority"] in [IssuePriority.HIGH, IssuePriority.URGENT]
+                    and issue.assignee_id
+                    and str(issue.assignee_id) != str(current_user_id)
+                ):
+                    notification_service.notify_user(
+                        db,
+                        recipient_id=issue.assignee_id,
+                        type=NotificationType.ISSUE_PRIORITY_UPGRADE,
+                        title="Issue Escalated",
+                        content=f"Issue '{issue.identifier}' priority changed to {update_data['priority'].value}",
+                        actor_id=current_user_id,
+                        target_id=str(issue.id),
+                        target_type="issue",
+                    )
 
-            # Notify if escalated to high/urgent
+            # Type change
             if (
-                update_data["priority"] in [IssuePriority.HIGH, IssuePriority.URGENT]
-                and issue.assignee_id
-                and str(issue.assignee_id) != str(current_user_id)
+                "issue_type" in update_data
+                and update_data["issue_type"] != issue.issue_type
             ):
-                notification_service.notify_user(
+                crud_activity.create(
                     db,
-                    recipient_id=issue.assignee_id,
-                    type=NotificationType.ISSUE_PRIORITY_UPGRADE,
-                    title="Issue Escalated",
-                    content=f"Issue '{issue.identifier}' priority changed to {update_data['priority'].value}",
+                    issue_id=issue.id,
+                    type=ActivityType.TYPE_CHANGED,
                     actor_id=current_user_id,
-                    target_id=str(issue.id),
-                    target_type="issue",
+                    old_value=issue.issue_type.value,
+                    new_value=update_data["issue_type"].value,
                 )
 
-        # Type change
-        if (
-            "issue_type" in update_data
-            and update_data["issue_type"] != issue.issue_type
-        ):
-            crud_activity.create(
-                db,
-                issue_id=issue.id,
-                type=ActivityType.TYPE_CHANGED,
-                actor_id=current_user_id,
-                old_value=issue.issue_type.value,
-                new_value=update_data["issue_type"].value,
-            )
-
-        # Assignee change
-        if (
-            "assignee_id" in update_data
-            and update_data["assignee_id"] != issue.assignee_id
-        ):
-            crud_activity.create(
-                db,
-                issue_id=issue.id,
-                type=ActivityType.ASSIGNED,
-                actor_id=current_user_id,
-                old_value=str(issue.assignee_id) if issue.assignee_id else None,
-                new_value=str(update_data["assignee_id"])
-                if update_data["assignee_id"]
-                else None,
-            )
-
-            # Notify new assignee
-            if update_data["assignee_id"] and str(update_data["assignee_id"]) != str(
-                current_user_id
+            # Assignee change
+            if (
+                "assignee_id" in update_data
+                and update_data["assignee_id"] != issue.assignee_id
             ):
-                notification_service.notify_user(
+                crud_activity.create(
                     db,
-                    recipient_id=update_data["assignee_id"],
-                    type=NotificationType.ISSUE_ASSIGNED,
-                    title="Issue Assigned to You",
-                    content=f"You were assigned to '{issue.title}'",
+                    issue_id=issue.id,
+                    type=ActivityType.ASSIGNED,
                     actor_id=current_user_id,
-                    target_id=str(issue.id),
-                    target_type="issue",
+                    old_value=str(issue.assignee_id) if issue.assignee_id else None,
+                    new_value=str(update_data["assignee_id"])
+                    if update_data["assignee_id"]
+                    else None,
                 )
 
-        # Update issue
-        updated_issue = crud_issue.update(db, db_obj=issue, obj_in=issue_in)
+                # Notify new assignee
+                if update_data["assignee_id"] and str(update_data["assignee_id"]) != str(
+                    current_user_id
+                ):
+                    notification_service.notify_user(
+                        db,
+                        recipient_id=update_data["assignee_id"],
+                        type=NotificationType.ISSUE_ASSIGNED,
+                        title="Issue Assigned to You",
+                        content=f"You were assigned to '{issue.title}'",
+                        actor_id=current_user_id,
+                        target_id=str(issue.id),
+                        target_type="issue",
+                    )
+
+            # Update issue
+            updated_issue = crud_issue.update(db, db_obj=issue, obj_in=issue_in)
 
         return updated_issue
 
@@ -259,33 +277,34 @@ class IssueService:
         from app.crud import comment as crud_comment
         from app.schemas.comment import CommentCreate
 
-        # Create comment
-        comment = crud_comment.create_for_issue(
-            db,
-            obj_in=CommentCreate(content=content),
-            issue_id=issue_id,
-            author_id=author_id,
-        )
-
-        # Create activity
-        crud_activity.create(
-            db, issue_id=issue_id, type=ActivityType.COMMENT, actor_id=author_id
-        )
-
-        # Notify assignee
-        issue = crud_issue.get(db, id=issue_id)
-        if issue and issue.assignee_id and str(issue.assignee_id) != str(author_id):
-            notification_service.notify_user(
+        with unit_of_work(db):
+            # Create comment
+            comment = crud_comment.create_for_issue(
                 db,
-                recipient_id=issue.assignee_id,
-                type=NotificationType.ISSUE_COMMENT,
-                title="New Comment on Issue",
-                content=f"New comment on '{issue.identifier}': {content[:50]}...",
-                actor_id=author_id,
-                target_id=str(issue.id),
-                target_type="issue",
+                obj_in=CommentCreate(content=content),
+                issue_id=issue_id,
+                author_id=author_id,
+            )
+
+            # Create activity
+            crud_activity.create(
+                db, issue_id=issue_id, type=ActivityType.COMMENT, actor_id=author_id
             )
 
+            # Notify assignee
+            issue = db.get(Issue, issue_id)
+            if issue and issue.assignee_id and str(issue.assignee_id) != str(author_id):
+                notification_service.notify_user(
+                    db,
+                    recipient_id=issue.assignee_id,
+                    type=NotificationType.ISSUE_COMMENT,
+                    title="New Comment on Issue",
+                    content=f"New comment on '{issue.identifier}': {content[:50]}...",
+                    actor_id=author_id,
+                    target_id=str(issue.id),
+                    target_type="issue",
+                )
+
         return comment
 
 
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
+from app.core.pagination import paginate
+from app.core.unit_of_work import commit
 from app.models.notification import Notification, NotificationType
 from app.models.user import User
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import uuid
 
 class NotificationService:
@@ -27,15 +29,17 @@ class NotificationService:
             target_type=target_type
         )
         db.add(notification)
-        db.commit()
-        db.refresh(notification)
+        commit(db)
         return notification
 
-    def get_user_notifications(self, db: Session, user_id: uuid.UUID, limit: int = 50) -> List[Notification]:
-        """Get recent notifications for a user."""
-        return db.query(Notification).filter(
-            Notification.recipient_id == user_id
-        ).order_by(Notification.created_at.desc()).limit(limit).all()
+    def get_user_notifications(
+        self, db: Session, user_id: uuid.UUID, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[Notification], Optional[str]]:
+        """Get a page of a user's notifications, newest first, and the next cursor."""
+        query = db.query(Notification).filter(Notification.recipient_id == user_id)
+        return paginate(
+            query, key=(Notification.created_at, Notification.id), cursor=cursor, limit=limit
+        )
 
     def get_unread_count(self, db: Session, user_id: uuid.UUID) -> int:
         """Get count of unread notifications."""
@@ -53,7 +57,6 @@ class NotificationService:
         if notification:
             notification.is_read = True
             db.commit()
-            db.refresh(notification)
         return notification
 
     def mark_all_as_read(self, db: Session, user_id: uuid.UUID) -> int:
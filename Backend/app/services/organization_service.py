@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.unit_of_work import unit_of_work
 from app.crud import organization as crud_org, user_role as crud_role, invite_code as crud_invite, user as crud_user, team as crud_team
 from app.models.organization import Organization
 from app.models.user_role import UserRoleType
@@ -30,45 +31,40 @@ class OrganizationService:
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
             
-        # 1. Create Organization
-        org = crud_org.create(db, obj_in=org_in)
-        org.created_by_id = user_id
-        db.add(org)
-        db.commit()
-        
-        # 2. Assign Admin Role
-        from app.schemas.user_role import UserRoleCreate
-        crud_role.create(db, obj_in=UserRoleCreate(
-            user_id=user_id,
-            organization_id=org.id,
-            role=UserRoleType.ADMIN
-        ))
-        user.role = "admin"
-        db.add(user)
-        db.commit()
-        
-        # 3. Create Default Team
-        team_name = f"{user.first_name}'s Team"
-        identifier = team_name[:3].upper()
-        
-        from app.models.team_model import Team
-        team = Team(
-            organization_id=org.id,
-            name=team_name,
-            identifier=identifier
-        )
-        team.leaders.append(user)
-        db.add(team)
-        db.commit()
-        
-        # 4. Add user to team
-        team.members.append(user)
-        db.commit()
-        
-        # Update user's current organization
-        user.organization_id = org.id
-        db.commit()
-        
+        with unit_of_work(db):
+            # 1. Create Organization
+            org = crud_org.create(db, obj_in=org_in)
+            org.created_by_id = user_id
+            # The role and team below need the organization's id
+            db.flush()
+
+            # 2. Assign Admin Role
+            from app.schemas.user_role import UserRoleCreate
+            crud_role.create(db, obj_in=UserRoleCreate(
+                user_id=user_id,
+                organization_id=org.id,
+                role=UserRoleType.ADMIN
+            ))
+            user.role = "admin"
+
+            # 3. Create Default Team
+            team_name = f"{user.first_name}'s Team"
+            identifier = team_name[:3].upper()
+
+            from app.models.team_model import Team
+            team = Team(
+                organization_id=org.id,
+                name=team_name,
+                identifier=identifier
+            )
+            team.leaders.append(user)
+            # 4. Add user to team
+            team.members.append(user)
+            db.add(team)
+
+            # Update user's current organization
+            user.organization_id = org.id
+
         return org
 
     def join_organization(
@@ -99,23 +95,22 @@ class OrganizationService:
                 detail="User already in this organization"
             )
             
-        # Add role
-        from app.schemas.user_role import UserRoleCreate
-        crud_role.create(db, obj_in=UserRoleCreate(
-            user_id=user_id,
-            organization_id=code.organization_id,
-            role=UserRoleType.MEMBER
-        ))
-        
-        # Update code usage
-        code.used_count += 1
-        db.commit()
-        
-        # Set as current org
-        user = crud_user.get(db, id=user_id)
-        user.organization_id = code.organization_id
-        db.commit()
-        
+        with unit_of_work(db):
+            # Add role
+            from app.schemas.user_role import UserRoleCreate
+            crud_role.create(db, obj_in=UserRoleCreate(
+                user_id=user_id,
+                organization_id=code.organization_id,
+                role=UserRoleType.MEMBER
+            ))
+
+            # Update code usage
+            code.used_count += 1
+
+            # Set as current org
+            user = crud_user.get(db, id=user_id)
+            user.organization_id = code.organization_id
+
         return code.organization
 
     def generate_invite_code(
@@ -156,7 +151,6 @@ class OrganizationService:
         )
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         
         return db_obj
 
@@ -1,10 +1,18 @@
+import asyncio
+import hashlib
 import json
-from typing import Any, Dict, List, Optional
-from sqlalchemy.orm import Session
-
-from app.core.time import utc_now
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.services.storage_service import storage_service
-from app.models.project_idea import ProjectIdea, AssetType
+from app.models.project_idea import ProjectIdea, ProjectAsset, AssetType
 from app.models.feature import Feature
 from app.models.issue import Issue
 from app.crud import crud_project_idea
@@ -12,8 +20,62 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+DOC_TYPES = [
+    AssetType.PRD,
+    AssetType.APP_FLOW,
+    AssetType.TECH_STACK,
+    AssetType.FRONTEND_GUIDELINES,
+    AssetType.BACKEND_SCHEMA,
+    AssetType.IMPLEMENTATION_PLAN,
+]
+
+# Issues listed individually; the rest are summarized in one line
+MAX_LISTED_ISSUES = 50
+
+
+def _get(obj: Any, name: str, default=None):
+    """Read ``name`` from a JSON dict or a schema object alike."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _fingerprint(value: Any) -> str:
+    return hashlib.sha1(
+        json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
 
 class ProjectMDService:
+    """Builds and saves each idea's ``project.md``.
+
+    The file is assembled from independent sections. Each section's rendered
+    text is cached with a version derived from its source rows (for list
+    sections, a row count and latest ``updated_at`` read by one aggregate query),
+    so a save only loads and renders the sections whose sources changed.
+    Saves requested through :meth:`request_update` are debounced per idea, so a
+    burst of feature or doc changes produces a single write.
+    """
+
+    def __init__(self):
+        # idea_id -> {section: (version, rendered text)}, least recently used first
+        self._sections: "OrderedDict[str, Dict[str, Tuple[Any, str]]]" = OrderedDict()
+        self._cache_size = settings.PROJECT_MD_SECTION_CACHE_SIZE
+        self._lock = threading.Lock()
+        self.debounce_seconds = settings.PROJECT_MD_DEBOUNCE_SECONDS
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"saves": 0, "unchanged": 0, "sections_rendered": 0, "sections_reused": 0, "coalesced": 0}
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    # -- rendering ------------------------------------------------------------
+
     def generate_project_md_content(
         self,
         idea: ProjectIdea,
@@ -21,307 +83,348 @@ class ProjectMDService:
         issues: List[Issue] = None,
         assets: List[Any] = None,
     ) -> str:
-        content_parts = []
-
-        content_parts.append(f"""# Project: {idea.refined_description or idea.raw_input[:100]}
-
-> **Generated:** {utc_now().strftime("%Y-%m-%d %H:%M UTC")}
-> **Status:** {idea.status}
-
----
-
-""")
-
-        content_parts.append(self._generate_idea_section(idea))
-
+        """Render the whole file from already-loaded rows, bypassing the cache."""
+        issues = issues or []
+        parts = [
+            self._generate_header(idea, idea.updated_at),
+            self._generate_idea_section(idea),
+        ]
         if idea.clarification_questions:
-            content_parts.append(
-                self._generate_clarification_section(idea.clarification_questions)
-            )
-
+            parts.append(self._generate_clarification_section(idea.clarification_questions))
         if idea.validation_report:
-            content_parts.append(
-                self._generate_validation_section(idea.validation_report)
-            )
-
+            parts.append(self._generate_validation_section(idea.validation_report))
         if features:
-            content_parts.append(self._generate_features_section(features))
-
+            parts.append(self._generate_features_section(features))
         if issues:
-            content_parts.append(self._generate_issues_section(issues))
-
+            parts.append(self._generate_issues_section(issues[:MAX_LISTED_ISSUES], len(issues)))
         if assets:
-            content_parts.append(self._generate_docs_section(assets))
-
-        return "".join(content_parts)
+            parts.append(self._generate_docs_section(assets))
+        return "".join(parts)
+
+    def _generate_header(self, idea: ProjectIdea, last_updated) -> str:
+        # Derived from the data rather than the wall clock, so an unchanged
+        # project renders byte-identical output and the upload is skipped
+        updated = last_updated.strftime("%Y-%m-%d %H:%M UTC") if last_updated else "N/A"
+        return (
+            f"# Project: {idea.refined_description or idea.raw_input[:100]}\n\n"
+            f"> **Last updated:** {updated}\n"
+            f"> **Status:** {idea.status}\n\n"
+            "---\n\n"
+        )
 
     def _generate_idea_section(self, idea: ProjectIdea) -> str:
-        section = f"""## Project Idea
-
-### Description
-{idea.raw_input}
-
-"""
+        lines = ["## Project Idea\n", "### Description", idea.raw_input, ""]
         if idea.refined_description and idea.refined_description != idea.raw_input:
-            section += f"""### Refined Description
-{idea.refined_description}
-
-"""
-        return section
+            lines += ["### Refined Description", idea.refined_description, ""]
+        return "\n".join(lines) + "\n"
 
     def _generate_clarification_section(self, questions: List[Dict]) -> str:
-        section = """## Clarification Q&A
-
-"""
+        lines = ["## Clarification Q&A\n"]
         for i, q in enumerate(questions, 1):
-            question = q.get("question", "")
-            answer = q.get("answer", "Not answered")
-            section += f"""### Q{i}: {question}
-**Answer:** {answer}
-
-"""
-        return section
+            lines.append(f"### Q{i}: {q.get('question', '')}")
+            lines.append(f"**Answer:** {q.get('answer', 'Not answered')}\n")
+        return "\n".join(lines) + "\n"
 
     def _generate_validation_section(self, report: Any) -> str:
-        section = """## Validation Analysis
-
-"""
-
         mf = report.market_feasibility
-        if isinstance(mf, dict):
-            score = mf.get("score", 0)
-            analysis = mf.get("analysis", "")
-            pillars = mf.get("pillars", [])
-        else:
-            score = getattr(mf, "score", 0)
-            analysis = getattr(mf, "analysis", "")
-            pillars = getattr(mf, "pillars", [])
-
-        section += f"""### Market Feasibility Score: {score}/100
-
-{analysis}
-
-### 6 Core Pillars
-
-| Pillar | Status | Reason |
-|--------|--------|--------|
-"""
-
-        for pillar in pillars:
-            if isinstance(pillar, dict):
-                name = pillar.get("name", "")
-                status = pillar.get("status", "")
-                reason = pillar.get("reason", "")
-            else:
-                name = getattr(pillar, "name", "")
-                status = getattr(pillar, "status", "")
-                reason = getattr(pillar, "reason", "")
-            section += f"| {name} | {status} | {reason} |\n"
-
-        section += "\n"
+        lines = [
+            "## Validation Analysis\n",
+            f"### Market Feasibility Score: {_get(mf, 'score', 0)}/100\n",
+            _get(mf, "analysis", ""),
+            "",
+            "### 6 Core Pillars\n",
+            "| Pillar | Status | Reason |",
+            "|--------|--------|--------|",
+        ]
+        for pillar in _get(mf, "pillars", []) or []:
+            lines.append(
+                f"| {_get(pillar, 'name', '')} | {_get(pillar, 'status', '')} | {_get(pillar, 'reason', '')} |"
+            )
+        lines.append("")
 
         core_features = report.core_features
         if isinstance(core_features, list) and core_features:
-            section += """### Core Features
-
-| Feature | Description | Type |
-|---------|-------------|------|
-"""
+            lines += [
+                "### Core Features\n",
+                "| Feature | Description | Type |",
+                "|---------|-------------|------|",
+            ]
             for f in core_features:
-                if isinstance(f, dict):
-                    name = f.get("name", "")
-                    desc = f.get("description", "")
-                    ftype = f.get("type", "")
-                else:
-                    name = getattr(f, "name", "")
-                    desc = getattr(f, "description", "")
-                    ftype = getattr(f, "type", "")
-                section += f"| {name} | {desc} | {ftype} |\n"
-            section += "\n"
+                lines.append(f"| {_get(f, 'name', '')} | {_get(f, 'description', '')} | {_get(f, 'type', '')} |")
+            lines.append("")
 
         tech_stack = report.tech_stack
         if tech_stack:
-            if isinstance(tech_stack, dict):
-                frontend = tech_stack.get("frontend", [])
-                backend = tech_stack.get("backend", [])
-                database = tech_stack.get("database", [])
-                infrastructure = tech_stack.get("infrastructure", [])
-            else:
-                frontend = getattr(tech_stack, "frontend", []) or []
-                backend = getattr(tech_stack, "backend", []) or []
-                database = getattr(tech_stack, "database", []) or []
-                infrastructure = getattr(tech_stack, "infrastructure", []) or []
-
-            section += f"""### Tech Stack
-
-| Category | Technologies |
-|----------|-------------|
-| Frontend | {", ".join(frontend) if frontend else "N/A"} |
-| Backend | {", ".join(backend) if backend else "N/A"} |
-| Database | {", ".join(database) if database else "N/A"} |
-| Infrastructure | {", ".join(infrastructure) if infrastructure else "N/A"} |
-
-"""
+            def joined(category):
+                values = _get(tech_stack, category, []) or []
+                return ", ".join(values) if values else "N/A"
+
+            lines += [
+                "### Tech Stack\n",
+                "| Category | Technologies |",
+                "|----------|-------------|",
+                f"| Frontend | {joined('frontend')} |",
+                f"| Backend | {joined('backend')} |",
+                f"| Database | {joined('database')} |",
+                f"| Infrastructure | {joined('infrastructure')} |",
+                "",
+            ]
 
         pricing = report.pricing_model
         if pricing:
-            if isinstance(pricing, dict):
-                ptype = pricing.get("type", "")
-                tiers = pricing.get("tiers", [])
-            else:
-                ptype = getattr(pricing, "type", "")
-                tiers = getattr(pricing, "tiers", []) or []
-
-            section += f"""### Pricing Model: {ptype}
-
-"""
+            lines.append(f"### Pricing Model: {_get(pricing, 'type', '')}\n")
+            tiers = _get(pricing, "tiers", []) or []
             if tiers:
-                section += """| Tier | Price | Features |
-|------|-------|----------|
-"""
+                lines += ["| Tier | Price | Features |", "|------|-------|----------|"]
                 for tier in tiers:
-                    if isinstance(tier, dict):
-                        tname = tier.get("name", "")
-                        tprice = tier.get("price", "")
-                        tfeatures = ", ".join(tier.get("features", []))
-                    else:
-                        tname = getattr(tier, "name", "")
-                        tprice = getattr(tier, "price", "")
-                        tfeatures = ", ".join(getattr(tier, "features", []) or [])
-                    section += f"| {tname} | {tprice} | {tfeatures} |\n"
-                section += "\n"
-
-        return section
+                    features = ", ".join(_get(tier, "features", []) or [])
+                    lines.append(f"| {_get(tier, 'name', '')} | {_get(tier, 'price', '')} | {features} |")
+                lines.append("")
 
-    def _generate_features_section(self, features: List[Feature]) -> str:
-        section = """## Project Features
+        return "\n".join(lines) + "\n"
 
-| ID | Name | Status | Priority | Owner |
-|----|------|--------|----------|-------|
-"""
+    def _generate_features_section(self, features: List[Feature]) -> str:
+        lines = [
+            "## Project Features\n",
+            "| ID | Name | Status | Priority | Owner |",
+            "|----|------|--------|----------|-------|",
+        ]
         for f in features:
             fid = f.identifier or str(f.id)[:8]
-            fname = f.name
             fstatus = f.status.value if f.status else "N/A"
             fpriority = f.priority.value if f.priority else "N/A"
             fowner = f.owner.email if f.owner else "Unassigned"
-            section += f"| {fid} | {fname} | {fstatus} | {fpriority} | {fowner} |\n"
-
-        section += "\n"
-        return section
-
-    def _generate_issues_section(self, issues: List[Issue]) -> str:
-        section = """## Project Issues
-
-| ID | Title | Status | Type | Assignee |
-|----|-------|--------|------|----------|
-"""
-        for i in issues[:50]:
+            lines.append(f"| {fid} | {f.name} | {fstatus} | {fpriority} | {fowner} |")
+        return "\n".join(lines) + "\n\n"
+
+    def _generate_issues_section(self, issues: List[Issue], total: Optional[int] = None) -> str:
+        total = len(issues) if total is None else total
+        lines = [
+            "## Project Issues\n",
+            "| ID | Title | Status | Type | Assignee |",
+            "|----|-------|--------|------|----------|",
+        ]
+        for i in issues[:MAX_LISTED_ISSUES]:
             iid = i.identifier or str(i.id)[:8]
             ititle = i.title[:40] + "..." if len(i.title) > 40 else i.title
             istatus = i.status.value if i.status else "N/A"
             itype = i.issue_type.value if i.issue_type else "N/A"
             iassignee = i.assignee.email if i.assignee else "Unassigned"
-            section += f"| {iid} | {ititle} | {istatus} | {itype} | {iassignee} |\n"
+            lines.append(f"| {iid} | {ititle} | {istatus} | {itype} | {iassignee} |")
+        if total > MAX_LISTED_ISSUES:
+            lines.append(f"\n> *...and {total - MAX_LISTED_ISSUES} more issues*")
+        return "\n".join(lines) + "\n\n"
 
-        if len(issues) > 50:
-            section += f"\n> *...and {len(issues) - 50} more issues*\n"
+    def _generate_docs_section(self, assets: List[Any]) -> str:
+        lines = [
+            "## Documentation\n",
+            "| Document | Status | R2 Path |",
+            "|----------|--------|---------|",
+        ]
+        for asset in assets:
+            if asset.asset_type in DOC_TYPES:
+                status = asset.status.value if asset.status else "N/A"
+                lines.append(f"| {asset.asset_type.value} | {status} | `{asset.r2_path or 'N/A'}` |")
+        return "\n".join(lines) + "\n\n"
 
-        section += "\n"
-        return section
+    # -- incremental build ----------------------------------------------------
 
-    def _generate_docs_section(self, assets: List[Any]) -> str:
-        doc_types = [
-            AssetType.PRD,
-            AssetType.APP_FLOW,
-            AssetType.TECH_STACK,
-            AssetType.FRONTEND_GUIDELINES,
-            AssetType.BACKEND_SCHEMA,
-            AssetType.IMPLEMENTATION_PLAN,
+    @staticmethod
+    def _aggregate(db: Session, model, *criteria) -> Tuple[int, Any]:
+        """(row count, latest updated_at): changes whenever a row is added, removed or edited."""
+        return tuple(
+            db.query(func.count(model.id), func.max(model.updated_at)).filter(*criteria).one()
+        )
+
+    def build_project_md(self, db: Session, idea: ProjectIdea, project_id: Optional[str] = None) -> str:
+        """Assemble project.md, re-rendering only sections whose sources changed."""
+        idea_id = str(idea.id)
+        project_id = uuid.UUID(str(project_id)) if project_id else None
+        with self._lock:
+            cached = dict(self._sections.get(idea_id, {}))
+
+        doc_versions = self._aggregate(
+            db, ProjectAsset,
+            ProjectAsset.project_idea_id == idea.id,
+            ProjectAsset.asset_type.in_(DOC_TYPES),
+        )
+        feature_versions = issue_versions = (0, None)
+        # Issues belong to a project through their feature
+        in_project = Issue.feature_id.in_(
+            select(Feature.id).where(Feature.project_id == project_id)
+        )
+        if project_id:
+            feature_versions = self._aggregate(db, Feature, Feature.project_id == project_id)
+            issue_versions = self._aggregate(db, Issue, in_project)
+
+        def load_features():
+            return (
+                db.query(Feature).options(joinedload(Feature.owner))
+                .filter(Feature.project_id == project_id)
+                .order_by(Feature.created_at, Feature.id).all()
+            )
+
+        def load_issues():
+            return (
+                db.query(Issue).options(joinedload(Issue.assignee))
+                .filter(in_project)
+                .order_by(Issue.created_at, Issue.id).limit(MAX_LISTED_ISSUES).all()
+            )
+
+        def load_docs():
+            return (
+                db.query(ProjectAsset)
+                .filter(ProjectAsset.project_idea_id == idea.id, ProjectAsset.asset_type.in_(DOC_TYPES))
+                .order_by(ProjectAsset.created_at, ProjectAsset.id).all()
+            )
+
+        report = idea.validation_report
+        # (name, version, render); a section that renders "" is omitted
+        sections: List[Tuple[str, Any, Callable[[], str]]] = [
+            ("idea", (idea.raw_input, idea.refined_description),
+             lambda: self._generate_idea_section(idea)),
+            ("clarification", _fingerprint(idea.clarification_questions),
+             lambda: self._generate_clarification_section(idea.clarification_questions)
+             if idea.clarification_questions else ""),
+            ("validation", _fingerprint([
+                report.market_feasibility, report.core_features, report.tech_stack, report.pricing_model,
+            ]) if report else None,
+             lambda: self._generate_validation_section(report) if report else ""),
+            ("features", (project_id, feature_versions),
+             lambda: self._generate_features_section(load_features()) if feature_versions[0] else ""),
+            ("issues", (project_id, issue_versions),
+             lambda: self._generate_issues_section(load_issues(), issue_versions[0]) if issue_versions[0] else ""),
+            ("docs", doc_versions,
+             lambda: self._generate_docs_section(load_docs()) if doc_versions[0] else ""),
         ]
 
-        section = """## Documentation
+        rendered: Dict[str, Tuple[Any, str]] = {}
+        reused = 0
+        for name, version, render in sections:
+            hit = cached.get(name)
+            if hit is not None and hit[0] == version:
+                rendered[name] = hit
+                reused += 1
+            else:
+                rendered[name] = (version, render())
+        self._count("sections_reused", reused)
+        self._count("sections_rendered", len(sections) - reused)
 
-| Document | Status | R2 Path |
-|----------|--------|---------|
-"""
+        with self._lock:
+            self._sections[idea_id] = rendered
+            self._sections.move_to_end(idea_id)
+            while len(self._sections) > self._cache_size:
+                self._sections.popitem(last=False)
 
-        for asset in assets:
-            if asset.asset_type in doc_types:
-                status = asset.status.value if asset.status else "N/A"
-                r2_path = asset.r2_path or "N/A"
-                section += f"| {asset.asset_type.value} | {status} | `{r2_path}` |\n"
+        timestamps = [idea.updated_at, doc_versions[1], feature_versions[1], issue_versions[1]]
+        last_updated = max((t.replace(tzinfo=None) for t in timestamps if t), default=None)
+        parts = [self._generate_header(idea, last_updated)]
+        parts.extend(text for _, text in rendered.values() if text)
+        return "".join(parts)
 
-        section += "\n"
-        return section
+    def invalidate(self, idea_id: str) -> None:
+        with self._lock:
+            self._sections.pop(str(idea_id), None)
+
+    # -- persistence ----------------------------------------------------------
 
     async def save_project_md(
         self,
-        db: Session,
+        db: AsyncSession,
         idea_id: str,
         project_id: str = None,
     ) -> str:
-        idea = crud_project_idea.project_idea.get(db=db, id=idea_id)
+        idea = await crud_project_idea.project_idea.get_async(db, idea_id)
         if not idea:
             raise ValueError(f"Idea {idea_id} not found")
 
-        features = []
-        issues = []
-
-        if project_id:
-            from app.models.feature import Feature as ProjectFeature
-            from app.models.issue import Issue as ProjectIssue
-
-            features = (
-                db.query(ProjectFeature)
-                .filter(ProjectFeature.project_id == project_id)
-                .all()
-            )
-
-            issues = (
-                db.query(ProjectIssue)
-                .filter(ProjectIssue.project_id == project_id)
-                .all()
-            )
-
-        assets = crud_project_idea.project_idea.get_assets(db, idea_id=idea_id)
+        # The builder's loaders are plain sync queries; run them on the session's sync side
+        content = await db.run_sync(self.build_project_md, idea, project_id)
+        r2_key = f"projects/{idea_id}/project.md"
 
-        content = self.generate_project_md_content(
-            idea=idea,
-            features=features,
-            issues=issues,
-            assets=assets,
+        existing_asset = await crud_project_idea.project_idea.get_asset_async(
+            db, idea_id=idea.id, asset_type=AssetType.PROJECT_MD
         )
+        if existing_asset and existing_asset.content == content and existing_asset.r2_path == r2_key:
+            self._count("unchanged")
+            logger.debug(f"project.md for idea {idea_id} is unchanged")
+            return r2_key
 
-        r2_key = f"projects/{idea_id}/project.md"
         await storage_service.upload_content(r2_key, content)
 
-        existing_asset = crud_project_idea.project_idea.get_asset(
-            db, idea_id=idea_id, asset_type=AssetType.PROJECT_MD
-        )
-
         if existing_asset:
             existing_asset.content = content
             existing_asset.r2_path = r2_key
             existing_asset.status = "COMPLETED"
         else:
-            crud_project_idea.project_idea.create_or_update_asset(
+            await crud_project_idea.project_idea.create_or_update_asset_async(
                 db,
-                idea_id=idea_id,
+                idea_id=idea.id,
                 asset_type=AssetType.PROJECT_MD.value,
                 content=content,
                 status="COMPLETED",
                 r2_path=r2_key,
             )
 
-        db.commit()
+        await db.commit()
+        self._count("saves")
         logger.info(f"Saved project.md for idea {idea_id} to R2")
 
         return r2_key
 
+    async def save_project_md_in_background(
+        self,
+        idea_id: str,
+        project_id: str = None,
+    ) -> None:
+        """Rebuild project.md with its own session, for use as a background task."""
+        async with AsyncSessionLocal() as db:
+            try:
+                await self.save_project_md(db, idea_id, project_id)
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Failed to update project.md for idea {idea_id}: {e}")
+
+    async def request_update(self, idea_id: str, project_id: str = None) -> None:
+        """Schedule a debounced project.md save for ``idea_id``.
+
+        Requests arriving within ``PROJECT_MD_DEBOUNCE_SECONDS`` of the first are
+        folded into one save. A request that arrives while a save is running
+        schedules exactly one more afterwards, so no change is lost.
+        """
+        key = str(idea_id)
+        state = self._pending.get(key)
+        if state is not None:
+            if project_id:
+                state["project_id"] = project_id
+            state["dirty"] = True
+            self._count("coalesced")
+            return
+        state = {"project_id": project_id, "dirty": False}
+        self._pending[key] = state
+        state["task"] = asyncio.create_task(self._debounced_save(key, state))
+
+    async def _debounced_save(self, key: str, state: Dict[str, Any]) -> None:
+        try:
+            while True:
+                if self.debounce_seconds > 0:
+                    await asyncio.sleep(self.debounce_seconds)
+                state["dirty"] = False
+                await self.save_project_md_in_background(key, state["project_id"])
+                if not state["dirty"]:
+                    break
+        finally:
+            self._pending.pop(key, None)
+
+    async def flush(self) -> None:
+        """Wait for all pending debounced saves (used at shutdown)."""
+        tasks = [state["task"] for state in list(self._pending.values())]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def update_project_md_features(
         self,
-        db: Session,
+        db: AsyncSession,
         idea_id: str,
         project_id: str,
     ) -> str:
@@ -22,12 +22,15 @@ class ProjectService:
         if project_in.lead_id:
             member_ids.add(project_in.lead_id)
         
-        return crud_project.create_with_relations(
+        project = crud_project.create_with_relations(
             db,
             obj_in=project_in,
             member_ids=list(member_ids),
             team_ids=project_in.team_ids if hasattr(project_in, 'team_ids') else None
         )
+
+        # Re-fetch to load the relations the API response serializes
+        return crud_project.get(db, id=project.id)
     
     def update_project(
         self,
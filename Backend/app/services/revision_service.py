@@ -0,0 +1,314 @@
+import difflib
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer
+
+from app.core.config import settings
+from app.core.time import utc_now
+from app.crud import crud_project_idea
+from app.models.project_idea import AssetRevision, ProjectAsset
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+# Delta ops, applied in order against the previous revision's lines:
+#   ["=", n]      keep the next n lines
+#   ["-", n]      drop the next n lines
+#   ["+", lines]  insert lines
+KEEP, DROP, INSERT = "=", "-", "+"
+
+
+def _hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def make_delta(old: str, new: str) -> Tuple[list, int, int]:
+    """Return (ops, lines_added, lines_removed) turning ``old`` into ``new``."""
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    ops = []
+    added = removed = 0
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([KEEP, i2 - i1])
+            continue
+        if tag in ("delete", "replace"):
+            ops.append([DROP, i2 - i1])
+            removed += i2 - i1
+        if tag in ("insert", "replace"):
+            ops.append([INSERT, b[j1:j2]])
+            added += j2 - j1
+    return ops, added, removed
+
+
+def apply_delta(old: str, ops: list) -> str:
+    lines = old.splitlines(keepends=True)
+    out = []
+    pos = 0
+    for op, arg in ops:
+        if op == KEEP:
+            out.extend(lines[pos:pos + arg])
+            pos += arg
+        elif op == DROP:
+            pos += arg
+        elif op == INSERT:
+            out.extend(arg)
+        else:
+            raise ValueError(f"Unknown delta op {op!r}")
+    return "".join(out)
+
+
+class RevisionService:
+    """Revision history for ProjectAsset content.
+
+    Every saved version gets a row in ``asset_revisions``. Every
+    REVISION_SNAPSHOT_INTERVAL-th revision (and any revision whose delta would
+    not be meaningfully smaller than the text) is a full snapshot; the rest are
+    line deltas against their predecessor. Rebuilt revisions are immutable, so
+    they are cached in a small in-process LRU once read back from the database.
+    """
+
+    def __init__(self):
+        self._cache: OrderedDict[Tuple[str, int], str] = OrderedDict()
+        self._cache_size = settings.REVISION_CACHE_SIZE
+        self._lock = threading.Lock()
+
+    def _cache_get(self, asset_id, revision: int) -> Optional[str]:
+        key = (str(asset_id), revision)
+        with self._lock:
+            content = self._cache.get(key)
+            if content is not None:
+                self._cache.move_to_end(key)
+            return content
+
+    def _cache_put(self, asset_id, revision: int, content: str) -> None:
+        with self._lock:
+            self._cache[(str(asset_id), revision)] = content
+            self._cache.move_to_end((str(asset_id), revision))
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _lock_asset(db: Session, asset_id) -> None:
+        # Two concurrent edits of one asset would both number their revision
+        # latest + 1. Writing the asset row first makes them queue on its row
+        # lock (on SQLite, the write lock), so each reads the latest revision
+        # only once the other has committed.
+        db.execute(
+            update(ProjectAsset)
+            .where(ProjectAsset.id == asset_id)
+            .values(updated_at=utc_now())
+            .execution_options(synchronize_session=False)
+        )
+
+    def _latest(self, db: Session, asset_id) -> Optional[AssetRevision]:
+        return (
+            db.query(AssetRevision)
+            .filter(AssetRevision.asset_id == asset_id)
+            .order_by(AssetRevision.revision.desc())
+            .first()
+        )
+
+    def _add(
+        self,
+        db: Session,
+        asset_id,
+        revision: int,
+        content: str,
+        *,
+        previous: Optional[str],
+        source: Optional[str],
+        author_id=None,
+    ) -> AssetRevision:
+        kind, payload = SNAPSHOT, content
+        added = removed = 0
+        if previous is not None:
+            ops, added, removed = make_delta(previous, content)
+            if (revision - 1) % settings.REVISION_SNAPSHOT_INTERVAL:
+                delta_payload = json.dumps(ops, separators=(",", ":"))
+                if len(delta_payload) < len(content) // 2:
+                    kind, payload = DELTA, delta_payload
+        else:
+            added = len(content.splitlines())
+
+        row = AssetRevision(
+            asset_id=asset_id,
+            revision=revision,
+            kind=kind,
+            payload=payload,
+            content_hash=_hash(content),
+            content_length=len(content),
+            lines_added=added,
+            lines_removed=removed,
+            source=source,
+            author_id=author_id,
+        )
+        db.add(row)
+        db.flush()
+        return row
+
+    def record(
+        self,
+        db: Session,
+        asset: ProjectAsset,
+        content: Optional[str],
+        *,
+        source: str,
+        author_id=None,
+    ) -> Optional[AssetRevision]:
+        """Record ``content`` as the next revision of ``asset``.
+
+        Call before overwriting ``asset.content``: if the asset predates revision
+        history, its current content is saved first as a "baseline" revision.
+        Unchanged content is not recorded. Rows are flushed, not committed.
+        """
+        if content is None:
+            return None
+
+        self._lock_asset(db, asset.id)
+        latest = self._latest(db, asset.id)
+        previous = None
+        if latest:
+            if latest.content_hash == _hash(content):
+                return None
+            previous = self.get_content(db, asset.id, latest.revision)
+            next_revision = latest.revision + 1
+        elif asset.content and asset.content != content:
+            self._add(db, asset.id, 1, asset.content, previous=None, source="baseline")
+            previous = asset.content
+            next_revision = 2
+        else:
+            next_revision = 1
+
+        return self._add(
+            db,
+            asset.id,
+            next_revision,
+            content,
+            previous=previous,
+            source=source,
+            author_id=author_id,
+        )
+
+    async def save_asset_async(
+        self,
+        db: AsyncSession,
+        *,
+        idea_id,
+        asset_type,
+        content: str,
+        status,
+        r2_path: Optional[str] = None,
+        source: str,
+        author_id=None,
+    ) -> ProjectAsset:
+        """Create or overwrite an asset, recording ``content`` as its next revision."""
+        crud = crud_project_idea.project_idea
+        existing = await crud.get_asset_async(db, idea_id=idea_id, asset_type=asset_type)
+        if existing:
+            # Recorded before the content is overwritten; committed along with it
+            await db.run_sync(self.record, existing, content, source=source, author_id=author_id)
+        asset = await crud.create_or_update_asset_async(
+            db, idea_id=idea_id, asset_type=asset_type, content=content, status=status, r2_path=r2_path
+        )
+        if not existing:
+            await db.run_sync(self.record, asset, content, source=source, author_id=author_id)
+            await db.commit()
+        return asset
+
+    def list_revisions(self, db: Session, asset_id) -> List[AssetRevision]:
+        """Revision metadata, newest first, without loading payloads."""
+        return (
+            db.query(AssetRevision)
+            .options(defer(AssetRevision._payload))
+            .filter(AssetRevision.asset_id == asset_id)
+            .order_by(AssetRevision.revision.desc())
+            .all()
+        )
+
+    def get_revision(self, db: Session, asset_id, revision: int) -> Optional[AssetRevision]:
+        return (
+            db.query(AssetRevision)
+            .options(defer(AssetRevision._payload))
+            .filter(AssetRevision.asset_id == asset_id, AssetRevision.revision == revision)
+            .first()
+        )
+
+    def get_content(self, db: Session, asset_id, revision: int) -> Optional[str]:
+        """Rebuild the text of ``revision`` from the nearest snapshot at or before it."""
+        cached = self._cache_get(asset_id, revision)
+        if cached is not None:
+            return cached
+
+        base = (
+            db.query(func.max(AssetRevision.revision))
+            .filter(
+                AssetRevision.asset_id == asset_id,
+                AssetRevision.kind == SNAPSHOT,
+                AssetRevision.revision <= revision,
+            )
+            .scalar()
+        )
+        if base is None:
+            return None
+
+        chain = (
+            db.query(AssetRevision)
+            .filter(
+                AssetRevision.asset_id == asset_id,
+                AssetRevision.revision >= base,
+                AssetRevision.revision <= revision,
+            )
+            .order_by(AssetRevision.revision)
+            .all()
+        )
+        if not chain or chain[-1].revision != revision:
+            return None
+
+        content = chain[0].payload
+        for row in chain[1:]:
+            content = apply_delta(content, json.loads(row.payload))
+
+        if _hash(content) != chain[-1].content_hash:
+            logger.error(f"Revision {revision} of asset {asset_id} failed hash check after rebuild")
+            return None
+
+        self._cache_put(asset_id, revision, content)
+        return content
+
+    def diff(self, db: Session, asset_id, from_revision: int, to_revision: int) -> Optional[dict]:
+        """Unified diff plus line stats between two revisions."""
+        old = self.get_content(db, asset_id, from_revision)
+        new = self.get_content(db, asset_id, to_revision)
+        if old is None or new is None:
+            return None
+
+        _, added, removed = make_delta(old, new)
+        diff = "".join(
+            difflib.unified_diff(
+                old.splitlines(keepends=True),
+                new.splitlines(keepends=True),
+                fromfile=f"r{from_revision}",
+                tofile=f"r{to_revision}",
+            )
+        )
+        return {
+            "from_revision": from_revision,
+            "to_revision": to_revision,
+            "lines_added": added,
+            "lines_removed": removed,
+            "diff": diff,
+        }
+
+
+revision_service = RevisionService()
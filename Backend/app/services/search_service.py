@@ -0,0 +1,358 @@
+"""Full-text search over issues, features and projects.
+
+Every searchable entity has one row in ``search_documents`` holding its org,
+identifier, title and body (an issue's body is its description plus its
+comments). The rows are rewritten in the same transaction as the entities,
+from a session ``after_flush`` hook, so the index is never behind the data.
+
+Queries go to the backend's own full-text index: a weighted ``tsvector``
+(ranked with ``ts_rank_cd``, highlighted with ``ts_headline``) plus pg_trgm
+similarity on titles and identifiers for typos on Postgres, or FTS5 with
+``bm25``, ``highlight`` and ``snippet`` on SQLite. Each word of the query
+matches as a prefix on both.
+"""
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import column, delete, event, false, func, insert, inspect, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from app.models.comment import Comment
+from app.models.feature import Feature
+from app.models.issue import Issue
+from app.models.project import Project
+from app.models.search_document import SearchDocument
+from app.models.team_model import Team
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# Query words beyond this many are ignored
+MAX_QUERY_TERMS = 8
+
+# Columns whose changes rewrite an entity's search document
+_INDEXED_FIELDS = {
+    Issue: ("identifier", "title", "description", "team_id"),
+    Feature: ("identifier", "name", "problem_statement", "project_id"),
+    Project: ("name", "description", "team_id"),
+}
+_ENTITY_TYPES = {Issue: "issue", Feature: "feature", Project: "project"}
+
+# session.info key collecting entities to reindex once the flush has run
+_PENDING = "search_reindex"
+
+_fts = table("search_documents_fts", column("rowid"))
+_fts_ref = literal_column("search_documents_fts")
+_search_vector = literal_column("search_documents.search_vector")
+
+
+def query_terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())[:MAX_QUERY_TERMS]
+
+
+def _changed(obj, fields: Sequence[str]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session: Session, flush_context, instances) -> None:
+    # New objects are kept as objects: their ids are assigned by the flush
+    pending: Dict[str, set] = session.info.setdefault(_PENDING, defaultdict(set))
+    for obj in session.new:
+        if type(obj) in _ENTITY_TYPES:
+            pending[_ENTITY_TYPES[type(obj)]].add(obj)
+        elif isinstance(obj, Comment):
+            pending["issue"].add(obj)
+    for obj in session.dirty:
+        if type(obj) in _ENTITY_TYPES and _changed(obj, _INDEXED_FIELDS[type(obj)]):
+            pending[_ENTITY_TYPES[type(obj)]].add(obj.id)
+        elif isinstance(obj, Comment) and _changed(obj, ("content", "issue_id", "deleted_at")):
+            # A comment moved to another issue leaves the old one too
+            history = inspect(obj).attrs.issue_id.history
+            pending["issue"].update(i for i in (*history.deleted, obj.issue_id) if i)
+    for obj in session.deleted:
+        if type(obj) in _ENTITY_TYPES:
+            pending[_ENTITY_TYPES[type(obj)]].add(obj.id)
+        elif isinstance(obj, Comment) and obj.issue_id:
+            pending["issue"].add(obj.issue_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_changes(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    ids: Dict[str, Set[UUID]] = defaultdict(set)
+    for entity_type, items in pending.items():
+        for item in items:
+            if isinstance(item, UUID):
+                ids[entity_type].add(item)
+            elif isinstance(item, Comment):
+                if item.issue_id:
+                    ids[entity_type].add(item.issue_id)
+            elif item.id:
+                ids[entity_type].add(item.id)
+    if ids:
+        search_service.reindex(session, ids)
+
+
+class SearchService:
+    def _issue_documents(self, db: Session, ids: Iterable[UUID]) -> List[dict]:
+        rows = db.execute(
+            select(Issue.id, Issue.identifier, Issue.title, Issue.description, Team.organization_id)
+            .join(Team, Team.id == Issue.team_id)
+            .where(Issue.id.in_(ids))
+        ).all()
+        comments = defaultdict(list)
+        if rows:
+            for issue_id, content in db.execute(
+                select(Comment.issue_id, Comment.content)
+                .where(Comment.issue_id.in_([r.id for r in rows]), Comment.deleted_at.is_(None))
+                .order_by(Comment.created_at)
+            ):
+                comments[issue_id].append(content)
+        return [
+            {
+                "entity_type": "issue",
+                "entity_id": r.id,
+                "organization_id": r.organization_id,
+                "identifier": r.identifier,
+                "title": r.title,
+                "body": "\n".join([r.description or "", *comments[r.id]]).strip(),
+            }
+            for r in rows
+        ]
+
+    def _feature_documents(self, db: Session, ids: Iterable[UUID]) -> List[dict]:
+        rows = db.execute(
+            select(Feature.id, Feature.identifier, Feature.name, Feature.problem_statement, Team.organization_id)
+            .join(Project, Project.id == Feature.project_id)
+            .join(Team, Team.id == Project.team_id)
+            .where(Feature.id.in_(ids))
+        ).all()
+        return [
+            {
+                "entity_type": "feature",
+                "entity_id": r.id,
+                "organization_id": r.organization_id,
+                "identifier": r.identifier,
+                "title": r.name,
+                "body": r.problem_statement or "",
+            }
+            for r in rows
+        ]
+
+    def _project_documents(self, db: Session, ids: Iterable[UUID]) -> List[dict]:
+        rows = db.execute(
+            select(Project.id, Project.name, Project.description, Team.organization_id)
+            .join(Team, Team.id == Project.team_id)
+            .where(Project.id.in_(ids))
+        ).all()
+        return [
+            {
+                "entity_type": "project",
+                "entity_id": r.id,
+                "organization_id": r.organization_id,
+                "identifier": None,
+                "title": r.name,
+                "body": r.description or "",
+            }
+            for r in rows
+        ]
+
+    def reindex(self, db: Session, ids: Dict[str, Iterable[UUID]]) -> int:
+        """Rewrite the search documents of the given ``{entity_type: ids}``.
+
+        Entities that no longer exist lose their document. Runs on the
+        session's connection, inside its transaction.
+        """
+        builders = {
+            "issue": self._issue_documents,
+            "feature": self._feature_documents,
+            "project": self._project_documents,
+        }
+        conn = db.connection()
+        written = 0
+        for entity_type, entity_ids in ids.items():
+            entity_ids = list(entity_ids)
+            if not entity_ids:
+                continue
+            documents = builders[entity_type](db, entity_ids)
+            conn.execute(
+                delete(SearchDocument).where(
+                    SearchDocument.entity_type == entity_type,
+                    SearchDocument.entity_id.in_(entity_ids),
+                )
+            )
+            if documents:
+                conn.execute(insert(SearchDocument), documents)
+            written += len(documents)
+        return written
+
+    def rebuild(self, db: Session, batch_size: int = 500) -> int:
+        """Reindex every issue, feature and project, committing per batch; returns the documents written."""
+        models = {"issue": Issue, "feature": Feature, "project": Project}
+        written = 0
+        for entity_type, model in models.items():
+            entity_ids = db.execute(select(model.id)).scalars().all()
+            for start in range(0, len(entity_ids), batch_size):
+                written += self.reindex(db, {entity_type: entity_ids[start:start + batch_size]})
+                db.commit()
+        logger.info(f"Search index rebuilt: {written} documents")
+        return written
+
+    # -- queries ---------------------------------------------------------------
+
+    def _filters(self, organization_id: UUID, entity_types: Optional[Sequence[str]]) -> list:
+        filters = [SearchDocument.organization_id == organization_id]
+        if entity_types:
+            filters.append(SearchDocument.entity_type.in_(entity_types))
+        return filters
+
+    def _postgres_match(self, q: str, terms: List[str]):
+        tsquery = func.to_tsquery("english", " & ".join(f"{t}:*" for t in terms))
+        prefix = q.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        condition = or_(
+            _search_vector.op("@@")(tsquery),
+            SearchDocument.title.op("%")(q),
+            SearchDocument.identifier.ilike(prefix),
+        )
+        return tsquery, condition
+
+    def _sqlite_match(self, terms: List[str]):
+        expression = " ".join(f'"{t}"*' for t in terms)
+        return _fts_ref.op("MATCH")(expression)
+
+    def matching_ids(
+        self,
+        db: Session,
+        q: str,
+        entity_type: str,
+        organization_id: Optional[UUID] = None,
+    ):
+        """Subquery of the ids of ``entity_type`` entities matching ``q``, for ``IN`` filters."""
+        terms = query_terms(q)
+        filters = [SearchDocument.entity_type == entity_type]
+        if organization_id:
+            filters.append(SearchDocument.organization_id == organization_id)
+        if db.get_bind().dialect.name == "postgresql":
+            _, condition = self._postgres_match(q, terms)
+            return select(SearchDocument.entity_id).where(condition, *filters)
+        if not terms:
+            return select(SearchDocument.entity_id).where(false())
+        return (
+            select(SearchDocument.entity_id)
+            .select_from(_fts.join(SearchDocument, SearchDocument.id == _fts.c.rowid))
+            .where(self._sqlite_match(terms), *filters)
+        )
+
+    def search(
+        self,
+        db: Session,
+        q: str,
+        organization_id: UUID,
+        entity_types: Optional[Sequence[str]] = None,
+        limit: int = 20,
+    ) -> List[dict]:
+        """Best matches for ``q`` across entity types in one organization, best first.
+
+        ``title_highlight`` and ``snippet`` come with the matched words wrapped
+        in ``<mark>`` tags; everything else in them is the entity's text as
+        stored, so clients must escape it before rendering as HTML.
+        """
+        terms = query_terms(q)
+        if not terms:
+            return []
+        if db.get_bind().dialect.name == "postgresql":
+            rows = self._search_postgres(db, q, terms, organization_id, entity_types, limit)
+        else:
+            rows = self._search_sqlite(db, terms, organization_id, entity_types, limit)
+        existing = self._existing(db, rows)
+        return [
+            {
+                "type": row.entity_type,
+                "id": row.entity_id,
+                "identifier": row.identifier,
+                "title": row.title,
+                "title_highlight": row.title_highlight,
+                "snippet": row.snippet or None,
+                "score": round(float(row.score), 6),
+            }
+            for row in rows
+            if row.entity_id in existing
+        ]
+
+    def _existing(self, db: Session, rows) -> Set[UUID]:
+        """Ids among ``rows`` whose entity still exists.
+
+        Rows removed by a database-side cascade (e.g. a deleted team) skip the
+        session hook and leave their document behind until the next rebuild.
+        """
+        models = {"issue": Issue, "feature": Feature, "project": Project}
+        by_type: Dict[str, List[UUID]] = defaultdict(list)
+        for row in rows:
+            by_type[row.entity_type].append(row.entity_id)
+        existing: Set[UUID] = set()
+        for entity_type, entity_ids in by_type.items():
+            model = models[entity_type]
+            existing.update(db.execute(select(model.id).where(model.id.in_(entity_ids))).scalars())
+        return existing
+
+    def _search_postgres(self, db, q, terms, organization_id, entity_types, limit):
+        tsquery, condition = self._postgres_match(q, terms)
+        score = func.ts_rank_cd(_search_vector, tsquery) + func.greatest(
+            func.similarity(SearchDocument.title, q),
+            func.similarity(func.coalesce(SearchDocument.identifier, ""), q),
+        )
+        # Rank every match, but build headlines (the expensive part) for the page only
+        top = (
+            select(SearchDocument.id, score.label("score"))
+            .where(condition, *self._filters(organization_id, entity_types))
+            .order_by(score.desc())
+            .limit(limit)
+            .subquery()
+        )
+        options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}"
+        return db.execute(
+            select(
+                SearchDocument.entity_type,
+                SearchDocument.entity_id,
+                SearchDocument.identifier,
+                SearchDocument.title,
+                func.ts_headline("english", SearchDocument.title, tsquery, f"{options}, HighlightAll=true")
+                .label("title_highlight"),
+                func.ts_headline("english", SearchDocument.body, tsquery, f"{options}, MaxWords=30, MinWords=10")
+                .label("snippet"),
+                top.c.score,
+            )
+            .join(top, top.c.id == SearchDocument.id)
+            .order_by(top.c.score.desc())
+        ).all()
+
+    def _search_sqlite(self, db, terms, organization_id, entity_types, limit):
+        # bm25 is lower-is-better; identifier and title hits outweigh body hits
+        rank = func.bm25(_fts_ref, 10.0, 5.0, 1.0)
+        return db.execute(
+            select(
+                SearchDocument.entity_type,
+                SearchDocument.entity_id,
+                SearchDocument.identifier,
+                SearchDocument.title,
+                func.highlight(_fts_ref, 1, HIGHLIGHT_START, HIGHLIGHT_END).label("title_highlight"),
+                func.snippet(_fts_ref, 2, HIGHLIGHT_START, HIGHLIGHT_END, "…", 24).label("snippet"),
+                (-rank).label("score"),
+            )
+            .select_from(_fts.join(SearchDocument, SearchDocument.id == _fts.c.rowid))
+            .where(self._sqlite_match(terms), *self._filters(organization_id, entity_types))
+            .order_by(rank)
+            .limit(limit)
+        ).all()
+
+
+search_service = SearchService()
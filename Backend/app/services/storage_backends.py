@@ -0,0 +1,294 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from botocore.exceptions import ClientError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StorageBackendError(Exception):
+    """Raised when a storage backend operation fails."""
+
+
+class ObjectNotFound(StorageBackendError):
+    """Raised when the requested key does not exist."""
+
+
+@dataclass
+class StoredObject:
+    key: str
+    body: Optional[bytes] = None
+    content_type: Optional[str] = None
+    content_encoding: Optional[str] = None
+    metadata: Dict[str, str] = field(default_factory=dict)
+    size: int = 0
+
+
+class StorageBackend(ABC):
+    """Minimal object store interface used by StorageService."""
+
+    name = "abstract"
+
+    @abstractmethod
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        content_type: str,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> StoredObject:
+        """Return the object with its body; raises ObjectNotFound."""
+
+    @abstractmethod
+    def head(self, key: str) -> StoredObject:
+        """Return the object's attributes without the body; raises ObjectNotFound."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete ``key``; deleting a missing key is not an error."""
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.head(key)
+            return True
+        except ObjectNotFound:
+            return False
+
+
+class S3Backend(StorageBackend):
+    """S3-compatible object store (Cloudflare R2, AWS S3, MinIO)."""
+
+    name = "s3"
+
+    def __init__(self, client, bucket_name: str):
+        self.client = client
+        self.bucket_name = bucket_name
+
+    @staticmethod
+    def _translate(key: str, e: ClientError) -> StorageBackendError:
+        code = e.response.get("Error", {}).get("Code")
+        if code in ("404", "NoSuchKey", "NotFound"):
+            return ObjectNotFound(key)
+        return StorageBackendError(str(e))
+
+    def put(self, key, body, *, content_type, content_encoding=None, metadata=None):
+        extra_args = {}
+        if content_encoding:
+            extra_args["ContentEncoding"] = content_encoding
+        try:
+            self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+                Metadata=metadata or {},
+                **extra_args,
+            )
+        except ClientError as e:
+            raise self._translate(key, e) from e
+
+    def get(self, key):
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=key)
+            body = response["Body"].read()
+        except ClientError as e:
+            raise self._translate(key, e) from e
+        return StoredObject(
+            key=key,
+            body=body,
+            content_type=response.get("ContentType"),
+            content_encoding=response.get("ContentEncoding"),
+            metadata=response.get("Metadata", {}),
+            size=len(body),
+        )
+
+    def head(self, key):
+        try:
+            response = self.client.head_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            raise self._translate(key, e) from e
+        return StoredObject(
+            key=key,
+            content_type=response.get("ContentType"),
+            content_encoding=response.get("ContentEncoding"),
+            metadata=response.get("Metadata", {}),
+            size=response.get("ContentLength", 0),
+        )
+
+    def delete(self, key):
+        try:
+            self.client.delete_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            raise self._translate(key, e) from e
+
+
+class LocalFilesystemBackend(StorageBackend):
+    """Stores objects as files under ``root``.
+
+    Each object is one file: a short header (magic, then the length of a JSON
+    record with its content type, encoding and metadata) followed by the body.
+    The file is written to a temp file in the target directory and moved into
+    place with a single ``os.replace``, so readers see either the old object
+    or the new one, never a partial write or a body with another's metadata.
+    Bodies are read through ``mmap``.
+    """
+
+    name = "local"
+    MAGIC = b"LSO1"
+    _LENGTH = struct.Struct(">I")
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key.lstrip("/")).resolve()
+        if path == self.root or self.root not in path.parents:
+            raise StorageBackendError(f"Invalid storage key: {key!r}")
+        return path
+
+    @staticmethod
+    def _atomic_write(path: Path, chunks) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _read_header(self, key: str, data) -> tuple:
+        """``(meta, body offset)`` from the start of an object file (bytes or mmap)."""
+        prefix = len(self.MAGIC) + self._LENGTH.size
+        if data[:len(self.MAGIC)] != self.MAGIC or len(data) < prefix:
+            raise StorageBackendError(f"Corrupt object file for {key}")
+        (length,) = self._LENGTH.unpack(data[len(self.MAGIC):prefix])
+        try:
+            meta = json.loads(data[prefix:prefix + length])
+        except ValueError as e:
+            raise StorageBackendError(f"Corrupt object header for {key}: {e}") from e
+        return meta, prefix + length
+
+    def put(self, key, body, *, content_type, content_encoding=None, metadata=None):
+        path = self._path(key)
+        header = json.dumps({
+            "content_type": content_type,
+            "content_encoding": content_encoding,
+            "metadata": metadata or {},
+            "size": len(body),
+        }).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(path, (self.MAGIC, self._LENGTH.pack(len(header)), header, body))
+        except OSError as e:
+            raise StorageBackendError(f"Failed to write {key}: {e}") from e
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if not os.fstat(f.fileno()).st_size:
+                    raise StorageBackendError(f"Corrupt object file for {key}")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    meta, offset = self._read_header(key, mm)
+                    body = mm[offset:]
+        except FileNotFoundError:
+            raise ObjectNotFound(key)
+        except OSError as e:
+            raise StorageBackendError(f"Failed to read {key}: {e}") from e
+
+        return StoredObject(
+            key=key,
+            body=body,
+            content_type=meta.get("content_type"),
+            content_encoding=meta.get("content_encoding"),
+            metadata=meta.get("metadata", {}),
+            size=len(body),
+        )
+
+    def head(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                prefix = f.read(len(self.MAGIC) + self._LENGTH.size)
+                if len(prefix) == len(self.MAGIC) + self._LENGTH.size:
+                    prefix += f.read(self._LENGTH.unpack(prefix[len(self.MAGIC):])[0])
+                meta, offset = self._read_header(key, prefix)
+                size = os.fstat(f.fileno()).st_size - offset
+        except (FileNotFoundError, IsADirectoryError):
+            raise ObjectNotFound(key)
+        except OSError as e:
+            raise StorageBackendError(f"Failed to read {key}: {e}") from e
+
+        return StoredObject(
+            key=key,
+            content_type=meta.get("content_type"),
+            content_encoding=meta.get("content_encoding"),
+            metadata=meta.get("metadata", {}),
+            size=size,
+        )
+
+    def delete(self, key):
+        path = self._path(key)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            raise StorageBackendError(f"Failed to delete {key}: {e}") from e
+
+
+def create_backend(settings) -> Optional[StorageBackend]:
+    """Build the backend selected by ``STORAGE_BACKEND``; None when R2 is not configured."""
+    backend = (settings.STORAGE_BACKEND or "r2").lower()
+
+    if backend == "local":
+        logger.info(f"Using local filesystem storage at {settings.LOCAL_STORAGE_PATH}")
+        return LocalFilesystemBackend(settings.LOCAL_STORAGE_PATH)
+
+    if backend not in ("r2", "s3"):
+        raise ValueError(f"Unknown STORAGE_BACKEND '{settings.STORAGE_BACKEND}'")
+
+    if not all([
+        settings.R2_ACCOUNT_ID or settings.R2_ENDPOINT,
+        settings.R2_ACCESS_KEY_ID,
+        settings.R2_SECRET_ACCESS_KEY,
+        settings.R2_BUCKET_NAME,
+    ]):
+        return None
+
+    import boto3
+
+    endpoint_url = settings.R2_ENDPOINT
+    if not endpoint_url:
+        endpoint_url = f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
+
+    client = boto3.client(
+        's3',
+        endpoint_url=endpoint_url,
+        aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+        region_name="auto"
+    )
+    return S3Backend(client, settings.R2_BUCKET_NAME)
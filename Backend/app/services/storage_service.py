@@ -1,60 +1,171 @@
-import boto3
-from botocore.exceptions import ClientError
+import hashlib
+import threading
+from collections import OrderedDict
+
 from app.core.config import settings
+from app.core.compression import compress_bytes, decompress_bytes, get_codec, should_compress
+from app.services.storage_backends import (
+    ObjectNotFound,
+    StorageBackend,
+    StorageBackendError,
+    create_backend,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Object metadata key holding the SHA-256 of the uploaded payload
+CONTENT_HASH_METADATA_KEY = "sha256"
+
+
 class StorageService:
-    def __init__(self):
-        if all([
-            settings.R2_ACCOUNT_ID,
-            settings.R2_ACCESS_KEY_ID,
-            settings.R2_SECRET_ACCESS_KEY,
-            settings.R2_BUCKET_NAME,
-        ]):
-            endpoint_url = settings.R2_ENDPOINT
-            if not endpoint_url:
-                endpoint_url = f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
-
-            self.s3_client = boto3.client(
-                's3',
-                endpoint_url=endpoint_url,
-                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                region_name="auto"
-            )
-            self.bucket_name = settings.R2_BUCKET_NAME
-        else:
-            self.s3_client = None
-            self.bucket_name = None
+    def __init__(self, backend: StorageBackend | None = None):
+        self.backend = backend if backend is not None else create_backend(settings)
+        if self.backend is None:
             logger.warning("R2 credentials missing. StorageService will be disabled.")
 
-    async def upload_content(self, key: str, content: str, content_type: str = "text/markdown") -> str:
-        """Uploads text content to R2 and returns the key."""
-        if not self.s3_client:
+        # key -> sha256 of the payload we last wrote or read for that key
+        self._hash_index: OrderedDict[str, str] = OrderedDict()
+        self._hash_index_size = settings.STORAGE_HASH_INDEX_SIZE
+        self._lock = threading.Lock()
+        self._stats = {
+            "puts": 0,
+            "bytes_written": 0,
+            "skipped_puts": 0,
+            "bytes_saved": 0,
+        }
+
+    @staticmethod
+    def content_hash(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()
+
+    def _remember_hash(self, key: str, digest: str) -> None:
+        with self._lock:
+            self._hash_index[key] = digest
+            self._hash_index.move_to_end(key)
+            while len(self._hash_index) > self._hash_index_size:
+                self._hash_index.popitem(last=False)
+
+    def _stored_hash(self, key: str) -> str | None:
+        """Return the hash of the object currently stored under ``key``.
+
+        Checks the in-process index first and falls back to the object's
+        metadata (a HEAD is much cheaper than re-uploading the body).
+        """
+        with self._lock:
+            digest = self._hash_index.get(key)
+        if digest:
+            return digest
+
+        try:
+            head = self.backend.head(key)
+        except StorageBackendError:
+            return None
+
+        digest = head.metadata.get(CONTENT_HASH_METADATA_KEY)
+        if digest:
+            self._remember_hash(key, digest)
+        return digest
+
+    def _record(self, *, written: int = 0, saved: int = 0) -> None:
+        with self._lock:
+            if written:
+                self._stats["puts"] += 1
+                self._stats["bytes_written"] += written
+            if saved:
+                self._stats["skipped_puts"] += 1
+                self._stats["bytes_saved"] += saved
+
+    def get_stats(self) -> dict:
+        """Write counters since process start, including what deduplication saved."""
+        with self._lock:
+            return dict(self._stats)
+
+    async def upload_content(
+        self,
+        key: str,
+        content: str,
+        content_type: str = "text/markdown",
+        force: bool = False,
+    ) -> str:
+        """Uploads text content to the configured backend and returns the key.
+
+        The PUT is skipped when the object stored under ``key`` already has the
+        same content hash, unless ``force`` is set. Large payloads are stored
+        compressed with a matching ``Content-Encoding``.
+        """
+        return await self.upload_bytes(key, content.encode('utf-8'), content_type, force=force)
+
+    async def upload_bytes(
+        self,
+        key: str,
+        body: bytes,
+        content_type: str,
+        force: bool = False,
+        compress: bool = True,
+    ) -> str:
+        """Binary variant of :meth:`upload_content`. Pass ``compress=False`` for
+        payloads that are already compressed (zip containers such as .docx)."""
+        if not self.backend:
             logger.error("Attempted to upload to R2 but client is not initialized.")
             return key # Return key anyway for local mock behavior if needed
 
+        digest = self.content_hash(body)
+
+        if not force and self._stored_hash(key) == digest:
+            self._record(saved=len(body))
+            logger.debug(f"Skipped R2 upload of unchanged object {key} ({len(body)} bytes)")
+            return key
+
+        content_encoding = None
+        if compress and should_compress(len(body)):
+            content_encoding = get_codec()
+            body = compress_bytes(body, content_encoding)
+
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=key,
-                Body=content.encode('utf-8'),
-                ContentType=content_type
+            self.backend.put(
+                key,
+                body,
+                content_type=content_type,
+                content_encoding=content_encoding,
+                metadata={CONTENT_HASH_METADATA_KEY: digest},
             )
+            self._remember_hash(key, digest)
+            self._record(written=len(body))
             return key
-        except ClientError as e:
-            logger.error(f"Error uploading to R2: {e}")
+        except StorageBackendError as e:
+            logger.error(f"Error uploading to {self.backend.name} storage: {e}")
             raise e
 
     async def get_content(self, key: str) -> str:
-        """Retrieves text content from R2."""
+        """Retrieves text content from the configured backend."""
+        return (await self.get_bytes(key)).decode('utf-8')
+
+    async def get_bytes(self, key: str) -> bytes:
+        """Retrieves an object's body, decompressed if it was stored compressed."""
+        if not self.backend:
+            raise StorageBackendError("Storage is not configured")
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
-            return response['Body'].read().decode('utf-8')
-        except ClientError as e:
-            logger.error(f"Error reading from R2: {e}")
+            obj = self.backend.get(key)
+        except ObjectNotFound:
+            raise
+        except StorageBackendError as e:
+            logger.error(f"Error reading from {self.backend.name} storage: {e}")
             raise e
 
+        body = obj.body
+        if obj.content_encoding:
+            body = decompress_bytes(body, obj.content_encoding)
+        digest = obj.metadata.get(CONTENT_HASH_METADATA_KEY)
+        if digest:
+            self._remember_hash(key, digest)
+        return body
+
+    async def delete(self, key: str) -> None:
+        if not self.backend:
+            return
+        self.backend.delete(key)
+        with self._lock:
+            self._hash_index.pop(key, None)
+
 storage_service = StorageService()
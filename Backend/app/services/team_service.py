@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from app.core.unit_of_work import unit_of_work
 from app.crud import (
     team as crud_team,
     user_role as crud_role,
@@ -52,74 +53,74 @@ class TeamService:
             name=team_in.name,
             identifier=identifier,
         )
-        db.add(team)
-        db.commit()
-
-        # 3. Add Leaders
-        leaders_added = []
-        if team_in.leader_ids:
-            for l_id in team_in.leader_ids:
-                leader = crud_user.get(db, id=l_id)
-                if leader:
-                    # VALIDATION: Member can't be team leader
-                    if leader.role == "member":
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"User {leader.email} has 'member' role and cannot be a team leader",
-                        )
-                    team.leaders.append(leader)
-                    team.members.append(leader)
-                    leaders_added.append(l_id)
-
-                    # Notify leader
-                    if str(l_id) != str(user_id):
-                        notification_service.notify_user(
-                            db,
-                            recipient_id=l_id,
-                            type=NotificationType.TEAM_INVITE,
-                            title="Added as Team Leader",
-                            content=f"You have been added as a leader of team '{team.name}'",
-                            actor_id=user_id,
-                            target_id=str(team.id),
-                            target_type="team",
-                        )
-        else:
-            # Default to creator
-            creator = crud_user.get(db, id=user_id)
-            if creator:
-                # VALIDATION: Member can't be team leader
-                if creator.role == "member":
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Users with 'member' role cannot be team leaders",
-                    )
-                team.leaders.append(creator)
-                team.members.append(creator)
-                leaders_added.append(user_id)
-
-        # 4. Add other members
-        if team_in.member_ids:
-            for m_id in team_in.member_ids:
-                if m_id not in leaders_added:
-                    member = crud_user.get(db, id=m_id)
-                    if member:
-                        team.members.append(member)
+        # The team, its people and their notifications commit together
+        with unit_of_work(db):
+            db.add(team)
+            # Notifications below reference the team's id
+            db.flush()
+
+            # 3. Add Leaders
+            leaders_added = []
+            if team_in.leader_ids:
+                for l_id in team_in.leader_ids:
+                    leader = crud_user.get(db, id=l_id)
+                    if leader:
+                        # VALIDATION: Member can't be team leader
+                        if leader.role == "member":
+                            raise HTTPException(
+                                status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"User {leader.email} has 'member' role and cannot be a team leader",
+                            )
+                        team.leaders.append(leader)
+                        team.members.append(leader)
+                        leaders_added.append(l_id)
 
-                        # Notify member
-                        if str(m_id) != str(user_id):
+                        # Notify leader
+                        if str(l_id) != str(user_id):
                             notification_service.notify_user(
                                 db,
-                                recipient_id=m_id,
+                                recipient_id=l_id,
                                 type=NotificationType.TEAM_INVITE,
-                                title="Invited to Team",
-                                content=f"You have been added to team '{team.name}'",
+                                title="Added as Team Leader",
+                                content=f"You have been added as a leader of team '{team.name}'",
                                 actor_id=user_id,
                                 target_id=str(team.id),
                                 target_type="team",
                             )
-
-        db.commit()
-        db.refresh(team)
+            else:
+                # Default to creator
+                creator = crud_user.get(db, id=user_id)
+                if creator:
+                    # VALIDATION: Member can't be team leader
+                    if creator.role == "member":
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Users with 'member' role cannot be team leaders",
+                        )
+                    team.leaders.append(creator)
+                    team.members.append(creator)
+                    leaders_added.append(user_id)
+
+            # 4. Add other members
+            if team_in.member_ids:
+                for m_id in team_in.member_ids:
+                    if m_id not in leaders_added:
+                        member = crud_user.get(db, id=m_id)
+                        if member:
+                            team.members.append(member)
+
+                            # Notify member
+                            if str(m_id) != str(user_id):
+                                notification_service.notify_user(
+                                    db,
+                                    recipient_id=m_id,
+                                    type=NotificationType.TEAM_INVITE,
+                                    title="Invited to Team",
+                                    content=f"You have been added to team '{team.name}'",
+                                    actor_id=user_id,
+                                    target_id=str(team.id),
+                                    target_type="team",
+                                )
 
         # Sync members with projects
         project_service.sync_team_members(db, team_id=team.id)
@@ -199,7 +200,6 @@ class TeamService:
 
         db.add(team)
         db.commit()
-        db.refresh(team)
 
         # Sync members with projects
         project_service.sync_team_members(db, team_id=team_id)
@@ -250,7 +250,12 @@ class TeamService:
             source_features = (
                 db.query(Feature).filter(Feature.project_id == s_project.id).all()
             )
-            for s_feature in source_features:
+            feature_identifiers = crud_feature.reserve_identifiers(
+                db, target_team.identifier, len(source_features)
+            )
+            for s_feature, feature_identifier in zip(
+                source_features, feature_identifiers
+            ):
                 new_feature = Feature(
                     project_id=new_project.id,
                     name=s_feature.name,
@@ -262,9 +267,7 @@ class TeamService:
                     status=s_feature.status,
                     health=s_feature.health,
                     owner_id=user_id,
-                    identifier=crud_feature.get_next_identifier(
-                        db, target_team.identifier
-                    ),
+                    identifier=feature_identifier,
                 )
                 db.add(new_feature)
                 db.flush()
@@ -279,12 +282,11 @@ class TeamService:
                     .all()
                 )
 
-                for s_issue in source_issues:
-                    # Generate new identifier for target team
-                    identifier = crud_issue.get_next_identifier(
-                        db, prefix=target_team.identifier
-                    )
-
+                # New identifiers for the target team, one block per feature
+                issue_identifiers = crud_issue.reserve_identifiers(
+                    db, target_team.identifier, len(source_issues)
+                )
+                for s_issue, identifier in zip(source_issues, issue_identifiers):
                     new_issue = Issue(
                         identifier=identifier,
                         title=s_issue.title,
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, or_
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.markdown_sections import Section, single_changed_section
+from app.core.database import SessionLocal
+from app.core.time import utc_now
+from app.models.document import Document
+from app.models.enums import AssetStatus, AssetType, MirrorStatus
+from app.models.project_idea import ProjectAsset
+from app.services.ai_service import DOC_ORDER
+from app.services.conversion_service import conversion_service
+from app.services.document_service import document_service
+
+logger = logging.getLogger(__name__)
+
+MIRRORED_TYPES = [AssetType(t) for t in DOC_ORDER]
+
+# How long a claimed asset stays IN_PROGRESS before another run may retake it
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def section_patch(content: str, section: Section) -> Optional[dict]:
+    """Describe an edit of ``section`` for :func:`mark_for_mirror`, or None if it
+    cannot be mirrored as a range edit (it has subsections of its own)."""
+    if section.has_subsections:
+        return None
+    return {"title": section.title, "level": section.level, "body": section.body(content)}
+
+
+def patch_for_edit(old: Optional[str], new: str) -> Optional[dict]:
+    """:func:`section_patch` for an edit confined to one section of ``old``, else None."""
+    if not old:
+        return None
+    section = single_changed_section(old, new)
+    return section_patch(new, section) if section else None
+
+
+def mark_for_mirror(asset: ProjectAsset, patch: Optional[dict] = None) -> None:
+    """Queue ``asset`` for (re)mirroring to Google Docs; the caller commits.
+
+    ``patch`` (from :func:`section_patch`) lets the mirror apply a single-section
+    edit in place. It only survives if the Doc is otherwise up to date, or the
+    pending change was to the same section; anything else falls back to a full sync.
+    """
+    if asset.asset_type not in MIRRORED_TYPES:
+        return
+    unsynced = asset.mirror_status in (MirrorStatus.PENDING, MirrorStatus.IN_PROGRESS, MirrorStatus.FAILED)
+    previous = asset.mirror_patch
+    if patch is not None and unsynced and (
+        previous is None or (previous["title"], previous["level"]) != (patch["title"], patch["level"])
+    ):
+        patch = None
+    if not settings.DRIVE_MIRROR_SECTION_PATCHES:
+        patch = None
+    asset.mirror_patch = patch
+    asset.mirror_status = MirrorStatus.PENDING
+    asset.mirror_attempts = 0
+    asset.mirror_error = None
+    asset.mirror_next_attempt_at = None
+
+
+def _doc_title(asset: ProjectAsset) -> str:
+    idea = asset.project_idea
+    name = idea.project.name if idea.project else idea.raw_input[:30]
+    return f"{name} - {asset.asset_type.value.replace('_', ' ').title()}"
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(30 * 2 ** attempts, 3600))
+
+
+def _take(db, asset_id, status: MirrorStatus, lease, new_lease) -> bool:
+    """Conditionally move one candidate to IN_PROGRESS until ``new_lease``.
+
+    Matching the status *and* the lease that were read means only one concurrent
+    run can win each asset, including an IN_PROGRESS one whose lease expired.
+    """
+    won = db.query(ProjectAsset).filter(
+        ProjectAsset.id == asset_id,
+        ProjectAsset.mirror_status == status,
+        ProjectAsset.mirror_next_attempt_at == lease,
+    ).update(
+        {
+            ProjectAsset.mirror_status: MirrorStatus.IN_PROGRESS,
+            ProjectAsset.mirror_next_attempt_at: new_lease,
+        },
+        synchronize_session=False,
+    )
+    return bool(won)
+
+
+def _claim(db, asset_ids: Optional[Iterable] = None, limit: int = None) -> List[ProjectAsset]:
+    """Atomically move due assets to IN_PROGRESS and return the ones this run owns.
+
+    The lease each claimed asset was given is its ``mirror_next_attempt_at``;
+    the run's outcome is only recorded while that lease is still the current one.
+    """
+    now = utc_now()
+    due = or_(
+        ProjectAsset.mirror_status == MirrorStatus.PENDING,
+        and_(
+            ProjectAsset.mirror_status == MirrorStatus.FAILED,
+            ProjectAsset.mirror_attempts < settings.DRIVE_MIRROR_MAX_ATTEMPTS,
+            ProjectAsset.mirror_next_attempt_at <= now,
+        ),
+        and_(
+            ProjectAsset.mirror_status == MirrorStatus.IN_PROGRESS,
+            ProjectAsset.mirror_next_attempt_at <= now,
+        ),
+    )
+    query = db.query(
+        ProjectAsset.id, ProjectAsset.mirror_status, ProjectAsset.mirror_next_attempt_at
+    ).filter(
+        due,
+        ProjectAsset.status == AssetStatus.COMPLETED,
+        ProjectAsset.asset_type.in_(MIRRORED_TYPES),
+    )
+    if asset_ids is not None:
+        query = query.filter(ProjectAsset.id.in_(list(asset_ids)))
+    candidates = query.order_by(ProjectAsset.updated_at).limit(
+        limit or settings.DRIVE_MIRROR_BATCH_SIZE
+    ).all()
+
+    claimed = []
+    for asset_id, status, lease in candidates:
+        if _take(db, asset_id, status, lease, now + CLAIM_LEASE):
+            claimed.append(asset_id)
+    db.commit()
+
+    if not claimed:
+        return []
+    return db.query(ProjectAsset).filter(ProjectAsset.id.in_(claimed)).all()
+
+
+@dataclass(frozen=True)
+class MirrorJob:
+    """What mirroring one claimed asset needs, read up front so no ORM state
+    (or lazy load) crosses into the async part of the run."""
+    asset_id: uuid.UUID
+    lease: datetime
+    attempts: int
+    content: str
+    patch: Optional[dict]
+    r2_path: Optional[str]
+    existing_drive_file_id: Optional[str]
+    title: str
+    owner_email: Optional[str]
+    project_id: Optional[uuid.UUID]
+    idea_id: uuid.UUID
+
+
+def _claim_jobs(asset_ids: Optional[Iterable], limit: Optional[int]) -> List[MirrorJob]:
+    """Claim due assets and read their mirror jobs (sync; run in the threadpool)."""
+    with SessionLocal() as db:
+        assets = _claim(db, asset_ids, limit)
+        if not assets:
+            return []
+        existing = {
+            doc.r2_path: doc.drive_file_id
+            for doc in db.query(Document).filter(
+                Document.r2_path.in_([a.r2_path for a in assets if a.r2_path])
+            )
+        }
+        jobs = []
+        for asset in assets:
+            idea = asset.project_idea
+            jobs.append(MirrorJob(
+                asset_id=asset.id,
+                lease=asset.mirror_next_attempt_at,
+                attempts=asset.mirror_attempts or 0,
+                content=asset.content or "",
+                patch=asset.mirror_patch,
+                r2_path=asset.r2_path,
+                existing_drive_file_id=existing.get(asset.r2_path),
+                title=_doc_title(asset),
+                owner_email=idea.user.email if idea.user else None,
+                project_id=idea.project_id,
+                idea_id=idea.id,
+            ))
+        return jobs
+
+
+async def _mirror_one(job: MirrorJob) -> Optional[str]:
+    """Create or update the Google Doc for ``job``; returns the new Doc's id if one was created."""
+    if job.existing_drive_file_id:
+        patch = job.patch
+        if patch and await document_service.replace_doc_section(
+            job.existing_drive_file_id, patch["title"], patch["level"], patch["body"]
+        ):
+            return None
+        html = await conversion_service.markdown_to_html(job.content)
+        await document_service.update_google_doc_html(job.existing_drive_file_id, html)
+        return None
+
+    return await document_service.create_google_doc(job.title, job.content, user_email=job.owner_email)
+
+
+def _set_outcome(db, job: MirrorJob, values: dict) -> bool:
+    # If the content changed mid-flight the asset is PENDING again; leave it queued.
+    # If the lease expired and another run took the asset over, that run records it.
+    return bool(db.query(ProjectAsset).filter(
+        ProjectAsset.id == job.asset_id,
+        ProjectAsset.mirror_status == MirrorStatus.IN_PROGRESS,
+        ProjectAsset.mirror_next_attempt_at == job.lease,
+    ).update(values, synchronize_session=False))
+
+
+def _failure_values(job: MirrorJob, error: Exception) -> dict:
+    attempts = job.attempts + 1
+    logger.warning(f"Mirroring asset {job.asset_id} to Drive failed (attempt {attempts}): {error}")
+    return {
+        ProjectAsset.mirror_status: MirrorStatus.FAILED,
+        ProjectAsset.mirror_attempts: attempts,
+        ProjectAsset.mirror_error: str(error)[:500],
+        ProjectAsset.mirror_next_attempt_at: utc_now() + _retry_delay(attempts),
+    }
+
+
+def _record_outcome(job: MirrorJob, result) -> bool:
+    """Commit one asset's outcome in its own transaction; returns whether it synced.
+
+    A result that can't be saved (e.g. the Document row clashes with an existing
+    one) is recorded as a failure of that asset alone.
+    """
+    with SessionLocal() as db:
+        if isinstance(result, Exception):
+            _set_outcome(db, job, _failure_values(job, result))
+            db.commit()
+            return False
+        try:
+            if result is not None:
+                db.add(Document(
+                    project_id=job.project_id,
+                    idea_id=job.idea_id,
+                    drive_file_id=result,
+                    r2_path=job.r2_path,
+                    title=job.title,
+                ))
+            _set_outcome(db, job, {
+                ProjectAsset.mirror_status: MirrorStatus.SYNCED,
+                ProjectAsset.mirror_patch: None,
+                ProjectAsset.mirror_attempts: 0,
+                ProjectAsset.mirror_error: None,
+                ProjectAsset.mirror_next_attempt_at: None,
+                ProjectAsset.mirrored_at: utc_now(),
+            })
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            _set_outcome(db, job, _failure_values(job, e))
+            db.commit()
+            return False
+
+
+async def mirror_pending_assets(asset_ids: Optional[Iterable] = None, limit: int = None) -> dict:
+    """Mirror due assets to Google Docs concurrently and record per-asset status.
+
+    ``asset_ids`` restricts the run to specific assets (used to kick the pipeline
+    right after a document is generated); otherwise any due asset is picked up.
+    Database work runs in the threadpool, so the event loop (this also runs as a
+    request's background task) never waits on a connection or the SQLite writer queue.
+    """
+    if not document_service.enabled:
+        return {"claimed": 0, "synced": 0, "failed": 0}
+
+    try:
+        jobs = await run_in_threadpool(_claim_jobs, asset_ids, limit)
+    except Exception as e:
+        logger.error(f"Error claiming assets for the Drive mirror: {e}")
+        return {"claimed": 0, "synced": 0, "failed": 0}
+    if not jobs:
+        return {"claimed": 0, "synced": 0, "failed": 0}
+
+    results = await asyncio.gather(*[_mirror_one(job) for job in jobs], return_exceptions=True)
+
+    synced = failed = 0
+    for job, result in zip(jobs, results):
+        try:
+            ok = await run_in_threadpool(_record_outcome, job, result)
+        except Exception as e:
+            # Left IN_PROGRESS; the claim lease expires and another run retries it
+            logger.error(f"Recording the Drive mirror outcome of asset {job.asset_id} failed: {e}")
+            ok = False
+        synced += ok
+        failed += not ok
+
+    logger.info(f"Drive mirror run: {len(jobs)} claimed, {synced} synced, {failed} failed")
+    return {"claimed": len(jobs), "synced": synced, "failed": failed}
+
+
+def run_mirror_task():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(mirror_pending_assets())
+    finally:
+        loop.close()
@@ -1,53 +1,27 @@
 import logging
 import asyncio
+from datetime import timedelta
 from app.core.time import utc_now
 from app.core.database import SessionLocal
 from app.models.document import Document
 from app.models.user import User
 from app.services.document_service import document_service
-from app.core.encryption import decrypt_token
+from app.services.storage_service import storage_service
+from app.services.google_credentials import google_credentials
 
 logger = logging.getLogger(__name__)
 
 
 def refresh_google_token(user: User) -> bool:
-    """Refresh a user's Google OAuth token if it has expired."""
-    if not user.google_refresh_token or not user.google_token_expires_at:
-        return False
-
-    if utc_now() < user.google_token_expires_at:
-        return True  # Token is still valid
-
-    # Token has expired — try to refresh
-    try:
-        import requests
-        from app.core.config import settings
+    """Ensure a user's Google OAuth token is valid, refreshing it if it has expired.
 
-        refresh_token = decrypt_token(user.google_refresh_token)
-        if not refresh_token:
-            logger.error(f"Cannot refresh token for user {user.id}: decryption failed")
-            return False
-
-        data = {
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "client_secret": settings.GOOGLE_CLIENT_SECRET,
-            "refresh_token": refresh_token,
-            "grant_type": "refresh_token",
-        }
-        resp = requests.post("https://oauth2.googleapis.com/token", data=data)
-        resp.raise_for_status()
-        tokens = resp.json()
-
-        from app.core.encryption import encrypt_token
-
-        user.google_access_token = encrypt_token(tokens.get("access_token"))
-        if tokens.get("expires_in"):
-            from datetime import timedelta
-            user.google_token_expires_at = utc_now() + timedelta(seconds=tokens["expires_in"])
-        return True
-    except Exception as e:
-        logger.error(f"Failed to refresh Google token for user {user.id}: {e}")
+    Tokens come from the shared credential cache, which renews them in the
+    background ahead of expiry, so this is normally a cache hit.
+    """
+    if not user.google_refresh_token or not user.google_token_expires_at:
         return False
+    creds = google_credentials.get(user)
+    return bool(creds and not creds.expires_within(timedelta(0)))
 
 
 async def sync_all_documents_to_r2():
@@ -56,15 +30,26 @@ async def sync_all_documents_to_r2():
     try:
         documents = db.query(Document).all()
         logger.info(f"Starting background sync for {len(documents)} documents at {utc_now()}")
+        stats_before = storage_service.get_stats()
 
+        # Docs are exported concurrently, each call under its own timeout
+        outcome = await document_service.sync_docs_to_r2(
+            [(doc.drive_file_id, doc.r2_path) for doc in documents]
+        )
         for doc in documents:
-            try:
-                await document_service.sync_doc_to_r2(doc.drive_file_id, doc.r2_path)
+            error = outcome.get(doc.drive_file_id)
+            if error:
+                logger.error(f"Failed to sync doc {doc.id} ({doc.title}): {error}")
+            else:
                 logger.debug(f"Synced doc {doc.id} ({doc.title})")
-            except Exception as e:
-                logger.error(f"Failed to sync doc {doc.id} ({doc.title}): {e}")
 
-        logger.info(f"Background sync completed at {utc_now()}")
+        stats_after = storage_service.get_stats()
+        logger.info(
+            f"Background sync completed at {utc_now()}: "
+            f"{stats_after['skipped_puts'] - stats_before['skipped_puts']} unchanged uploads skipped, "
+            f"{stats_after['bytes_saved'] - stats_before['bytes_saved']} bytes saved, "
+            f"Google API: {document_service.get_metrics()}"
+        )
     except Exception as e:
         logger.error(f"Error in background sync task: {e}")
     finally:
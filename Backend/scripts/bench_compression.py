@@ -0,0 +1,106 @@
+"""Benchmark document compression: size reduction and CPU cost.
+
+Usage:
+    python -m scripts.bench_compression [DOCS_DIR] [--iterations N]
+
+Reads every ``*.md`` file in DOCS_DIR, or synthesizes 20/40/60 KB markdown
+documents shaped like our generated docs when no directory is given.
+"""
+import argparse
+import base64
+import gzip
+import random
+import statistics
+import time
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+WORDS = (
+    "user project feature api endpoint database schema frontend backend auth "
+    "token session request response latency metric milestone deliverable risk "
+    "component layout responsive accessibility validation error handling "
+    "deployment pipeline monitoring onboarding dashboard notification"
+).split()
+
+
+def synthesize_doc(target_bytes: int, seed: int) -> str:
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    section = 1
+    while size < target_bytes:
+        block = [f"## {section}. {' '.join(rng.choices(WORDS, k=3)).title()}\n"]
+        for _ in range(rng.randint(2, 4)):
+            block.append(" ".join(rng.choices(WORDS, k=rng.randint(30, 60))).capitalize() + ".\n")
+        block.append("| Item | Owner | Status |\n|------|-------|--------|\n")
+        for _ in range(rng.randint(3, 6)):
+            block.append(f"| {rng.choice(WORDS)} | {rng.choice(WORDS)} | {rng.choice(['todo', 'done', 'in progress'])} |\n")
+        block.append("\n".join(f"- {' '.join(rng.choices(WORDS, k=8))}" for _ in range(5)) + "\n\n")
+        text = "\n".join(block)
+        parts.append(text)
+        size += len(text.encode("utf-8"))
+        section += 1
+    return "".join(parts)
+
+
+def load_corpus(docs_dir: str | None) -> list[tuple[str, bytes]]:
+    if docs_dir:
+        return [(p.name, p.read_bytes()) for p in sorted(Path(docs_dir).glob("*.md"))]
+    return [
+        (f"synthetic-{kb}kb.md", synthesize_doc(kb * 1024, seed=kb).encode("utf-8"))
+        for kb in (20, 40, 60)
+    ]
+
+
+def codecs():
+    yield "gzip-1", lambda d: gzip.compress(d, 1, mtime=0), gzip.decompress
+    yield "gzip-6", lambda d: gzip.compress(d, 6, mtime=0), gzip.decompress
+    yield "gzip-9", lambda d: gzip.compress(d, 9, mtime=0), gzip.decompress
+    if zstandard is not None:
+        for level in (3, 10):
+            cctx = zstandard.ZstdCompressor(level=level)
+            dctx = zstandard.ZstdDecompressor()
+            yield f"zstd-{level}", cctx.compress, dctx.decompress
+
+
+def timed(fn, arg, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("docs_dir", nargs="?")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.docs_dir)
+    if not corpus:
+        raise SystemExit("No .md files found")
+    if zstandard is None:
+        print("zstandard not installed; skipping zstd codecs\n")
+
+    header = f"{'document':<24}{'codec':<9}{'raw KB':>8}{'stored KB':>11}{'column KB':>11}{'ratio':>7}{'comp ms':>9}{'decomp ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for name, data in corpus:
+        for codec, compress, decompress in codecs():
+            packed = compress(data)
+            column = len(base64.b64encode(packed))
+            print(
+                f"{name[:23]:<24}{codec:<9}{len(data) / 1024:>8.1f}{len(packed) / 1024:>11.1f}"
+                f"{column / 1024:>11.1f}{len(data) / len(packed):>7.2f}"
+                f"{timed(compress, data, args.iterations):>9.3f}{timed(decompress, packed, args.iterations):>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
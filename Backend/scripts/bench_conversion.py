@@ -0,0 +1,139 @@
+"""Benchmark document conversions: per-document cost and event-loop impact.
+
+Usage:
+    python -m scripts.bench_conversion [DOCS_DIR] [--iterations N]
+                                       [--concurrency N] [--workers N]
+
+Reads every ``*.md``, ``*.docx`` and ``*.html`` file in DOCS_DIR (e.g. a
+folder of exported project docs), or synthesizes 20/60/200 KB documents
+shaped like our generated docs when no directory is given.
+
+For each document the script reports the median in-process time of every
+conversion that applies to it. It then runs each conversion CONCURRENCY at a
+time through the conversion service, once in-process (workers=0, the old
+behaviour) and once on the process pool. For both runs it reports wall time
+and the worst event-loop stall, measured by a 5 ms ticker.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from app.services import conversion_service as conv
+from scripts.bench_compression import synthesize_doc
+
+
+def load_corpus(docs_dir: str | None) -> list[tuple[str, str, bytes]]:
+    """Returns (name, kind, payload) with kind one of md/docx/html."""
+    if docs_dir:
+        corpus = []
+        for path in sorted(Path(docs_dir).iterdir()):
+            kind = path.suffix.lstrip(".").lower()
+            if kind in ("md", "docx", "html"):
+                corpus.append((path.name, kind, path.read_bytes()))
+        return corpus
+
+    corpus = []
+    for kb in (20, 60, 200):
+        text = synthesize_doc(kb * 1024, seed=kb)
+        corpus.append((f"synthetic-{kb}kb.md", "md", text.encode("utf-8")))
+        corpus.append((f"synthetic-{kb}kb.html", "html", conv._markdown_to_html(text).encode("utf-8")))
+        corpus.append((f"synthetic-{kb}kb.docx", "docx", conv._markdown_to_docx(text, f"synthetic {kb}kb")))
+    return corpus
+
+
+def operations(kind: str, payload: bytes):
+    """(label, worker fn, args, service coroutine factory) for each conversion of ``kind``."""
+    service = conv.conversion_service
+    if kind == "md":
+        text = payload.decode("utf-8")
+        yield "md->html", conv._markdown_to_html, (text,), lambda: service.markdown_to_html(text)
+        yield "md->docx", conv._markdown_to_docx, (text, "bench"), lambda: service.markdown_to_docx(text, "bench")
+    elif kind == "html":
+        yield "html->md", conv._html_to_markdown, (payload,), lambda: service.html_to_markdown(payload)
+    elif kind == "docx":
+        yield "docx->md", conv._docx_to_markdown, (payload,), lambda: service.docx_to_markdown(payload)
+        yield "docx->html+md", conv._docx_to_html_and_markdown, (payload,), lambda: service.docx_to_html_and_markdown(payload)
+
+
+def timed(fn, args, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def _under_load(make_coro, concurrency: int) -> tuple[float, float]:
+    """Run ``concurrency`` conversions at once; returns (wall ms, worst loop stall ms)."""
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        interval = 0.005
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            stall = max(stall, time.perf_counter() - start - interval)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*[make_coro() for _ in range(concurrency)])
+    wall = time.perf_counter() - start
+    done = True
+    await tick
+    return wall * 1000, stall * 1000
+
+
+async def run_concurrent(corpus, concurrency: int, workers: int):
+    service = conv.conversion_service
+    service.inline_max_bytes = 0
+    print(f"\n{concurrency} concurrent conversions per document")
+    header = f"{'document':<26}{'op':<15}{'inline ms':>11}{'stall ms':>10}{'pool ms':>10}{'stall ms':>10}"
+    print(header)
+    print("-" * len(header))
+
+    # Start the pool before timing so worker spawn-up is not counted
+    service.workers = workers
+    await service.markdown_to_html("# warm up")
+    for name, kind, payload in corpus:
+        for label, _, _, make_coro in operations(kind, payload):
+            service.workers = 0
+            inline_wall, inline_stall = await _under_load(make_coro, concurrency)
+            service.workers = workers
+            pool_wall, pool_stall = await _under_load(make_coro, concurrency)
+            print(
+                f"{name[:25]:<26}{label:<15}{inline_wall:>11.1f}{inline_stall:>10.1f}"
+                f"{pool_wall:>10.1f}{pool_stall:>10.1f}"
+            )
+    service.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("docs_dir", nargs="?")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=conv.settings.CONVERSION_WORKERS or 2)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.docs_dir)
+    if not corpus:
+        raise SystemExit("No .md, .docx or .html files found")
+
+    header = f"{'document':<26}{'KB':>8}  {'op':<15}{'median ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, kind, payload in corpus:
+        for label, fn, fn_args, _ in operations(kind, payload):
+            print(f"{name[:25]:<26}{len(payload) / 1024:>8.1f}  {label:<15}{timed(fn, fn_args, args.iterations):>10.2f}")
+
+    asyncio.run(run_concurrent(corpus, args.concurrency, args.workers))
+
+
+if __name__ == "__main__":
+    main()
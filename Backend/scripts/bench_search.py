@@ -0,0 +1,149 @@
+"""Benchmark issue search: substring ILIKE scan vs the full-text index.
+
+Usage:
+    python -m scripts.bench_search [--issues N] [--comments-per-issue N]
+                                   [--queries N]
+
+Seeds one organization with ``--issues`` issues (random titles and
+descriptions plus comments) in a throwaway SQLite file with the SQLite
+profile, then times the same queries three ways:
+
+* ilike:  ``title ILIKE '%q%' OR identifier ILIKE '%q%'``, the old
+  ``/issues?search=`` filter (titles and identifiers only);
+* filter: ``/issues?search=`` through ``search_service.matching_ids``
+  (title, description and comments);
+* search: ``search_service.search``, ranked and highlighted, as ``/search``.
+
+Each query is one of the seeded rare words, each found in about 1% of the
+issues. Seeding also reports the cost of keeping the index current: issues
+per second with the session hook writing their search documents.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, or_, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.sqlite import analyze, configure_sqlite_engine
+from app.models import Comment, Feature, Issue, Organization, Project, Team, User
+from app.services.search_service import search_service
+
+COMMON_WORDS = (
+    "login page error timeout user account billing invoice report export dashboard "
+    "chart filter sort mobile layout button modal email notification sync upload"
+).split()
+
+
+def word_pool(rng: random.Random, size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(5, 9))) for _ in range(size)]
+
+
+def sentence(rng: random.Random, rare: list[str], words: int) -> str:
+    return " ".join(rng.choice(rare) if rng.random() < 0.2 else rng.choice(COMMON_WORDS) for _ in range(words))
+
+
+def seed(factory, args, rng) -> tuple:
+    rare = word_pool(rng, max(args.issues // 50, 100))
+    with factory() as db:
+        org = Organization(name="Bench")
+        db.add(org)
+        db.flush()
+        team = Team(name="Bench", identifier="BEN", organization_id=org.id)
+        user = User(email="bench@example.com", hashed_password="x", first_name="B", last_name="B", username="bench")
+        db.add_all([team, user])
+        db.flush()
+        project = Project(name="Bench project", icon="x", color="x", team_id=team.id)
+        db.add(project)
+        db.flush()
+        feature = Feature(name="Bench feature", project_id=project.id)
+        db.add(feature)
+        db.commit()
+        org_id, team_id, feature_id, user_id = org.id, team.id, feature.id, user.id
+
+    start = time.perf_counter()
+    batch = 1000
+    for offset in range(0, args.issues, batch):
+        with factory() as db:
+            issues = [
+                Issue(
+                    identifier=f"BEN-{n + 1}",
+                    title=sentence(rng, rare, 6),
+                    description=sentence(rng, rare, 40),
+                    team_id=team_id,
+                    feature_id=feature_id,
+                )
+                for n in range(offset, min(offset + batch, args.issues))
+            ]
+            db.add_all(issues)
+            db.flush()
+            db.add_all(
+                Comment(issue_id=issue.id, author_id=user_id, content=sentence(rng, rare, 20))
+                for issue in issues
+                for _ in range(args.comments_per_issue)
+            )
+            db.commit()
+    elapsed = time.perf_counter() - start
+    print(f"seeded {args.issues} issues in {elapsed:.1f}s ({args.issues / elapsed:.0f} issues/s with indexing)")
+    return org_id, rare
+
+
+def timed(fn, queries) -> list[float]:
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=50000)
+    parser.add_argument("--comments-per-issue", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite_engine(engine)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    rng = random.Random(7)
+    org_id, rare = seed(factory, args, rng)
+    analyze(engine)
+    queries = rng.sample(rare, min(args.queries, len(rare)))
+
+    with factory() as db:
+        def ilike(q):
+            return db.execute(
+                select(Issue.id).where(or_(Issue.title.ilike(f"%{q}%"), Issue.identifier.ilike(f"%{q}%"))).limit(100)
+            ).all()
+
+        def filtered(q):
+            return db.execute(
+                select(Issue.id).where(Issue.id.in_(search_service.matching_ids(db, q, "issue", org_id))).limit(100)
+            ).all()
+
+        def search(q):
+            return search_service.search(db, q, org_id, limit=20)
+
+        print(f"\n{len(queries)} queries  {'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  avg hits")
+        for name, fn in (("ilike", ilike), ("filter", filtered), ("search", search)):
+            samples = timed(fn, queries)
+            hits = statistics.mean(len(fn(q)) for q in queries[:10])
+            p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+            print(
+                f"  {name:<12}{statistics.median(samples) * 1000:>10.2f}{p95 * 1000:>10.2f}"
+                f"{max(samples) * 1000:>10.2f}  {hits:.0f}"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
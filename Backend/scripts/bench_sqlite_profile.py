@@ -0,0 +1,225 @@
+"""Benchmark mixed read/write API load on SQLite: driver defaults vs the SQLite profile.
+
+Usage:
+    python -m scripts.bench_sqlite_profile [--threads N] [--coroutines N]
+                                           [--seconds S] [--write-share F] [--ideas N]
+
+Each mode gets a fresh database file and runs the same load:
+
+* ``--threads`` threads on the sync engine, like the ``def`` routes in
+  FastAPI's threadpool;
+* ``--coroutines`` tasks on the async engine in one event loop, like the
+  ``async def`` routes.
+
+Every operation is a read (an idea and its assets, as on the idea detail
+page) or, for ``--write-share`` of them, a read followed by a write
+transaction (update the idea, add an asset), as the editing routes do.
+
+"defaults" is SQLite as the engine used to open it: rollback journal,
+synchronous=FULL and the driver's busy handling. "profile" applies
+``app.core.sqlite`` (WAL, busy_timeout, synchronous=NORMAL, mmap and cache
+sizes, foreign keys, writer queue). The script reports throughput,
+p50/p95/p99 latency for reads and writes, "database is locked" errors and
+the worst event-loop stall, measured by a 5 ms ticker.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.sqlite import configure_sqlite_engine, writer_queues
+from app.models.project_idea import AssetStatus, AssetType, IdeaStatus, ProjectAsset, ProjectIdea
+import app.models  # noqa: F401  (register every table for create_all)
+
+
+def make_engines(path: str, profile: bool):
+    engine = create_engine(f"sqlite:///{path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    if profile:
+        configure_sqlite_engine(engine)
+        configure_sqlite_engine(async_engine.sync_engine, is_async=True)
+    Base.metadata.create_all(engine)
+    return engine, async_engine
+
+
+def seed(factory, count: int) -> list[uuid.UUID]:
+    ids = []
+    with factory() as db:
+        for i in range(count):
+            idea = ProjectIdea(raw_input=f"Bench idea {i}", status=IdeaStatus.VALIDATED)
+            db.add(idea)
+            db.flush()
+            db.add(ProjectAsset(
+                project_idea_id=idea.id, asset_type=AssetType.PRD,
+                content="# PRD\n\nSeed.\n", status=AssetStatus.COMPLETED,
+            ))
+            ids.append(idea.id)
+        db.commit()
+    return ids
+
+
+def new_asset(idea_id) -> ProjectAsset:
+    return ProjectAsset(
+        project_idea_id=idea_id, asset_type=AssetType.APP_FLOW,
+        content=f"# App flow\n\n{time.time()}\n", status=AssetStatus.COMPLETED,
+    )
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {"read": [], "write": []}
+        self.locked = 0
+        self.other_errors = 0
+
+    def add(self, kind: str, elapsed: float) -> None:
+        with self.lock:
+            self.latencies[kind].append(elapsed)
+
+    def error(self, e: Exception) -> None:
+        with self.lock:
+            if "locked" in str(e):
+                self.locked += 1
+            else:
+                self.other_errors += 1
+                if self.other_errors == 1:
+                    print(f"  first error: {e}")
+
+
+def sync_worker(factory, ids, write_share, deadline, results, seed_value):
+    rng = random.Random(seed_value)
+    while time.perf_counter() < deadline:
+        idea_id = rng.choice(ids)
+        kind = "write" if rng.random() < write_share else "read"
+        start = time.perf_counter()
+        try:
+            with factory() as db:
+                idea = db.get(ProjectIdea, idea_id)
+                db.execute(select(ProjectAsset).where(ProjectAsset.project_idea_id == idea_id)).scalars().all()
+                if kind == "write":
+                    idea.refined_description = f"Edited {time.time()}"
+                    db.add(new_asset(idea_id))
+                    db.commit()
+        except OperationalError as e:
+            results.error(e)
+            continue
+        results.add(kind, time.perf_counter() - start)
+
+
+async def async_load(factory, ids, write_share, deadline, results, coroutines):
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        interval = 0.005
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            stall = max(stall, time.perf_counter() - start - interval)
+
+    async def worker(seed_value):
+        rng = random.Random(seed_value)
+        while time.perf_counter() < deadline:
+            idea_id = rng.choice(ids)
+            kind = "write" if rng.random() < write_share else "read"
+            start = time.perf_counter()
+            try:
+                async with factory() as db:
+                    idea = await db.get(ProjectIdea, idea_id)
+                    (await db.execute(
+                        select(ProjectAsset).where(ProjectAsset.project_idea_id == idea_id)
+                    )).scalars().all()
+                    if kind == "write":
+                        idea.refined_description = f"Edited {time.time()}"
+                        db.add(new_asset(idea_id))
+                        await db.commit()
+            except OperationalError as e:
+                results.error(e)
+                continue
+            results.add(kind, time.perf_counter() - start)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.gather(*[worker(1000 + i) for i in range(coroutines)])
+    done = True
+    await tick
+    return stall
+
+
+def pct(samples: list[float], q: int) -> float:
+    if len(samples) < 2:
+        return samples[0] * 1000 if samples else 0.0
+    return statistics.quantiles(samples, n=100)[q - 1] * 1000
+
+
+def run(mode: str, args) -> None:
+    path = os.path.join(tempfile.mkdtemp(), f"{mode}.db")
+    engine, async_engine = make_engines(path, profile=mode == "profile")
+    factory = sessionmaker(bind=engine, autoflush=False)
+    async_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    ids = seed(factory, args.ideas)
+    results = Results()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=sync_worker, args=(factory, ids, args.write_share, deadline, results, i))
+        for i in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+
+    async def main_async():
+        try:
+            return await async_load(async_factory, ids, args.write_share, deadline, results, args.coroutines)
+        finally:
+            await async_engine.dispose()
+
+    stall = asyncio.run(main_async())
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    engine.dispose()
+
+    total = sum(len(v) for v in results.latencies.values())
+    print(
+        f"\n{mode}: {total / wall:.0f} ops/s, {results.locked} 'database is locked', "
+        f"{results.other_errors} other errors, worst loop stall {stall * 1000:.1f} ms"
+    )
+    print(f"  {'op':<7}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, samples in results.latencies.items():
+        print(f"  {kind:<7}{len(samples):>7}{pct(samples, 50):>10.1f}{pct(samples, 95):>10.1f}{pct(samples, 99):>10.1f}")
+    queue = writer_queues.get(path)
+    if queue:
+        print(f"  writer queue: {queue.snapshot()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--coroutines", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-share", type=float, default=0.3)
+    parser.add_argument("--ideas", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{args.threads} threads + {args.coroutines} coroutines for {args.seconds:.0f}s, "
+        f"{args.write_share:.0%} writes"
+    )
+    for mode in ("defaults", "profile"):
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
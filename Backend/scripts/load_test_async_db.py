@@ -0,0 +1,249 @@
+"""Load test: mixed AI and CRUD traffic on the sync Session vs AsyncSession.
+
+Usage:
+    python -m scripts.load_test_async_db [--database-url URL] [--requests N]
+                                         [--concurrency N] [--ai-latency-ms MS]
+                                         [--ai-share F] [--ideas N]
+
+Runs the same workload twice inside one event loop, the way ``async def``
+routes run under uvicorn:
+
+* sync:  each operation opens a ``Session`` and queries it directly from the
+  coroutine, as the routes did before (every query blocks the loop);
+* async: each operation uses an ``AsyncSession`` on the async driver.
+
+The workload mixes "AI" operations (load an idea, await a simulated model
+call of ``--ai-latency-ms``, save an asset) with CRUD reads (idea plus its
+assets) and writes (update an idea). Seeded data lives in a throwaway sqlite
+file unless ``--database-url`` points somewhere else; the tables are created
+if missing and the seeded rows are deleted afterwards.
+
+For each mode the script reports throughput, p50/p95/p99 latency per
+operation kind and the worst event-loop stall, measured by a 5 ms ticker.
+
+With more concurrent operations than pooled connections, sync mode can stall
+outright: coroutines awaiting the model call hold every connection while the
+next checkout blocks the loop they need to release them, until
+``--pool-timeout`` expires. Those operations are counted as errors.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, async_database_url
+from app.models.project_idea import AssetStatus, AssetType, IdeaStatus, ProjectAsset, ProjectIdea
+import app.models  # noqa: F401  (register every table for create_all)
+
+
+def seed(session_factory, count: int) -> list[uuid.UUID]:
+    ids = []
+    with session_factory() as db:
+        for i in range(count):
+            idea = ProjectIdea(
+                user_id=uuid.uuid4(),
+                raw_input=f"Load test idea {i}",
+                status=IdeaStatus.VALIDATED,
+            )
+            db.add(idea)
+            db.flush()
+            db.add(ProjectAsset(
+                project_idea_id=idea.id,
+                asset_type=AssetType.PRD,
+                content="# PRD\n\nSeed.\n",
+                status=AssetStatus.COMPLETED,
+            ))
+            ids.append(idea.id)
+        db.commit()
+    return ids
+
+
+def cleanup(session_factory, ids: list[uuid.UUID]) -> None:
+    with session_factory() as db:
+        db.execute(delete(ProjectAsset).where(ProjectAsset.project_idea_id.in_(ids)))
+        db.execute(delete(ProjectIdea).where(ProjectIdea.id.in_(ids)))
+        db.commit()
+
+
+# -- operations ---------------------------------------------------------------
+# Each pair does the same queries; only the session type differs.
+
+
+async def sync_ai(factory, idea_id, latency):
+    with factory() as db:
+        idea = db.get(ProjectIdea, idea_id)
+        await asyncio.sleep(latency)
+        asset = db.execute(
+            select(ProjectAsset).where(ProjectAsset.project_idea_id == idea.id).limit(1)
+        ).scalars().first()
+        asset.content = f"# PRD\n\nGenerated {time.time()}.\n"
+        db.commit()
+
+
+async def async_ai(factory, idea_id, latency):
+    async with factory() as db:
+        idea = await db.get(ProjectIdea, idea_id)
+        await asyncio.sleep(latency)
+        asset = (await db.execute(
+            select(ProjectAsset).where(ProjectAsset.project_idea_id == idea.id).limit(1)
+        )).scalars().first()
+        asset.content = f"# PRD\n\nGenerated {time.time()}.\n"
+        await db.commit()
+
+
+async def sync_read(factory, idea_id, latency):
+    with factory() as db:
+        db.get(ProjectIdea, idea_id)
+        db.execute(select(ProjectAsset).where(ProjectAsset.project_idea_id == idea_id)).scalars().all()
+
+
+async def async_read(factory, idea_id, latency):
+    async with factory() as db:
+        await db.get(ProjectIdea, idea_id)
+        (await db.execute(select(ProjectAsset).where(ProjectAsset.project_idea_id == idea_id))).scalars().all()
+
+
+async def sync_write(factory, idea_id, latency):
+    with factory() as db:
+        idea = db.get(ProjectIdea, idea_id)
+        idea.refined_description = f"Edited {time.time()}"
+        db.commit()
+
+
+async def async_write(factory, idea_id, latency):
+    async with factory() as db:
+        idea = await db.get(ProjectIdea, idea_id)
+        idea.refined_description = f"Edited {time.time()}"
+        await db.commit()
+
+
+OPERATIONS = {
+    "sync": {"ai": sync_ai, "read": sync_read, "write": sync_write},
+    "async": {"ai": async_ai, "read": async_read, "write": async_write},
+}
+
+
+def plan(requests: int, ai_share: float, ids: list, seed_value: int = 7) -> list[tuple[str, uuid.UUID]]:
+    """The same shuffled (kind, idea id) sequence for both modes."""
+    rng = random.Random(seed_value)
+    crud_share = 1 - ai_share
+    kinds = rng.choices(
+        ["ai", "read", "write"], weights=[ai_share, crud_share * 0.75, crud_share * 0.25], k=requests
+    )
+    return [(kind, rng.choice(ids)) for kind in kinds]
+
+
+async def run(mode: str, factory, work, concurrency: int, latency: float):
+    ops = OPERATIONS[mode]
+    latencies: dict[str, list[float]] = {"ai": [], "read": [], "write": []}
+    errors = 0
+    queue = list(reversed(work))
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        interval = 0.005
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            stall = max(stall, time.perf_counter() - start - interval)
+
+    async def worker():
+        nonlocal errors
+        while True:
+            # Yield between operations, as the server does between requests
+            await asyncio.sleep(0)
+            if not queue:
+                break
+            kind, idea_id = queue.pop()
+            start = time.perf_counter()
+            try:
+                await ops[kind](factory, idea_id, latency)
+            except Exception as e:
+                errors += 1
+                if errors == 1:
+                    print(f"  first {mode} error: {e}")
+                continue
+            latencies[kind].append(time.perf_counter() - start)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    wall = time.perf_counter() - start
+    done = True
+    await tick
+    return wall, stall, latencies, errors
+
+
+def pct(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0] * 1000
+    return statistics.quantiles(samples, n=100)[int(q) - 1] * 1000
+
+
+def report(mode: str, total: int, wall: float, stall: float, latencies, errors: int) -> None:
+    print(f"\n{mode}: {total / wall:.1f} ops/s over {wall:.2f}s, worst loop stall {stall * 1000:.1f} ms, {errors} errors")
+    header = f"  {'op':<7}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    for kind, samples in latencies.items():
+        print(f"  {kind:<7}{len(samples):>7}{pct(samples, 50):>10.1f}{pct(samples, 95):>10.1f}{pct(samples, 99):>10.1f}")
+
+
+async def main_async(args, sync_factory, async_engine, work):
+    async_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        for mode, factory in (("sync", sync_factory), ("async", async_factory)):
+            wall, stall, latencies, errors = await run(
+                mode, factory, work, args.concurrency, args.ai_latency_ms / 1000
+            )
+            report(mode, len(work), wall, stall, latencies, errors)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--ai-latency-ms", type=float, default=200)
+    parser.add_argument("--ai-share", type=float, default=0.3)
+    parser.add_argument("--ideas", type=int, default=50)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load_test.db')}"
+    engine = create_engine(url, pool_pre_ping=True, pool_timeout=args.pool_timeout)
+    Base.metadata.create_all(engine, tables=[ProjectIdea.__table__, ProjectAsset.__table__])
+    sync_factory = sessionmaker(bind=engine, autoflush=False)
+    async_engine = create_async_engine(
+        async_database_url(url), pool_pre_ping=True, pool_timeout=args.pool_timeout
+    )
+
+    ids = seed(sync_factory, args.ideas)
+    work = plan(args.requests, args.ai_share, ids)
+    print(
+        f"{args.requests} operations, {args.concurrency} concurrent, "
+        f"{args.ai_share:.0%} AI at {args.ai_latency_ms:.0f} ms, {engine.url.get_backend_name()}"
+    )
+    try:
+        asyncio.run(main_async(args, sync_factory, async_engine, work))
+    finally:
+        cleanup(sync_factory, ids)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
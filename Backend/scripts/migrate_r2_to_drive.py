@@ -1,67 +1,297 @@
+"""Backfill Google Docs for completed document assets.
+
+Usage:
+    python -m scripts.migrate_r2_to_drive [--dry-run] [--workers N]
+                                          [--page-size N] [--limit N]
+                                          [--checkpoint PATH] [--reset]
+                                          [--retry-failed]
+
+Assets are walked in primary-key order one page at a time. Each page is
+mirrored by a bounded pool of concurrent workers and committed in a single
+transaction, after which the checkpoint file records the last asset id, so
+an interrupted run resumes where it stopped. Assets that failed are listed in
+the checkpoint for --retry-failed. Paths that already have a Document are
+loaded once up front instead of being looked up per asset.
+"""
+import argparse
 import asyncio
+import json
 import os
-import sys
-from sqlalchemy.orm import Session
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
 from app.core.database import SessionLocal
-from app.models.project_idea import ProjectAsset, ProjectIdea
+from app.core.time import utc_now
+from app.models.project_idea import ProjectAsset
 from app.models.document import Document
-from app.models.enums import AssetType, AssetStatus
+from app.models.enums import AssetType, AssetStatus, MirrorStatus
 from app.services.document_service import document_service
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def migrate():
+TEXT_ASSET_TYPES = [
+    AssetType.PRD,
+    AssetType.APP_FLOW,
+    AssetType.TECH_STACK,
+    AssetType.FRONTEND_GUIDELINES,
+    AssetType.BACKEND_SCHEMA,
+    AssetType.IMPLEMENTATION_PLAN,
+]
+
+
+class Checkpoint:
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.state = {"last_asset_id": None, "created": 0, "skipped": 0, "failed": []}
+
+    def load(self) -> "Checkpoint":
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.state.update(json.load(f))
+            logger.info(
+                f"Resuming from checkpoint {self.path}: after asset {self.state['last_asset_id']}, "
+                f"{self.state['created']} created so far"
+            )
+        return self
+
+    def save(self) -> None:
+        if not self.enabled:
+            return
+        self.state["updated_at"] = utc_now().isoformat()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _base_query(db: Session):
+    return db.query(ProjectAsset).filter(
+        ProjectAsset.asset_type.in_(TEXT_ASSET_TYPES),
+        ProjectAsset.status == AssetStatus.COMPLETED,
+        ProjectAsset.r2_path.isnot(None),
+    )
+
+
+def _next_page(db: Session, after_id, page_size: int) -> List[ProjectAsset]:
+    query = _base_query(db).options(joinedload(ProjectAsset.project_idea))
+    if after_id:
+        query = query.filter(ProjectAsset.id > after_id)
+    return query.order_by(ProjectAsset.id).limit(page_size).all()
+
+
+async def _migrate_asset(asset: ProjectAsset, semaphore: asyncio.Semaphore) -> Document:
+    idea = asset.project_idea
+    title = f"{idea.raw_input[:30]} - {asset.asset_type.value.replace('_', ' ').title()}"
+    async with semaphore:
+        drive_file_id = await document_service.create_google_doc(title, asset.content or "")
+    return Document(
+        project_id=idea.project_id,
+        idea_id=idea.id,
+        drive_file_id=drive_file_id,
+        r2_path=asset.r2_path,
+        title=title,
+    )
+
+
+def _commit_page(db: Session, created: Dict[str, Document]) -> int:
+    """Insert the page's Documents in one transaction, falling back to row-by-row
+    if another writer already mirrored one of the paths."""
+    if not created:
+        return 0
+
+    def mark_synced(paths):
+        db.query(ProjectAsset).filter(ProjectAsset.r2_path.in_(paths)).update(
+            {ProjectAsset.mirror_status: MirrorStatus.SYNCED, ProjectAsset.mirrored_at: utc_now()},
+            synchronize_session=False,
+        )
+
+    try:
+        db.add_all(created.values())
+        mark_synced(list(created))
+        db.commit()
+        return len(created)
+    except IntegrityError:
+        db.rollback()
+
+    inserted = 0
+    for r2_path, doc in created.items():
+        try:
+            db.add(doc)
+            mark_synced([r2_path])
+            db.commit()
+            inserted += 1
+        except IntegrityError:
+            db.rollback()
+            logger.warning(f"Document for {r2_path} was created concurrently; orphaned Drive file {doc.drive_file_id}")
+    return inserted
+
+
+async def _process_page(
+    db: Session,
+    page: List[ProjectAsset],
+    migrated: Set[str],
+    semaphore: asyncio.Semaphore,
+    checkpoint: Checkpoint,
+    dry_run: bool,
+) -> Dict[str, int]:
+    todo = [a for a in page if a.r2_path not in migrated]
+    counts = {"skipped": len(page) - len(todo), "created": 0, "failed": 0}
+    failed = set(checkpoint.state["failed"])
+    failed.difference_update(str(a.id) for a in page if a.r2_path in migrated)
+
+    if dry_run:
+        for asset in todo:
+            logger.info(f"[dry-run] would create Google Doc for {asset.r2_path}")
+        counts["created"] = len(todo)
+        return counts
+    checkpoint.state["failed"] = sorted(failed)
+
+    results = await asyncio.gather(
+        *[_migrate_asset(a, semaphore) for a in todo], return_exceptions=True
+    )
+    created: Dict[str, Document] = {}
+    for asset, result in zip(todo, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to migrate asset {asset.id}: {result}")
+            failed.add(str(asset.id))
+            counts["failed"] += 1
+        else:
+            created[asset.r2_path] = result
+            failed.discard(str(asset.id))
+    counts["created"] = _commit_page(db, created)
+    migrated.update(created)
+    checkpoint.state["failed"] = sorted(failed)
+    return counts
+
+
+async def migrate(
+    dry_run: bool = False,
+    workers: int = 8,
+    page_size: int = 200,
+    limit: Optional[int] = None,
+    checkpoint_path: str = ".migrate_r2_to_drive.checkpoint.json",
+    reset: bool = False,
+    retry_failed: bool = False,
+):
+    checkpoint = Checkpoint(checkpoint_path, enabled=not dry_run)
+    if reset:
+        if os.path.exists(checkpoint_path) and not dry_run:
+            os.remove(checkpoint_path)
+    else:
+        checkpoint.load()
+
+    if not dry_run and not document_service.enabled:
+        raise SystemExit("Google Drive service not initialized (check service-account.json)")
+
     db: Session = SessionLocal()
     try:
-        # Get all completed text documents that haven't been migrated yet
-        text_asset_types = [
-            AssetType.PRD, 
-            AssetType.APP_FLOW, 
-            AssetType.TECH_STACK, 
-            AssetType.FRONTEND_GUIDELINES, 
-            AssetType.BACKEND_SCHEMA, 
-            AssetType.IMPLEMENTATION_PLAN
-        ]
-        
-        assets = db.query(ProjectAsset).filter(
-            ProjectAsset.asset_type.in_(text_asset_types),
-            ProjectAsset.status == AssetStatus.COMPLETED
-        ).all()
-        
-        logger.info(f"Found {len(assets)} assets to migrate.")
-        
-        for asset in assets:
-            # Check if Document already exists for this asset's R2 path
-            existing_doc = db.query(Document).filter(Document.r2_path == asset.r2_path).first()
-            if existing_doc:
-                logger.info(f"Skipping already migrated asset: {asset.r2_path}")
-                continue
-            
-            idea = asset.project_idea
-            title = f"{idea.raw_input[:30]} - {asset.asset_type.value.replace('_', ' ').title()}"
-            
-            try:
-                logger.info(f"Creating Google Doc for asset: {asset.asset_type.value} of idea {idea.id}")
-                drive_file_id = await document_service.create_google_doc(title, asset.content)
-                
-                new_doc = Document(
-                    project_id=idea.project_id,
-                    idea_id=idea.id,
-                    drive_file_id=drive_file_id,
-                    r2_path=asset.r2_path,
-                    title=title
+        migrated: Set[str] = {path for (path,) in db.query(Document.r2_path)}
+        if retry_failed:
+            retry_ids = list(checkpoint.state["failed"])
+            total = len(retry_ids)
+        else:
+            remaining = _base_query(db)
+            if checkpoint.state["last_asset_id"]:
+                remaining = remaining.filter(
+                    ProjectAsset.id > uuid.UUID(checkpoint.state["last_asset_id"])
                 )
-                db.add(new_doc)
-                db.commit()
-                logger.info(f"Successfully migrated {asset.r2_path} to Google Doc {drive_file_id}")
-            except Exception as e:
-                logger.error(f"Failed to migrate asset {asset.id}: {e}")
-                db.rollback()
-                
+            total = remaining.count()
+        logger.info(f"{total} assets to scan, {len(migrated)} paths already have a Google Doc")
+
+        semaphore = asyncio.Semaphore(workers)
+        started = time.perf_counter()
+        totals = {"scanned": 0, "created": 0, "skipped": 0, "failed": 0}
+        after_id = checkpoint.state["last_asset_id"]
+        if after_id:
+            after_id = uuid.UUID(after_id)
+
+        while limit is None or totals["scanned"] < limit:
+            size = page_size if limit is None else min(page_size, limit - totals["scanned"])
+            if retry_failed:
+                ids, retry_ids = retry_ids[:size], retry_ids[size:]
+                if not ids:
+                    break
+                page = (
+                    _base_query(db).options(joinedload(ProjectAsset.project_idea))
+                    .filter(ProjectAsset.id.in_([uuid.UUID(i) for i in ids])).all()
+                )
+                # Assets deleted or no longer eligible since they failed
+                found = {str(a.id) for a in page}
+                checkpoint.state["failed"] = [
+                    i for i in checkpoint.state["failed"] if i in found or i not in ids
+                ]
+            else:
+                page = _next_page(db, after_id, size)
+                if not page:
+                    break
+
+            counts = await _process_page(db, page, migrated, semaphore, checkpoint, dry_run)
+            totals["scanned"] += len(page)
+            for key in ("created", "skipped", "failed"):
+                totals[key] += counts[key]
+
+            if page and not retry_failed:
+                after_id = page[-1].id
+                checkpoint.state["last_asset_id"] = str(after_id)
+            checkpoint.state["created"] += 0 if dry_run else counts["created"]
+            checkpoint.state["skipped"] += counts["skipped"]
+            checkpoint.save()
+            db.expunge_all()
+
+            elapsed = time.perf_counter() - started
+            rate = totals["scanned"] / elapsed if elapsed else 0.0
+            remaining = max(total - totals["scanned"], 0)
+            eta = f", ETA {remaining / rate:.0f}s" if rate else ""
+            logger.info(
+                f"{totals['scanned']}/{total} scanned ({rate:.1f} assets/s{eta}): "
+                f"{totals['created']} {'would be ' if dry_run else ''}created, "
+                f"{totals['skipped']} already migrated, {totals['failed']} failed"
+            )
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Done in {elapsed:.1f}s: {totals['scanned']} scanned, {totals['created']} "
+            f"{'would be ' if dry_run else ''}created, {totals['skipped']} skipped, "
+            f"{totals['failed']} failed"
+        )
+        if checkpoint.state["failed"] and not dry_run:
+            logger.info(
+                f"{len(checkpoint.state['failed'])} failed asset ids are recorded in "
+                f"{checkpoint_path}; rerun with --retry-failed"
+            )
+        logger.info(f"Google API metrics: {document_service.get_metrics()}")
     finally:
         db.close()
 
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be migrated without writing anything")
+    parser.add_argument("--workers", type=int, default=settings.GOOGLE_API_WORKERS, help="Concurrent Drive uploads")
+    parser.add_argument("--page-size", type=int, default=200, help="Assets loaded and committed per page")
+    parser.add_argument("--limit", type=int, help="Stop after scanning this many assets")
+    parser.add_argument("--checkpoint", default=".migrate_r2_to_drive.checkpoint.json")
+    parser.add_argument("--reset", action="store_true", help="Ignore and delete an existing checkpoint")
+    parser.add_argument("--retry-failed", action="store_true", help="Only retry assets recorded as failed in the checkpoint")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(
+        dry_run=args.dry_run,
+        workers=args.workers,
+        page_size=args.page_size,
+        limit=args.limit,
+        checkpoint_path=args.checkpoint,
+        reset=args.reset,
+        retry_failed=args.retry_failed,
+    ))
+
+
 if __name__ == "__main__":
-    asyncio.run(migrate())
+    main()
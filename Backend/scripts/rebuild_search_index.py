@@ -0,0 +1,31 @@
+"""Rebuild the search index from the issues, features and projects tables.
+
+Usage:
+    python -m scripts.rebuild_search_index [--batch-size N]
+
+The index is kept current by the application itself; run this after data
+was changed outside it (raw SQL, database-side cascades such as deleting a
+team) or to repopulate ``search_documents`` from scratch. Each batch is
+committed separately, so SQLite writers are never held up for long.
+"""
+import argparse
+import logging
+
+from app.core.database import SessionLocal
+from app.services.search_service import search_service
+import app.models  # noqa: F401  (resolve every mapper before querying)
+
+logging.basicConfig(level=logging.INFO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="Entities reindexed per transaction")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        search_service.rebuild(db, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Conformance checks and micro-benchmarks for storage backends.
+
+Usage:
+    python -m scripts.storage_conformance [--backend local|r2] [--root DIR]
+                                          [--prefix PREFIX] [--iterations N]
+                                          [--skip-bench]
+
+Every backend must pass the same checks; the benchmark then reports
+put/get/head latency for a few payload sizes plus a concurrent read run, so
+storage changes can be measured offline against the local backend and
+compared with R2. Keys are written under a unique prefix and deleted afterwards.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.services.storage_backends import (
+    LocalFilesystemBackend,
+    ObjectNotFound,
+    StorageBackend,
+    StorageBackendError,
+    create_backend,
+)
+from app.services.storage_service import CONTENT_HASH_METADATA_KEY, StorageService
+
+CHECKS = []
+
+
+def check(fn):
+    CHECKS.append(fn)
+    return fn
+
+
+@check
+def put_get_roundtrip(backend: StorageBackend, prefix: str):
+    key = f"{prefix}/roundtrip.md"
+    backend.put(key, b"# Title\n\nbody", content_type="text/markdown")
+    obj = backend.get(key)
+    assert obj.body == b"# Title\n\nbody", obj.body
+    assert obj.content_type == "text/markdown", obj.content_type
+
+
+@check
+def overwrite_replaces_body_and_metadata(backend, prefix):
+    key = f"{prefix}/overwrite.md"
+    backend.put(key, b"first", content_type="text/markdown", metadata={"v": "1"})
+    backend.put(key, b"second", content_type="text/plain", metadata={"v": "2"})
+    obj = backend.get(key)
+    assert obj.body == b"second"
+    assert obj.content_type == "text/plain"
+    assert obj.metadata.get("v") == "2", obj.metadata
+
+
+@check
+def metadata_and_encoding_roundtrip(backend, prefix):
+    key = f"{prefix}/meta.md"
+    backend.put(
+        key, b"\x1f\x8b payload", content_type="text/markdown",
+        content_encoding="gzip", metadata={CONTENT_HASH_METADATA_KEY: "abc123"},
+    )
+    head = backend.head(key)
+    assert head.body is None
+    assert head.content_encoding == "gzip", head.content_encoding
+    assert head.metadata.get(CONTENT_HASH_METADATA_KEY) == "abc123", head.metadata
+    assert head.size == len(b"\x1f\x8b payload"), head.size
+
+
+@check
+def missing_key_raises_not_found(backend, prefix):
+    for op in (backend.get, backend.head):
+        try:
+            op(f"{prefix}/does-not-exist.md")
+        except ObjectNotFound:
+            continue
+        raise AssertionError(f"{op.__name__} on a missing key did not raise ObjectNotFound")
+    assert not backend.exists(f"{prefix}/does-not-exist.md")
+
+
+@check
+def delete_is_idempotent(backend, prefix):
+    key = f"{prefix}/delete.md"
+    backend.put(key, b"x", content_type="text/markdown")
+    assert backend.exists(key)
+    backend.delete(key)
+    backend.delete(key)
+    assert not backend.exists(key)
+
+
+@check
+def empty_and_binary_bodies(backend, prefix):
+    backend.put(f"{prefix}/empty.bin", b"", content_type="application/octet-stream")
+    assert backend.get(f"{prefix}/empty.bin").body == b""
+    data = bytes(range(256)) * 64
+    backend.put(f"{prefix}/binary.bin", data, content_type="application/octet-stream")
+    assert backend.get(f"{prefix}/binary.bin").body == data
+
+
+@check
+def large_body(backend, prefix):
+    data = os.urandom(4 * 1024 * 1024)
+    backend.put(f"{prefix}/large.bin", data, content_type="application/octet-stream")
+    assert backend.get(f"{prefix}/large.bin").body == data
+
+
+@check
+def nested_keys(backend, prefix):
+    key = f"{prefix}/projects/{uuid.uuid4()}/docs/prd.md"
+    backend.put(key, "naïve ünïcode".encode("utf-8"), content_type="text/markdown")
+    assert backend.get(key).body.decode("utf-8") == "naïve ünïcode"
+
+
+@check
+def concurrent_writers_never_expose_partial_objects(backend, prefix):
+    key = f"{prefix}/contended.bin"
+    bodies = [bytes([i]) * (256 * 1024) for i in range(8)]
+
+    def put(i):
+        backend.put(key, bodies[i], content_type="application/octet-stream", metadata={"writer": str(i)})
+
+    put(0)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        writes = [pool.submit(put, i) for i in range(len(bodies))]
+        reads = [pool.submit(backend.get, key) for _ in range(16)]
+        for f in writes:
+            f.result()
+        for f in reads:
+            obj = f.result()
+            assert obj.body in bodies, "read a torn or truncated object"
+            assert obj.metadata.get("writer") == str(obj.body[0]), "read a body with another write's metadata"
+
+
+@check
+def service_dedup_and_compression(backend, prefix):
+    service = StorageService(backend=backend)
+    key = f"{prefix}/service.md"
+    text = "# Doc\n\n" + "lorem ipsum dolor sit amet " * 2000
+    asyncio.run(service.upload_content(key, text))
+    asyncio.run(service.upload_content(key, text))
+    stats = service.get_stats()
+    assert stats["puts"] == 1 and stats["skipped_puts"] == 1, stats
+    assert backend.head(key).size < len(text), "large payload was not compressed"
+    assert asyncio.run(StorageService(backend=backend).get_content(key)) == text
+
+
+def run_conformance(backend: StorageBackend, prefix: str) -> bool:
+    ok = True
+    for fn in CHECKS:
+        try:
+            fn(backend, f"{prefix}/{fn.__name__}")
+            print(f"  PASS  {fn.__name__}")
+        except (AssertionError, StorageBackendError) as e:
+            ok = False
+            print(f"  FAIL  {fn.__name__}: {e!r}")
+    if isinstance(backend, LocalFilesystemBackend):
+        try:
+            backend.put("../escape.md", b"x", content_type="text/markdown")
+            ok = False
+            print("  FAIL  local_rejects_path_traversal")
+        except StorageBackendError:
+            print("  PASS  local_rejects_path_traversal")
+    return ok
+
+
+def _ms(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.median(samples) * 1000, p95 * 1000
+
+
+def run_benchmark(backend: StorageBackend, prefix: str, iterations: int):
+    print(f"\n{'size':>8}{'op':>6}{'p50 ms':>10}{'p95 ms':>10}{'MB/s':>10}")
+    for size in (1024, 64 * 1024, 1024 * 1024):
+        data = os.urandom(size)
+        key = f"{prefix}/bench-{size}.bin"
+        timings = {"put": [], "get": [], "head": []}
+        for _ in range(iterations):
+            start = time.perf_counter()
+            backend.put(key, data, content_type="application/octet-stream")
+            timings["put"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            backend.get(key)
+            timings["get"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            backend.head(key)
+            timings["head"].append(time.perf_counter() - start)
+        for op, samples in timings.items():
+            p50, p95 = _ms(samples)
+            mbps = "" if op == "head" else f"{size / (1024 * 1024) / (p50 / 1000):.1f}"
+            print(f"{size // 1024:>7}K{op:>6}{p50:>10.3f}{p95:>10.3f}{mbps:>10}")
+
+    key = f"{prefix}/bench-{64 * 1024}.bin"
+    reads = iterations * 8
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: backend.get(key), range(reads)))
+    elapsed = time.perf_counter() - start
+    print(f"\nconcurrent 64K gets (8 threads): {reads / elapsed:.0f} ops/s")
+
+
+def cleanup(backend: StorageBackend, prefix: str):
+    if isinstance(backend, LocalFilesystemBackend):
+        import shutil
+        shutil.rmtree(backend.root / prefix, ignore_errors=True)
+        return
+    paginator = backend.client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=backend.bucket_name, Prefix=f"{prefix}/"):
+        for item in page.get("Contents", []):
+            backend.delete(item["Key"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["local", "r2", "s3"], default="local")
+    parser.add_argument("--root", help="Directory for the local backend (default: a temp dir)")
+    parser.add_argument("--prefix", default=f"conformance/{uuid.uuid4().hex[:12]}")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--skip-bench", action="store_true")
+    args = parser.parse_args()
+
+    if args.backend == "local":
+        backend = LocalFilesystemBackend(args.root or tempfile.mkdtemp(prefix="storage-conformance-"))
+    else:
+        settings.STORAGE_BACKEND = args.backend
+        backend = create_backend(settings)
+        if backend is None:
+            raise SystemExit("R2 credentials are not configured")
+
+    print(f"Backend: {backend.name}  prefix: {args.prefix}")
+    try:
+        ok = run_conformance(backend, args.prefix)
+        if ok and not args.skip_bench:
+            run_benchmark(backend, args.prefix, args.iterations)
+    finally:
+        cleanup(backend, args.prefix)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
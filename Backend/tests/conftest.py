@@ -0,0 +1,57 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read at import time, so the test environment is set up first
+_tmp = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("PROJECT_NAME", "Backend tests")
+os.environ.setdefault("VERSION", "test")
+os.environ.setdefault("API_V1_PREFIX", "/api/v1")
+os.environ.setdefault("STORAGE_BACKEND", "local")
+os.environ.setdefault("LOCAL_STORAGE_PATH", os.path.join(_tmp, "storage"))
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# Lazy loads on the core models raise, so a missing loader profile fails a test
+os.environ.setdefault("ORM_RAISE_ON_LAZY_LOAD", "true")
+# The startup ANALYZE would land in the first measured request
+os.environ.setdefault("SQLITE_ANALYZE_INTERVAL_MINUTES", "0")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    import app.models  # noqa: F401
+    from app.core.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _register(client, name: str) -> dict:
+    email = f"{name}-{uuid.uuid4().hex[:8]}@example.com"
+    response = client.post("/api/v1/auth/register", json={
+        "email": email, "password": "Passw0rd!23", "first_name": name, "last_name": "Test",
+        "username": email.split("@")[0],
+    })
+    assert response.status_code == 201, response.text
+    response = client.post("/api/v1/auth/login", data={"username": email, "password": "Passw0rd!23"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def owner(client):
+    """An organization owner with its default team."""
+    headers = _register(client, "owner")
+    response = client.post("/api/v1/organizations", json={"name": f"Org {uuid.uuid4().hex[:6]}"}, headers=headers)
+    assert response.status_code == 201, response.text
+    team = client.get("/api/v1/teams", headers=headers).json()[0]
+    me = client.get("/api/v1/auth/me", headers=headers).json()
+    return {"headers": headers, "team": team, "user": me}
@@ -0,0 +1,52 @@
+P = "/api/v1"
+
+
+def test_invalid_cursor_is_rejected_without_details(client, owner):
+    response = client.get(f"{P}/issues", params={"cursor": "not-a-cursor"}, headers=owner["headers"])
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def _issue(client, owner, title: str) -> dict:
+    headers, team = owner["headers"], owner["team"]
+    project = client.post(f"{P}/projects", json={
+        "name": title, "icon": "x", "color": "blue", "team_id": team["id"],
+    }, headers=headers).json()
+    feature = client.post(f"{P}/features", json={"name": title, "project_id": project["id"]}, headers=headers).json()
+    response = client.post(f"{P}/issues", json={
+        "title": title, "team_id": team["id"], "feature_id": feature["id"],
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_skip_with_cursor_is_rejected(client, owner):
+    headers = owner["headers"]
+    for i in range(3):
+        _issue(client, owner, f"Paged {i}")
+    page = client.get(f"{P}/issues", params={"limit": 1}, headers=headers).json()
+    assert page["next_cursor"]
+
+    response = client.get(f"{P}/issues", params={"cursor": page["next_cursor"], "skip": 1}, headers=headers)
+    assert response.status_code == 400
+    response = client.get(f"{P}/issues", params={"cursor": page["next_cursor"]}, headers=headers)
+    assert response.status_code == 200
+
+
+def test_unpaged_lists_return_every_row_unless_asked(client, owner):
+    headers = owner["headers"]
+    issue = _issue(client, owner, "Commented")
+    for i in range(3):
+        response = client.post(f"{P}/issues/{issue['id']}/comments", json={"content": f"Comment {i}"}, headers=headers)
+        assert response.status_code in (200, 201), response.text
+    url = f"{P}/issues/{issue['id']}/comments"
+
+    response = client.get(url, headers=headers)
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get(url, params={"limit": 2}, headers=headers)
+    assert [c["content"] for c in response.json()] == ["Comment 0", "Comment 1"]
+    rest = client.get(url, params={"cursor": response.headers["X-Next-Cursor"]}, headers=headers)
+    assert [c["content"] for c in rest.json()] == ["Comment 2"]
+    assert "X-Next-Cursor" not in rest.headers
@@ -0,0 +1,167 @@
+"""SQL statements per request for the list and detail endpoints.
+
+Two organizations are seeded, one small and one large, with the related
+rows the response schemas serialize: assignees, resources, nested
+sub-issues and sub-features, milestones, project members, teams, updates,
+comments and reactions. Each endpoint must run no more statements for the
+large organization than for the small one, i.e. the count doesn't grow
+with the page, and stay within its budget. Lazy loads raise during the
+tests, so a relationship a loader profile misses fails with its name.
+"""
+import re
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.models import (
+    Feature,
+    Issue,
+    Milestone,
+    Organization,
+    Project,
+    ProjectUpdate,
+    ProjectUpdateComment,
+    Reaction,
+    Resource,
+    Team,
+    User,
+)
+from app.models.enums import (
+    ProjectHealth,
+    ReactionTargetType,
+    ResourceTargetType,
+    ResourceType,
+    TriageStatus,
+)
+
+# Statements allowed per request, including the one that loads the user.
+# Each level of sub-issue or sub-feature depth costs two more (the level and
+# its resources or milestones); three levels of issues are seeded, two of
+# features. Search checks that each matched entity type still exists.
+BUDGETS = {
+    "GET /issues": 9,
+    "GET /issues/my-issues": 8,
+    "GET /issues/inbox": 8,
+    "GET /issues/{id}": 8,
+    "GET /projects": 11,
+    "GET /projects/{id}": 12,
+    "GET /features": 6,
+    "GET /features/{id}": 6,
+    "GET /search": 3,
+}
+
+
+def seed(name: str, size: int) -> dict:
+    """An organization with ``size`` of everything; returns ids and a token for its member."""
+    with SessionLocal() as db:
+        org = Organization(name=name)
+        db.add(org)
+        db.flush()
+        users = [
+            User(email=f"{name}{i}@example.com", first_name=name, last_name=str(i), username=f"{name}{i}",
+                 organization_id=org.id)
+            for i in range(3)
+        ]
+        team = Team(name=name, identifier=name[:3].upper(), organization_id=org.id, members=users, leaders=users[:1])
+        db.add_all([team, *users])
+        db.flush()
+
+        for p in range(size):
+            project = Project(
+                name=f"{name} project {p}", icon="x", color="x", team_id=team.id,
+                lead_id=users[0].id, members=users, teams=[team],
+            )
+            db.add(project)
+            db.flush()
+            update = ProjectUpdate(project_id=project.id, author_id=users[1].id, health=ProjectHealth.ON_TRACK, content="ok")
+            db.add(update)
+            db.add(Resource(target_id=project.id, target_type=ResourceTargetType.PROJECT, name="r", url="https://x", type=ResourceType.LINK))
+            db.flush()
+            comment = ProjectUpdateComment(update_id=update.id, author_id=users[2].id, content="nice")
+            db.add(comment)
+            db.flush()
+            db.add_all([
+                Reaction(target_id=update.id, target_type=ReactionTargetType.PROJECT_UPDATE, user_id=users[0].id, emoji="+1"),
+                Reaction(target_id=comment.id, target_type=ReactionTargetType.PROJECT_UPDATE_COMMENT, user_id=users[1].id, emoji="+1"),
+            ])
+
+        features = []
+        for f in range(size):
+            feature = Feature(name=f"{name} feature {f}", project_id=project.id, identifier=f"{team.identifier}-F{f}")
+            db.add(feature)
+            db.flush()
+            db.add(Milestone(feature_id=feature.id, name="m"))
+            db.add(Feature(name="sub", project_id=project.id, parent_id=feature.id, identifier=f"{team.identifier}-F{f}-S"))
+            features.append(feature)
+
+        issues = []
+        for i in range(size):
+            issue = Issue(
+                identifier=f"{team.identifier}-{i}", title=f"{name} issue {i}", team_id=team.id,
+                feature_id=features[0].id, assignee_id=users[0].id, triage_status=TriageStatus.PENDING,
+            )
+            db.add(issue)
+            db.flush()
+            sub = Issue(identifier=f"{issue.identifier}-S1", title="sub", team_id=team.id, feature_id=features[0].id,
+                        parent_id=issue.id, assignee_id=users[1].id)
+            db.add(sub)
+            db.flush()
+            db.add(Issue(identifier=f"{sub.identifier}-S1", title="sub-sub", team_id=team.id, feature_id=features[0].id,
+                         parent_id=sub.id, assignee_id=users[2].id))
+            db.add(Resource(target_id=issue.id, target_type=ResourceTargetType.ISSUE, name="r", url="https://x", type=ResourceType.LINK))
+            issues.append(issue)
+        db.commit()
+        return {
+            "token": create_access_token({"sub": str(users[0].id)}),
+            "issue": issues[0].id,
+            "project": project.id,
+            "feature": features[0].id,
+        }
+
+
+def endpoints(data: dict) -> dict:
+    return {
+        "GET /issues": "/issues",
+        "GET /issues/my-issues": "/issues/my-issues",
+        "GET /issues/inbox": "/issues/inbox",
+        "GET /issues/{id}": f"/issues/{data['issue']}",
+        "GET /projects": "/projects",
+        "GET /projects/{id}": f"/projects/{data['project']}",
+        "GET /features": "/features",
+        "GET /features/{id}": f"/features/{data['feature']}",
+        "GET /search": "/search?q=issue",
+    }
+
+
+def _statements(response) -> int:
+    # Counted by app.core.query_stats and reported in Server-Timing
+    return int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["Server-Timing"]).group(1))
+
+
+@pytest.fixture(scope="module")
+def counts(client):
+    def measure(data: dict) -> dict:
+        result = {}
+        headers = {"Authorization": f"Bearer {data['token']}"}
+        for label, path in endpoints(data).items():
+            response = client.get(f"/api/v1{path}", headers=headers)
+            assert response.status_code == 200, f"{label}: {response.text[:300]}"
+            result[label] = _statements(response)
+        return result
+
+    small = measure(seed("small", 3))
+    large = measure(seed("large", 30))
+    return small, large
+
+
+@pytest.mark.parametrize("label", list(BUDGETS))
+def test_statements_do_not_grow_with_page(counts, label):
+    small, large = counts
+    assert large[label] <= small[label]
+
+
+@pytest.mark.parametrize("label", list(BUDGETS))
+def test_statements_within_budget(counts, label):
+    _, large = counts
+    assert large[label] <= BUDGETS[label]
@@ -0,0 +1,61 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.main import SecurityHeadersMiddleware, UploadSizeLimitMiddleware
+
+LIMIT = 1024
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    # As in app.main: the limit wraps the BaseHTTPMiddleware stack
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=LIMIT)
+    return TestClient(app)
+
+
+def _multipart(size: int) -> bytes:
+    return (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="a.txt"\r\n'
+        b"Content-Type: text/plain\r\n\r\n"
+        + b"x" * size
+        + b"\r\n--boundary--\r\n"
+    )
+
+
+def _chunks(body: bytes, size: int = 256):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+HEADERS = {"Content-Type": "multipart/form-data; boundary=boundary"}
+
+
+def test_upload_within_limit_passes():
+    response = _client().post("/upload", content=_multipart(100), headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_declared_length_over_limit_is_rejected():
+    response = _client().post("/upload", content=_multipart(LIMIT * 4), headers=HEADERS)
+    assert response.status_code == 413
+
+
+def test_chunked_body_over_limit_is_rejected():
+    # A generator body is sent with Transfer-Encoding: chunked and no Content-Length
+    response = _client().post("/upload", content=_chunks(_multipart(LIMIT * 4)), headers=HEADERS)
+    assert response.status_code == 413
+    assert "Upload too large" in response.json()["detail"]
+
+
+def test_chunked_body_within_limit_passes():
+    response = _client().post("/upload", content=_chunks(_multipart(100)), headers=HEADERS)
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
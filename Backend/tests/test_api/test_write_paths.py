@@ -0,0 +1,130 @@
+"""Write endpoints under ``ORM_RAISE_ON_LAZY_LOAD``.
+
+Each flow creates, updates and deletes through the API, so a write path or
+response that reads a relationship it didn't load fails with its name.
+"""
+P = "/api/v1"
+
+
+def test_team_flow(client, owner):
+    headers = owner["headers"]
+    response = client.post(f"{P}/teams", json={
+        "name": "Second", "identifier": "SEC", "organization_id": owner["team"]["organization_id"],
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    team = response.json()
+
+    response = client.patch(f"{P}/teams/{team['id']}", json={
+        "name": "Renamed", "leader_ids": [owner["user"]["id"]], "member_ids": [owner["user"]["id"]],
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Renamed"
+
+    response = client.delete(f"{P}/teams/{team['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+
+
+def test_project_flow(client, owner):
+    headers, team = owner["headers"], owner["team"]
+    response = client.post(f"{P}/projects", json={
+        "name": "Project", "icon": "x", "color": "blue", "team_id": team["id"],
+        "member_ids": [owner["user"]["id"]], "team_ids": [team["id"]],
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    project = response.json()
+
+    response = client.patch(f"{P}/projects/{project['id']}", json={
+        "name": "Renamed", "member_ids": [owner["user"]["id"]], "team_ids": [team["id"]],
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Renamed"
+
+    response = client.post(f"{P}/projects/{project['id']}/updates", json={
+        "project_id": project["id"], "health": "on_track", "content": "On track",
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    update = response.json()
+
+    response = client.post(f"{P}/projects/{project['id']}/updates/{update['id']}/comments", json={
+        "update_id": update["id"], "content": "Nice",
+    }, headers=headers)
+    assert response.status_code in (200, 201), response.text
+    comment = response.json()
+
+    response = client.post(
+        f"{P}/projects/{project['id']}/updates/{update['id']}/reactions", params={"emoji": "+1"}, headers=headers
+    )
+    assert response.status_code in (200, 201), response.text
+    response = client.post(
+        f"{P}/projects/{project['id']}/updates/{update['id']}/comments/{comment['id']}/reactions",
+        params={"emoji": "+1"}, headers=headers,
+    )
+    assert response.status_code in (200, 201), response.text
+
+    response = client.get(f"{P}/projects/{project['id']}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert len(response.json()["updates"]) == 1
+
+    for path in (
+        f"/updates/{update['id']}/comments/{comment['id']}",
+        f"/updates/{update['id']}",
+        "",
+    ):
+        response = client.delete(f"{P}/projects/{project['id']}{path}", headers=headers)
+        assert response.status_code == 204, f"DELETE {path}: {response.text}"
+
+
+def test_feature_and_issue_flow(client, owner):
+    headers, team = owner["headers"], owner["team"]
+    project = client.post(f"{P}/projects", json={
+        "name": "Tracked", "icon": "x", "color": "blue", "team_id": team["id"],
+    }, headers=headers).json()
+
+    response = client.post(f"{P}/features", json={"name": "Feature", "project_id": project["id"]}, headers=headers)
+    assert response.status_code == 201, response.text
+    feature = response.json()
+    response = client.post(f"{P}/features", json={
+        "name": "Sub-feature", "project_id": project["id"], "parent_id": feature["id"],
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+
+    response = client.patch(f"{P}/features/{feature['id']}", json={"name": "Renamed"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Renamed"
+
+    response = client.post(f"{P}/features/{feature['id']}/milestones", json={"name": "Beta"}, headers=headers)
+    assert response.status_code in (200, 201), response.text
+    milestone = response.json()
+    response = client.patch(
+        f"{P}/features/{feature['id']}/milestones/{milestone['id']}", json={"completed": True}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["completed"] is True
+
+    response = client.post(f"{P}/issues", json={
+        "title": "Bug", "team_id": team["id"], "feature_id": feature["id"],
+        "resources": [{"name": "Log", "url": "https://example.com/log", "type": "link"}],
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    issue = response.json()
+    response = client.post(f"{P}/issues", json={
+        "title": "Sub-bug", "team_id": team["id"], "feature_id": feature["id"], "parent_id": issue["id"],
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+
+    response = client.patch(f"{P}/issues/{issue['id']}", json={
+        "title": "Renamed", "status": "done", "assignee_id": owner["user"]["id"],
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["title"] == "Renamed"
+
+    response = client.post(f"{P}/issues/{issue['id']}/comments", json={"content": "Fixed"}, headers=headers)
+    assert response.status_code == 201, response.text
+
+    response = client.delete(f"{P}/issues/{issue['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+    response = client.delete(f"{P}/features/{feature['id']}/milestones/{milestone['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+    response = client.delete(f"{P}/features/{feature['id']}", headers=headers)
+    assert response.status_code == 204, response.text
+
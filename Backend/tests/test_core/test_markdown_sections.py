@@ -0,0 +1,31 @@
+import pytest
+
+from app.core.markdown_sections import has_markup, to_plain_text
+
+
+def test_prose_paragraphs_are_flattened():
+    body = "\nFirst paragraph,\nwrapped in the source.\n\nSecond one.\n\n"
+    assert to_plain_text(body) == "First paragraph, wrapped in the source.\nSecond one.\n"
+    assert to_plain_text("\n\n") == ""
+
+
+@pytest.mark.parametrize("body", [
+    "Some **bold** text",
+    "Some *italic* text",
+    "Some snake_case or _italic_ text",
+    "A [link](https://example.com)",
+    "Inline `code`",
+    "- a bullet",
+    "1. a numbered item",
+    "> a quote",
+    "---",
+    "Setext heading\n===",
+    "    indented code",
+    "An escaped \\* star",
+    "An &amp; entity",
+    "Some <b>html</b>",
+    "| a | b |\n|---|---|",
+])
+def test_formatted_bodies_are_not_flattened(body):
+    assert has_markup(body)
+    assert to_plain_text(body) is None
@@ -0,0 +1,59 @@
+"""Request sessions keep objects loaded after commit (``expire_on_commit=False``).
+
+That is only correct while every column value is known to the session once
+it flushes; these tests pin it for the two kinds of generated values.
+"""
+import uuid
+
+from sqlalchemy import inspect
+
+from app.core.database import SessionLocal, get_db
+from app.core.query_stats import RequestQueryStats, collecting
+from app.models.document import Document
+from app.models.organization import Organization
+
+
+def _request_session():
+    sessions = get_db()
+    return sessions, next(sessions)
+
+
+def test_python_onupdate_is_current_after_commit(client):
+    sessions, db = _request_session()
+    try:
+        org = Organization(name=f"Org {uuid.uuid4().hex[:6]}")
+        db.add(org)
+        db.commit()
+        created = org.updated_at
+
+        org.name = "Renamed"
+        db.commit()
+        with collecting(RequestQueryStats()) as queries:
+            updated = org.updated_at
+        assert queries.count == 0
+        assert updated > created
+    finally:
+        sessions.close()
+
+
+def test_server_generated_timestamps_come_back_with_the_write(client):
+    sessions, db = _request_session()
+    try:
+        doc = Document(drive_file_id=uuid.uuid4().hex, r2_path=uuid.uuid4().hex, title="Doc")
+        db.add(doc)
+        db.commit()
+        doc.title = "Renamed"
+        db.commit()
+        with collecting(RequestQueryStats()) as queries:
+            assert doc.created_at is not None and doc.updated_at is not None
+        assert queries.count == 0
+    finally:
+        sessions.close()
+
+
+def test_other_sessions_expire_on_commit(client):
+    with SessionLocal() as db:
+        org = Organization(name=f"Org {uuid.uuid4().hex[:6]}")
+        db.add(org)
+        db.commit()
+        assert "name" in inspect(org).expired_attributes
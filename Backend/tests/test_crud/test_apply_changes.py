@@ -0,0 +1,20 @@
+from app.crud.base import apply_changes
+from app.models.enums import AssetType
+from app.models.project_idea import ProjectAsset
+
+
+def _asset() -> ProjectAsset:
+    return ProjectAsset(asset_type=list(AssetType)[0], content="old", enhanced_content=None)
+
+
+def test_compressed_synonyms_are_written():
+    asset = _asset()
+    changes = apply_changes(asset, {"content": "new", "enhanced_content": "enhanced"})
+    assert changes == {"content": "new", "enhanced_content": "enhanced"}
+    assert asset.content == "new"
+    assert asset.enhanced_content == "enhanced"
+
+
+def test_unchanged_values_and_unknown_keys_are_skipped():
+    asset = _asset()
+    assert apply_changes(asset, {"content": "old", "not_a_column": 1}) == {}
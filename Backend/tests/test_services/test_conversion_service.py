@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.conversion_service import ConversionError, ConversionService, ConversionTimeout
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def test_timeout_does_not_break_other_jobs():
+    service = ConversionService()
+    service.workers = 2
+    service.inline_max_bytes = -1  # always use the pool
+
+    async def run():
+        # Start both workers (spawning is slow) before timing anything
+        service.timeout = 60.0
+        await asyncio.gather(*[service._convert("warm", _sleep, 0, 0.5) for _ in range(2)])
+        service.timeout = 2.0
+        stuck = asyncio.ensure_future(service._convert("stuck", _sleep, 0, 30))
+        await asyncio.sleep(1.0)
+        # Still running when the stuck job times out, and within its own timeout
+        other = asyncio.ensure_future(service._convert("other", _sleep, 0, 1.5))
+        with pytest.raises(ConversionTimeout):
+            await stuck
+        assert await other == 1.5
+        # New work goes to a fresh pool
+        service.timeout = 60.0
+        assert await service._convert("after", _sleep, 0, 0.1) == 0.1
+
+    try:
+        asyncio.run(run())
+    finally:
+        service.shutdown()
+
+
+def test_inline_conversion_runs_off_the_event_loop():
+    service = ConversionService()
+
+    async def run():
+        return threading.get_ident(), await service._convert("ident", threading.get_ident, 0)
+
+    loop_thread, worker_thread = asyncio.run(run())
+    assert worker_thread != loop_thread
+    assert service.get_metrics()["ident"]["inline"] == 1
+
+
+def test_small_docx_uses_the_pool():
+    service = ConversionService()
+    service.timeout = 60.0
+
+    async def run():
+        # A tiny zip can still expand to a large document, so size is no guide
+        with pytest.raises(ConversionError):
+            await service.docx_to_markdown(b"not a docx")
+
+    try:
+        asyncio.run(run())
+    finally:
+        service.shutdown()
+    assert service.get_metrics()["docx_to_markdown"]["pooled"] == 1
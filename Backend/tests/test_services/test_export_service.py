@@ -0,0 +1,54 @@
+import asyncio
+
+from app.services.conversion_service import conversion_service
+from app.services.export_service import ExportService
+from app.services.storage_service import storage_service
+
+
+def test_waiter_survives_cancelled_leader(monkeypatch):
+    service = ExportService()
+    calls = []
+
+    async def render(content, title):
+        calls.append(title)
+        if len(calls) == 1:
+            await asyncio.sleep(30)
+        return b"docx"
+
+    monkeypatch.setattr(conversion_service, "markdown_to_docx", render)
+    monkeypatch.setattr(storage_service, "backend", None)
+
+    async def run():
+        leader = asyncio.ensure_future(service.get_docx("# Body", "Title"))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(service.get_docx("# Body", "Title"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        body = await asyncio.wait_for(waiter, timeout=5)
+        assert leader.cancelled()
+        return body
+
+    assert asyncio.run(run()) == b"docx"
+    assert len(calls) == 2
+    assert not service._inflight
+
+
+def test_waiter_sees_leader_failure(monkeypatch):
+    service = ExportService()
+
+    async def render(content, title):
+        await asyncio.sleep(0.01)
+        raise ValueError("bad markdown")
+
+    monkeypatch.setattr(conversion_service, "markdown_to_docx", render)
+    monkeypatch.setattr(storage_service, "backend", None)
+
+    async def run():
+        return await asyncio.gather(
+            service.get_docx("# Body", "Title"),
+            service.get_docx("# Body", "Title"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
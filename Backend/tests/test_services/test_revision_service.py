@@ -0,0 +1,55 @@
+import threading
+import time
+
+from app.core.database import SessionLocal
+from app.models.enums import AssetStatus, AssetType
+from app.models.project_idea import AssetRevision, ProjectAsset, ProjectIdea
+from app.services.revision_service import revision_service
+
+
+def _asset(client) -> ProjectAsset:
+    with SessionLocal() as db:
+        idea = ProjectIdea(raw_input="Revision test idea")
+        asset = ProjectAsset(
+            project_idea=idea, asset_type=list(AssetType)[0], status=AssetStatus.COMPLETED, content="v0\n",
+        )
+        db.add(idea)
+        db.commit()
+        return asset.id
+
+
+def test_concurrent_edits_get_consecutive_revisions(client):
+    asset_id = _asset(client)
+    first_recorded = threading.Event()
+    errors = []
+
+    def edit(content: str, wait_for=None, hold: float = 0.0):
+        try:
+            if wait_for:
+                wait_for.wait(5)
+            with SessionLocal() as db:
+                asset = db.get(ProjectAsset, asset_id)
+                revision_service.record(db, asset, content, source="chat")
+                first_recorded.set()
+                # The second edit starts while this one is still uncommitted
+                time.sleep(hold)
+                asset.content = content
+                db.commit()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=edit, args=("v1\n",), kwargs={"hold": 0.3}),
+        threading.Thread(target=edit, args=("v2\n",), kwargs={"wait_for": first_recorded}),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert not errors
+    with SessionLocal() as db:
+        rows = db.query(AssetRevision).filter(AssetRevision.asset_id == asset_id).order_by(AssetRevision.revision)
+        assert [(r.revision, r.source) for r in rows] == [(1, "baseline"), (2, "chat"), (3, "chat")]
+    with SessionLocal() as db:
+        assert revision_service.get_content(db, asset_id, 3) == "v2\n"
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.core.time import utc_now
+from app.models.enums import AssetStatus, MirrorStatus
+from app.models.project_idea import ProjectAsset, ProjectIdea
+from app.tasks.mirror_assets_to_drive import MIRRORED_TYPES, _claim_jobs, _record_outcome, _take
+
+
+@pytest.fixture
+def expired_asset(client):
+    """An asset left IN_PROGRESS by a run whose claim lease has expired."""
+    with SessionLocal() as db:
+        idea = ProjectIdea(raw_input="Mirror test idea")
+        asset = ProjectAsset(
+            project_idea=idea,
+            asset_type=MIRRORED_TYPES[0],
+            status=AssetStatus.COMPLETED,
+            content="# Doc",
+            mirror_status=MirrorStatus.IN_PROGRESS,
+            mirror_next_attempt_at=utc_now() - timedelta(minutes=1),
+        )
+        db.add(idea)
+        db.commit()
+        yield asset.id
+
+
+def _expire(asset_id) -> None:
+    with SessionLocal() as db:
+        db.query(ProjectAsset).filter(ProjectAsset.id == asset_id).update(
+            {ProjectAsset.mirror_next_attempt_at: utc_now() - timedelta(minutes=1)}
+        )
+        db.commit()
+
+
+def _mirror_state(asset_id):
+    with SessionLocal() as db:
+        asset = db.get(ProjectAsset, asset_id)
+        return asset.mirror_status, asset.mirror_next_attempt_at
+
+
+def test_expired_lease_is_taken_by_one_run(expired_asset):
+    with SessionLocal() as db:
+        _, lease = _mirror_state(expired_asset)
+        # Both runs read the same expired row before either claims it
+        first = _take(db, expired_asset, MirrorStatus.IN_PROGRESS, lease, utc_now() + timedelta(minutes=10))
+        second = _take(db, expired_asset, MirrorStatus.IN_PROGRESS, lease, utc_now() + timedelta(minutes=10))
+        db.commit()
+    assert (first, second) == (True, False)
+
+
+def test_stale_run_does_not_record_outcome(expired_asset):
+    [stale] = _claim_jobs([expired_asset], None)
+    _expire(expired_asset)
+    [current] = _claim_jobs([expired_asset], None)
+    assert current.lease != stale.lease
+
+    _record_outcome(stale, RuntimeError("Drive error"))
+    assert _mirror_state(expired_asset) == (MirrorStatus.IN_PROGRESS, current.lease)
+
+    assert _record_outcome(current, None)
+    assert _mirror_state(expired_asset)[0] == MirrorStatus.SYNCED